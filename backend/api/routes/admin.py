@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+from database.models import Client
+from api.routes.auth import get_current_client
+from utils import profiler
+import json
+import os
+from typing import Optional
+
+router = APIRouter()
+
+def admin_client_ids() -> set:
+    """Client ids allowed to use the admin endpoints (comma-separated ADMIN_CLIENT_IDS)"""
+    return {client_id.strip() for client_id in os.getenv("ADMIN_CLIENT_IDS", "").split(",") if client_id.strip()}
+
+def is_admin(client_id: Optional[str]) -> bool:
+    return bool(client_id) and client_id in admin_client_ids()
+
+def require_admin(current_client: Client = Depends(get_current_client)) -> Client:
+    if not is_admin(current_client.client_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_client
+
+@router.post("/profile")
+async def profile_worker(
+    seconds: float = Query(10, gt=0, le=profiler.MAX_SECONDS),
+    interval_ms: float = Query(profiler.DEFAULT_INTERVAL * 1000, ge=1, le=1000),
+    admin: Client = Depends(require_admin)
+):
+    """Sample this worker's stacks for N seconds while it keeps serving requests.
+
+    Send ``X-Profile: <tag>`` on any request instead to profile just that request;
+    the response then carries ``X-Profile-Id``.
+    """
+    try:
+        return await profiler.profile_for(seconds, interval_ms / 1000)
+    except profiler.ProfilerBusy as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, admin: Client = Depends(require_admin)):
+    """Saved profile report (summary, top frames and the monitor's step timings)"""
+    path = profiler.profile_path(profile_id, "json")
+    if not path:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    with open(path, "r") as f:
+        return json.load(f)
+
+@router.get("/profiles/{profile_id}/folded")
+async def get_profile_stacks(profile_id: str, admin: Client = Depends(require_admin)):
+    """Collapsed stacks for flamegraph.pl, speedscope or inferno"""
+    path = profiler.profile_path(profile_id, "folded")
+    if not path:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=os.path.basename(path))
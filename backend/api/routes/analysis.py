@@ -1,14 +1,51 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from database.database import get_db
-from database.models import Client, BusinessInterest, AnalysisSession
+from sqlalchemy import func
+from database.models import Client, BusinessInterest, AnalysisSession, LLMUsage
 from api.schemas import BusinessInterestCreate, BusinessInterestResponse, StatusResponse
 from api.routes.auth import get_current_client
+from utils.constants import LLM_BUDGET_CONFIG
+from utils.llm_usage import budget_mode, client_budget
 from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, List, Optional
 
 router = APIRouter()
 
+def llm_spend(db: Session, client_id: str, since: Optional[datetime] = None) -> float:
+    """USD a client has spent on LLM calls, optionally since a date"""
+    query = db.query(func.coalesce(func.sum(LLMUsage.cost_usd), 0.0)).filter(LLMUsage.client_id == client_id)
+    if since is not None:
+        query = query.filter(LLMUsage.created_at >= since)
+    return float(query.scalar())
+
+def llm_usage_totals(db: Session, client_id: str, since: datetime, group_by=None) -> Dict:
+    """Calls, tokens and cost per stage/model/session (or overall) in one grouped query"""
+    columns = [
+        func.count(LLMUsage.id),
+        func.coalesce(func.sum(LLMUsage.input_tokens), 0),
+        func.coalesce(func.sum(LLMUsage.output_tokens), 0),
+        func.coalesce(func.sum(LLMUsage.cost_usd), 0.0),
+    ]
+    query = db.query(*([group_by] if group_by is not None else []), *columns).filter(
+        LLMUsage.client_id == client_id,
+        LLMUsage.created_at >= since
+    )
+    if group_by is not None:
+        query = query.group_by(group_by)
+
+    def totals(calls, input_tokens, output_tokens, cost):
+        return {
+            "calls": calls,
+            "input_tokens": int(input_tokens),
+            "output_tokens": int(output_tokens),
+            "cost_usd": round(float(cost), 6)
+        }
+
+    if group_by is None:
+        return totals(*query.one())
+    return {key: totals(*row) for key, *row in query.all()}
+
 @router.post("/business-interest", response_model=BusinessInterestResponse)
 async def create_business_interest(
     interest_data: BusinessInterestCreate,
@@ -111,12 +148,32 @@ async def get_statistics(
         BusinessInterest.client_id == current_client.client_id
     ).order_by(BusinessInterest.created_at.desc()).first()
     
+    # LLM usage over the budget period
+    since = datetime.now() - timedelta(days=LLM_BUDGET_CONFIG['PERIOD_DAYS'])
+    usage = llm_usage_totals(db, current_client.client_id, since)
+    budget = client_budget(current_client.client_id)
+    session_costs = llm_usage_totals(db, current_client.client_id, since, LLMUsage.analysis_session_id)
+    session_costs.pop(None, None)  # calls of analyses that failed before being saved
+    
     return {
         "total_business_interests": total_interests,
         "total_analysis_sessions": total_sessions,
         "sessions_last_7_days": recent_sessions,
         "latest_interest": latest_interest.interest_text if latest_interest else None,
-        "account_created": current_client.created_at.isoformat()
+        "account_created": current_client.created_at.isoformat(),
+        "llm_usage": {
+            "period_days": LLM_BUDGET_CONFIG['PERIOD_DAYS'],
+            "spent_usd": usage["cost_usd"],
+            "budget_usd": budget,
+            "budget_mode": budget_mode(usage["cost_usd"], budget),
+            "totals": usage,
+            "by_stage": llm_usage_totals(db, current_client.client_id, since, LLMUsage.stage),
+            "by_model": llm_usage_totals(db, current_client.client_id, since, LLMUsage.model),
+            "recent_sessions": [
+                dict(session_id=session_id, **totals)
+                for session_id, totals in sorted(session_costs.items(), reverse=True)[:10]
+            ]
+        }
     }
 
 @router.get("/dashboard", response_model=dict)
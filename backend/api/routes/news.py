@@ -1,20 +1,41 @@
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from sqlalchemy.orm import Session
 from database.database import get_db
-from database.models import Client, BusinessInterest, AnalysisSession
+from database.models import Client, BusinessInterest, AnalysisSession, LLMUsage
 from api.schemas import NewsAnalysisRequest, NewsAnalysisResponse, Article, StatusResponse
 from api.routes.auth import get_current_client
+from api.routes.analysis import llm_spend
+from utils.constants import LLM_BUDGET_CONFIG
+from utils.llm_usage import UsageLedger, budget_mode, client_budget, track_usage
+from utils.metrics import observe_stage
 import json
 import sys
 import os
-from datetime import datetime
-from typing import List
-
-# Import utils from backend directory
-from utils.llm_functions import get_news_async
+from datetime import datetime, timedelta
+from typing import List, Optional
 
 router = APIRouter()
 
+def save_llm_usage(db: Session, client_id: str, ledger: UsageLedger, analysis_session_id: Optional[int] = None):
+    """Store the LLM calls of one analysis"""
+    if not ledger.calls:
+        return
+    with observe_stage('db_persist', table='llm_usage'):
+        db.add_all([
+            LLMUsage(
+                client_id=client_id,
+                analysis_session_id=analysis_session_id,
+                stage=call.stage,
+                model=call.model,
+                input_tokens=call.input_tokens,
+                output_tokens=call.output_tokens,
+                cost_usd=call.cost_usd,
+                budget_mode=ledger.budget_mode
+            )
+            for call in ledger.calls
+        ])
+        db.commit()
+
 @router.post("/analyze", response_model=NewsAnalysisResponse)
 async def analyze_news(
     request: NewsAnalysisRequest,
@@ -28,16 +49,37 @@ async def analyze_news(
         client_id=current_client.client_id,
         interest_text=request.business_interest
     )
-    db.add(business_interest)
-    db.commit()
-    db.refresh(business_interest)
+    with observe_stage('db_persist', table='business_interest'):
+        db.add(business_interest)
+        db.commit()
+        db.refresh(business_interest)
+    
+    # Degrade instead of failing once the client nears its LLM budget
+    since = datetime.now() - timedelta(days=LLM_BUDGET_CONFIG['PERIOD_DAYS'])
+    spent = llm_spend(db, current_client.client_id, since)
+    mode = budget_mode(spent, client_budget(current_client.client_id))
+    if mode != "normal":
+        print(f"[Budget] Client {current_client.client_id} spent ${spent:.4f}, running in {mode} mode")
     
+    ledger = None
     try:
+        # Imported lazily: the LLM/scraping stack is only needed by this route
+        from utils.llm_functions import run_news_pipeline
+
         # Get news analysis using existing function
-        news_result = await get_news_async(
-            business_interest=request.business_interest,
-            sources=request.sources
-        )
+        with track_usage(mode) as ledger:
+            final_state = await run_news_pipeline(
+                business_interest=request.business_interest,
+                sources=request.sources,
+                budget_mode=mode
+            )
+        news_result = final_state["summary"]
+        
+        # Relevance scores assigned by the local ranking stage, keyed by URL
+        relevance_scores = {
+            article.get('url'): article.get('relevance_score')
+            for article in final_state.get("relevant_articles", [])
+        }
         
         # Parse the summary result to extract articles
         articles = []
@@ -65,7 +107,7 @@ async def analyze_news(
                         'url': '',
                         'source': 'Multiple Sources',
                         'published_date': datetime.now().isoformat(),
-                        'relevance_score': 1.0
+                        'relevance_score': None
                     }
                     collecting_summary = False
                     summary_lines = []
@@ -79,6 +121,7 @@ async def analyze_news(
                     url = line.replace('**Source:**', '').strip()
                     if url != 'N/A':
                         current_article['url'] = url
+                        current_article['relevance_score'] = relevance_scores.get(url)
                         # Extract domain as source
                         try:
                             from urllib.parse import urlparse
@@ -126,9 +169,12 @@ async def analyze_news(
             sources=json.dumps(request.sources),
             results=json.dumps([article.dict() for article in articles])
         )
-        db.add(analysis_session)
-        db.commit()
-        db.refresh(analysis_session)
+        with observe_stage('db_persist', table='analysis_session'):
+            db.add(analysis_session)
+            db.commit()
+            db.refresh(analysis_session)
+        save_llm_usage(db, current_client.client_id, ledger, analysis_session.id)
+        ledger = None
         
         return NewsAnalysisResponse(
             session_id=analysis_session.id,
@@ -136,10 +182,16 @@ async def analyze_news(
             summary=None,  # You can add summary generation here
             total_articles=len(articles),
             relevant_articles=len(articles),
-            analysis_date=datetime.now()
+            analysis_date=datetime.now(),
+            skipped_sources=final_state.get("skipped_sources", []),
+            budget_mode=mode
         )
         
     except Exception as e:
+        if ledger is not None:
+            # The calls were still paid for; keep them against the budget
+            db.rollback()
+            save_llm_usage(db, current_client.client_id, ledger)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error analyzing news: {str(e)}"
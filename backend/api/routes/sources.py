@@ -4,38 +4,16 @@ from database.database import get_db
 from database.models import Source, Client, ClientSource
 from api.schemas import SourceCreate, SourceResponse, SourceListResponse, StatusResponse
 from api.routes.auth import get_current_client
-import requests
-from urllib.parse import urlparse
 from datetime import datetime
 
 router = APIRouter()
 
-def check_url(url: str) -> bool:
+async def check_url(url: str) -> bool:
     """Validate URL accessibility"""
-    url = url.strip()
+    # Shared pooled client; imported here so aiohttp loads on first use
+    from utils.http_client import check_url as url_is_reachable
     
-    if not url.startswith(('http://', 'https://')):
-        url = "https://" + url
-    
-    parsed = urlparse(url)
-    if not parsed.netloc:
-        return False
-    
-    try:
-        response = requests.head(url, timeout=10, allow_redirects=True)
-        if response.status_code < 400 or response.status_code in [401, 403]:
-            return True
-    except requests.RequestException:
-        pass
-    
-    try:
-        response = requests.get(url, timeout=10, allow_redirects=True)
-        if response.status_code < 400 or response.status_code in [401, 403]:
-            return True
-    except requests.RequestException:
-        pass
-    
-    return False
+    return await url_is_reachable(url)
 
 @router.get("/", response_model=SourceListResponse)
 async def get_sources(current_client: Client = Depends(get_current_client), db: Session = Depends(get_db)):
@@ -61,7 +39,7 @@ async def add_source(
     source_url = str(source_data.source_url)
     
     # Validate URL
-    if not check_url(source_url):
+    if not await check_url(source_url):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or inaccessible URL"
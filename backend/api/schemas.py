@@ -52,6 +52,14 @@ class Article(BaseModel):
     published_date: Optional[str] = None
     relevance_score: Optional[float] = None
 
+class SkippedSource(BaseModel):
+    source: str
+    domain: str
+    state: str
+    failures: int
+    last_error: Optional[str] = None
+    retry_after: Optional[str] = None
+
 class NewsAnalysisResponse(BaseModel):
     session_id: int
     articles: List[Article]
@@ -59,6 +67,8 @@ class NewsAnalysisResponse(BaseModel):
     total_articles: int
     relevant_articles: int
     analysis_date: datetime
+    skipped_sources: List[SkippedSource] = []
+    budget_mode: str = "normal"
     
     class Config:
         from_attributes = True
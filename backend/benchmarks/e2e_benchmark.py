@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput benchmark: recorded web + real scraper + stubbed LLM.
+
+Serves a corpus with ``fixture_server.py`` (a synthetic one is generated into
+``tmp/benchmarks/corpus`` if none is given), runs the full news pipeline
+against it with the scraper subprocess and the ``synthetic`` LLM backend, and
+reports articles/s, p50/p95 analysis latency, peak RSS of the API process and
+of the scraper, and wall and CPU time per stage. Analyses run one at a time,
+so each stage's CPU time is its own.
+
+Results are written to ``tmp/benchmarks/e2e_<commit>_<time>.json``; pass an
+earlier file as ``--baseline`` to compare against it, e.g. across commits.
+
+Run from the backend directory:
+    python benchmarks/e2e_benchmark.py
+    python benchmarks/e2e_benchmark.py --corpus corpus/ --runs 10 --llm-latency 0.5
+    python benchmarks/e2e_benchmark.py --baseline tmp/benchmarks/e2e_abc1234_20260101_120000.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from utils.constants import LLM_PROVIDER_CONFIG, PERFORMANCE_CONFIG
+
+PERFORMANCE_CONFIG['LOG_PERFORMANCE'] = False
+
+from utils import llm_functions
+from utils.llm_batching import reset_batch_sizers
+from utils.metrics import add_stage_observer
+
+RESULTS_DIR = os.path.join(BACKEND_DIR, "tmp", "benchmarks")
+DEFAULT_CORPUS = os.path.join(RESULTS_DIR, "corpus")
+FIXTURE_SERVER = os.path.join(BACKEND_DIR, "benchmarks", "fixture_server.py")
+
+# (key, label, lower is better)
+COMPARED = [
+    ('articles_per_sec', 'articles/s', False),
+    ('latency_p50', 'p50 latency s', True),
+    ('latency_p95', 'p95 latency s', True),
+    ('peak_rss_mb', 'peak RSS MB', True),
+    ('scraper_peak_rss_mb', 'scraper peak RSS MB', True),
+]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def max_rss_mb(who):
+    rss = resource.getrusage(who).ru_maxrss
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024  # bytes on macOS, KB elsewhere
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+@contextlib.contextmanager
+def fixture_server(corpus, latency_ms):
+    """Serve the corpus from a child process; yields the local source URLs"""
+    process = subprocess.Popen(
+        [sys.executable, FIXTURE_SERVER, "serve", corpus, "--latency-ms", str(latency_ms)],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    try:
+        yield json.loads(process.stdout.readline())['sources']
+    finally:
+        process.terminate()
+        process.wait()
+
+
+class StageTimes:
+    """Wall and CPU seconds per stage, collected through the metrics stage observer"""
+
+    def __init__(self):
+        self.wall = defaultdict(float)
+        self.cpu = defaultdict(float)
+        self.calls = defaultdict(int)
+
+    def __call__(self, stage, wall, cpu):
+        self.wall[stage] += wall
+        self.cpu[stage] += cpu
+        self.calls[stage] += 1
+
+    def summary(self, runs):
+        return {
+            stage: {
+                'wall_s': round(self.wall[stage] / runs, 4),
+                'cpu_s': round(self.cpu[stage] / runs, 4),
+                'calls': self.calls[stage] / runs,
+            }
+            for stage in self.wall
+        }
+
+
+async def run_analyses(interest, sources, runs, verbose):
+    results = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(sys.stdout if verbose else io.StringIO()):
+            state = await llm_functions.run_news_pipeline(interest, sources, force_fresh=True)
+        results.append({
+            'latency_s': round(time.perf_counter() - start, 4),
+            'articles': len(state['articles']),
+            'relevant_articles': len(state['relevant_articles']),
+        })
+    return results
+
+
+def compare(current, baseline_path):
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline.get('commit')} ({baseline_path})")
+    print(f"{'':22} {'baseline':>10} {'current':>10} {'change':>9}")
+    rows = [(key, label, lower) for key, label, lower in COMPARED]
+    rows += [(f"stages.{stage}.wall_s", f"{stage} wall s", True) for stage in current['summary']['stages']]
+
+    def lookup(results, key):
+        value = results['summary']
+        for part in key.split('.'):
+            value = value.get(part) if isinstance(value, dict) else None
+        return value
+
+    for key, label, lower_is_better in rows:
+        old, new = lookup(baseline, key), lookup(current, key)
+        if not old or new is None:
+            continue
+        change = (new - old) / old * 100
+        worse = change > 0 if lower_is_better else change < 0
+        # Flag changes over 10%, ignoring stages too short to time reliably
+        significant = abs(change) > 10 and max(old, new) >= 0.01
+        mark = ('🔴' if worse else '🟢') if significant else '  '
+        print(f"{label:22} {old:10.3f} {new:10.3f} {change:+8.1f}% {mark}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark against a recorded web corpus")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="fixture corpus (generated if missing)")
+    parser.add_argument("--interest", default="Qatar economy and energy investment")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--server-latency-ms", type=float, default=10, help="delay per fixture response")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="median seconds per synthetic LLM call")
+    parser.add_argument("--llm-failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", help="earlier results JSON to compare with")
+    parser.add_argument("--output", help="results file (default tmp/benchmarks/e2e_<commit>_<time>.json)")
+    parser.add_argument("--verbose", action="store_true", help="show pipeline output")
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.corpus, "manifest.json")):
+        subprocess.run([sys.executable, FIXTURE_SERVER, "generate", "--out", args.corpus], check=True)
+
+    LLM_PROVIDER_CONFIG['BACKEND'] = 'synthetic'
+    LLM_PROVIDER_CONFIG['SYNTHETIC'].update(
+        LATENCY=args.llm_latency, FAILURE_RATE=args.llm_failure_rate, SEED=args.seed
+    )
+    llm_functions.get_llm.cache_clear()
+    reset_batch_sizers()
+
+    with fixture_server(args.corpus, args.server_latency_ms) as sources:
+        asyncio.run(run_analyses(args.interest, sources, args.warmup, args.verbose))
+        stages = StageTimes()
+        add_stage_observer(stages)
+        start = time.perf_counter()
+        runs = asyncio.run(run_analyses(args.interest, sources, args.runs, args.verbose))
+        elapsed = time.perf_counter() - start
+        # Before the fixture server exits and counts as a child too
+        scraper_rss = max_rss_mb(resource.RUSAGE_CHILDREN)
+
+    latencies = [run['latency_s'] for run in runs]
+    articles = sum(run['articles'] for run in runs)
+    results = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'config': {key: value for key, value in vars(args).items() if key not in ('baseline', 'output', 'verbose')},
+        'runs': runs,
+        'summary': {
+            'articles_per_sec': round(articles / elapsed, 3),
+            'latency_p50': round(statistics.median(latencies), 4),
+            'latency_p95': round(percentile(latencies, 0.95), 4),
+            'peak_rss_mb': round(max_rss_mb(resource.RUSAGE_SELF), 1),
+            'scraper_peak_rss_mb': round(scraper_rss, 1),
+            'stages': stages.summary(len(runs)),
+        },
+    }
+
+    summary = results['summary']
+    print(f"📊 End-to-end pipeline, {len(sources)} sources, {args.runs} analyses "
+          f"(synthetic LLM median {args.llm_latency}s, fixture latency {args.server_latency_ms:g}ms)")
+    print("=" * 66)
+    print(f"Articles scraped per analysis: {articles / len(runs):.1f}, "
+          f"relevant: {sum(run['relevant_articles'] for run in runs) / len(runs):.1f}")
+    print(f"Throughput: {summary['articles_per_sec']:.2f} articles/s")
+    print(f"Latency:    p50 {summary['latency_p50']:.2f}s   p95 {summary['latency_p95']:.2f}s")
+    print(f"Peak RSS:   {summary['peak_rss_mb']:.0f} MB (API process), {summary['scraper_peak_rss_mb']:.0f} MB (scraper)")
+    print(f"\n{'stage':12} {'wall s':>9} {'CPU s':>9} {'CPU %':>7}")
+    for stage, times in summary['stages'].items():
+        share = times['cpu_s'] / times['wall_s'] * 100 if times['wall_s'] else 0
+        print(f"{stage:12} {times['wall_s']:9.3f} {times['cpu_s']:9.3f} {share:6.0f}%")
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"e2e_{results['commit']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results saved to {output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
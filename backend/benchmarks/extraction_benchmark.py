@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Article extraction benchmark.
+
+Compares the previous spider extraction (Scrapy's parse, then
+``trafilatura.extract`` and ``extract_metadata`` each re-parsing the HTML
+string) with ``extract_article`` reusing the already parsed tree, and
+measures how the extraction process pool scales with worker count.
+
+Run from the backend directory:
+    python benchmarks/extraction_benchmark.py --pages 50
+    python benchmarks/extraction_benchmark.py --html saved_article.html
+    python benchmarks/extraction_benchmark.py --save-corpus tmp/html_corpus --pages 400
+    python benchmarks/extraction_benchmark.py --corpus tmp/html_corpus --workers 1,2,4,8
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import trafilatura
+from parsel import Selector
+from utils.article_extractor import extract_article
+from utils.extraction_pool import extract_page, warm_up
+
+WORDS = (
+    "qatar economy growth lng exports doha bank market investment ministry energy "
+    "inflation policy trade gulf project finance revenue company shares report quarter"
+).split()
+
+
+def synthetic_article(index, paragraphs=25, seed=11):
+    rng = random.Random(seed + index)
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(150))
+    body = "".join(
+        "<p>" + " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 80))) + ".</p>"
+        for _ in range(paragraphs)
+    )
+    return (
+        f"<html><head><title>Story {index} about the Qatar economy</title>"
+        f'<meta property="article:published_time" content="2026-10-1{index % 9}T08:00:00Z">'
+        f"<script>var tracking = {{'id': {index}}};</script></head>"
+        f"<body><nav><ul>{nav}</ul></nav><article><h1>Story {index} about the Qatar economy</h1>"
+        f'<time datetime="2026-10-1{index % 9}">Oct 1{index % 9}</time>{body}</article>'
+        f"<footer>{nav}</footer></body></html>"
+    )
+
+
+def legacy_extract(html, url):
+    """TrafilaturaSpider.parse_article before single-parse extraction"""
+    selector = Selector(text=html)  # Scrapy parses every response for its callbacks
+    content = trafilatura.extract(html, include_comments=False, include_tables=True, url=url)
+    metadata = trafilatura.extract_metadata(html)
+    title = metadata.title if metadata and metadata.title else selector.css('h1::text').get()
+    return content, title, metadata.date if metadata else None
+
+
+def single_extract(html, url):
+    selector = Selector(text=html)
+    return extract_article(selector.root, url)
+
+
+def load_corpus(path):
+    """Saved pages as raw bytes, as the spider passes them to the pool"""
+    pages = []
+    for name in sorted(glob.glob(os.path.join(path, "*.html"))):
+        with open(name, "rb") as f:
+            pages.append(f.read())
+    return pages
+
+
+def save_corpus(path, count):
+    os.makedirs(path, exist_ok=True)
+    for i in range(count):
+        with open(os.path.join(path, f"article_{i:04d}.html"), "w", encoding="utf-8") as f:
+            f.write(synthetic_article(i))
+    print(f"Saved {count} pages to {path}")
+
+
+def pool_throughput(pages, url, workers):
+    """Pages/second through a warmed-up pool of ``workers`` processes"""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=warm_up) as pool:
+        list(pool.map(extract_page, pages[:workers], [url] * workers))
+        start = time.perf_counter()
+        list(pool.map(extract_page, pages, [url] * len(pages), chunksize=4))
+        return len(pages) / (time.perf_counter() - start)
+
+
+def run_scaling(pages, url, worker_counts):
+    print("📊 Extraction pool scaling")
+    print("=" * 50)
+    print(f"Pages: {len(pages)}, cores: {os.cpu_count()}")
+    start = time.perf_counter()
+    for body in pages:
+        extract_page(body, url)
+    inline = len(pages) / (time.perf_counter() - start)
+    print(f"Reactor thread (inline): {inline:8.1f} pages/s")
+    for workers in worker_counts:
+        rate = pool_throughput(pages, url, workers)
+        print(f"{workers:2d} worker(s):            {rate:8.1f} pages/s ({rate / inline:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark article extraction")
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--html", help="Saved article HTML file")
+    parser.add_argument("--url", default="https://www.example.com/news/2026/10/18/story")
+    parser.add_argument("--corpus", help="Directory of saved *.html pages")
+    parser.add_argument("--save-corpus", help="Write the synthetic pages to this directory and exit")
+    parser.add_argument("--workers", help="Comma-separated pool sizes to measure, e.g. 1,2,4,8")
+    args = parser.parse_args()
+
+    if args.save_corpus:
+        save_corpus(args.save_corpus, args.pages)
+        return
+    if args.workers:
+        pages = load_corpus(args.corpus) if args.corpus else [
+            synthetic_article(i).encode("utf-8") for i in range(args.pages)
+        ]
+        run_scaling(pages, args.url, [int(n) for n in args.workers.split(",")])
+        return
+
+    if args.html:
+        with open(args.html, "r", encoding="utf-8", errors="replace") as f:
+            pages = [f.read()] * args.pages
+    else:
+        pages = [synthetic_article(i) for i in range(args.pages)]
+
+    start = time.perf_counter()
+    for html in pages:
+        legacy_extract(html, args.url)
+    legacy_time = (time.perf_counter() - start) / len(pages)
+
+    start = time.perf_counter()
+    methods = {}
+    for html in pages:
+        result = single_extract(html, args.url)
+        method = result['extraction_method'] if result else 'none'
+        methods[method] = methods.get(method, 0) + 1
+    single_time = (time.perf_counter() - start) / len(pages)
+
+    print("📊 Article extraction benchmark")
+    print("=" * 50)
+    print(f"Pages: {len(pages)} ({sum(len(p) for p in pages) // len(pages) // 1024} KB avg)")
+    print(f"Legacy (3 parses):  {legacy_time * 1000:.2f}ms/page")
+    print(f"Single parse:       {single_time * 1000:.2f}ms/page")
+    print(f"Speedup: {legacy_time / single_time:.1f}x")
+    print(f"Extraction methods: {methods}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Recorded-web fixture server for offline scraping benchmarks.
+
+A corpus is a directory with ``manifest.json`` and the response bodies of
+every page a crawl fetched (homepages, feeds, sitemaps, articles). ``serve``
+starts one local HTTP server per recorded origin, on its own loopback
+address where the OS allows it (127.0.0.2, 127.0.0.3, ...) so per-domain
+throttling behaves as it does against the real sites, and rewrites links
+between recorded origins to the local servers. Dates in URLs and bodies are
+moved forward by the time since recording, so the recency filters keep the
+same articles however old the corpus is.
+
+    # Record what the spider fetches from live sites (needs network)
+    python benchmarks/fixture_server.py record https://www.aljazeera.com https://www.bbc.com/news --out corpus/
+    # Or generate a synthetic corpus (no network)
+    python benchmarks/fixture_server.py generate --out tmp/benchmarks/corpus --sites 3 --articles 12
+    # Serve it; prints the local source URLs as JSON on the first line
+    python benchmarks/fixture_server.py serve tmp/benchmarks/corpus --latency-ms 20
+
+Run from the backend directory.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import pickle
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPIDER_PATH = os.path.join(BACKEND_DIR, "utils", "trafilatura_spider.py")
+MANIFEST = "manifest.json"
+KEPT_HEADERS = ('content-type', 'location', 'last-modified')
+TEXT_TYPES = ('text/', 'xml', 'json', 'javascript')
+# Only dates this many days before the recording are moved, so other numbers are left alone
+DATE_WINDOW_DAYS = 400
+
+ISO_DATE = re.compile(r'\b(\d{4})([-/])(\d{2})\2(\d{2})\b')
+RFC_DATE = re.compile(r'\b(?:(Mon|Tue|Wed|Thu|Fri|Sat|Sun), )?(\d{1,2}) '
+                      r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) (\d{4})\b')
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+
+def origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class DateShifter:
+    """Moves dates near the recording date by a fixed number of days"""
+
+    def __init__(self, recorded_at: date, days: int):
+        self.recorded_at = recorded_at
+        self.days = days
+
+    def _shift(self, value: date, days: int):
+        if not self.recorded_at - timedelta(days=DATE_WINDOW_DAYS) <= value <= self.recorded_at + timedelta(days=1):
+            return None
+        return value + timedelta(days=days)
+
+    def apply(self, text: str) -> str:
+        days = self.days
+        if not days:
+            return text
+
+        def iso(match):
+            try:
+                shifted = self._shift(date(int(match[1]), int(match[3]), int(match[4])), days)
+            except ValueError:
+                return match[0]
+            sep = match[2]
+            return shifted.strftime(f"%Y{sep}%m{sep}%d") if shifted else match[0]
+
+        def rfc(match):
+            try:
+                shifted = self._shift(date(int(match[4]), MONTHS.index(match[3]) + 1, int(match[2])), days)
+            except ValueError:
+                return match[0]
+            if not shifted:
+                return match[0]
+            weekday = f"{WEEKDAYS[shifted.weekday()]}, " if match[1] else ""
+            return f"{weekday}{shifted.day:02d} {MONTHS[shifted.month - 1]} {shifted.year}"
+
+        return RFC_DATE.sub(rfc, ISO_DATE.sub(iso, text))
+
+
+def is_text(headers: dict) -> bool:
+    content_type = headers.get('content-type', '').lower()
+    return any(kind in content_type for kind in TEXT_TYPES)
+
+
+class Corpus:
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST), 'r') as f:
+            self.manifest = json.load(f)
+        self.pages = self.manifest['pages']
+        self.origins = self.manifest.get('origins') or sorted({origin(url) for url in self.pages})
+        self.recorded_at = date.fromisoformat(self.manifest['recorded_at'][:10])
+
+    def body(self, page: dict) -> bytes:
+        if not page.get('body'):
+            return b''
+        with open(os.path.join(self.directory, page['body']), 'rb') as f:
+            return f.read()
+
+
+def write_corpus(directory: str, pages: dict, sources: list, recorded_at: str):
+    """pages: url -> (status, headers, body bytes)"""
+    os.makedirs(os.path.join(directory, "bodies"), exist_ok=True)
+    manifest = {
+        'recorded_at': recorded_at,
+        'sources': sources,
+        'origins': sorted({origin(url) for url in list(pages) + sources}),
+        'pages': {},
+    }
+    for url, (status, headers, body) in sorted(pages.items()):
+        name = None
+        if body:
+            name = f"bodies/{hashlib.sha1(url.encode()).hexdigest()}"
+            with open(os.path.join(directory, name), 'wb') as f:
+                f.write(body)
+        manifest['pages'][url] = {'status': status, 'headers': headers, 'body': name}
+    with open(os.path.join(directory, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+# -- record ------------------------------------------------------------------
+
+def decode_body(headers: dict, body: bytes) -> bytes:
+    encoding = headers.pop('content-encoding', '').lower()
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    if encoding == 'deflate':
+        return zlib.decompress(body)
+    return body
+
+
+def read_http_cache(cache_dir: str) -> dict:
+    """url -> (status, headers, body) from Scrapy's filesystem HTTP cache"""
+    pages = {}
+    for root, _, files in os.walk(cache_dir):
+        if 'pickled_meta' not in files:
+            continue
+        with open(os.path.join(root, 'pickled_meta'), 'rb') as f:
+            meta = pickle.load(f)  # written by the Scrapy run we just started
+        headers = {}
+        with open(os.path.join(root, 'response_headers'), 'rb') as f:
+            for line in f.read().decode('latin-1').splitlines():
+                name, _, value = line.partition(':')
+                if name.strip().lower() in KEPT_HEADERS + ('content-encoding',):
+                    headers[name.strip().lower()] = value.strip()
+        with open(os.path.join(root, 'response_body'), 'rb') as f:
+            body = decode_body(headers, f.read())
+        pages[meta['url']] = (int(meta['status']), headers, body)
+    return pages
+
+
+def record(sources: list, out: str):
+    """Run the spider against live sources with Scrapy's HTTP cache on, and keep every response"""
+    with tempfile.TemporaryDirectory() as tmp:
+        command = [
+            "scrapy", "runspider", SPIDER_PATH,
+            "-a", f"sources={json.dumps(sources)}",
+            "-a", f"output_path={os.path.join(tmp, 'output.json')}",
+            "-a", f"report_path={os.path.join(tmp, 'report.json')}",
+            "-s", "HTTPCACHE_ENABLED=True",
+            "-s", f"HTTPCACHE_DIR={os.path.join(tmp, 'cache')}",
+            "-s", "COMPRESSION_ENABLED=False",  # identity bodies, so links can be rewritten
+        ]
+        print(f"🕸️  Crawling {len(sources)} sources...")
+        subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True)
+        pages = read_http_cache(os.path.join(tmp, 'cache'))
+        try:
+            with open(os.path.join(tmp, 'output.json'), 'r') as f:
+                articles = len(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            articles = 0
+    write_corpus(out, pages, sources, datetime.now().isoformat(timespec='seconds'))
+    print(f"✅ Recorded {len(pages)} responses ({articles} articles extracted) into {out}")
+
+
+# -- generate ----------------------------------------------------------------
+
+SITES = [
+    ('gulf-business.example', 'economy', ['Qatar', 'Doha', 'Gulf']),
+    ('energy-daily.example', 'energy', ['Qatar', 'LNG', 'Middle East']),
+    ('world-sports.example', 'sports', ['football', 'match', 'league']),
+    ('tech-wire.example', 'technology', ['startup', 'chip', 'cloud']),
+]
+SENTENCES = {
+    'economy': "{place}'s economy grew {n}% as exports rose and investment in {place} financial markets reached a record.",
+    'energy': "{place} signed a {n}-year LNG supply deal, expanding energy investment across the {place} region.",
+    'sports': "The {place} fixture ended {n}-1 after a late goal, lifting the team to second in the league table.",
+    'technology': "A {place} company raised {n} million dollars to expand its {place} business across the region.",
+}
+
+
+def article_page(title: str, day: date, topic: str, words: list, rng: random.Random) -> bytes:
+    paragraphs = "".join(
+        f"<p>{SENTENCES[topic].format(place=rng.choice(words), n=rng.randint(2, 40))} "
+        f"{SENTENCES[topic].format(place=rng.choice(words), n=rng.randint(2, 40))}</p>"
+        for _ in range(rng.randint(4, 8))
+    )
+    return (
+        f"<!DOCTYPE html><html><head><title>{title}</title>"
+        f"<meta property='og:title' content='{title}'>"
+        f"<meta property='article:published_time' content='{day.isoformat()}T08:00:00Z'></head>"
+        f"<body><nav><a href='/'>Home</a></nav><article><h1>{title}</h1>"
+        f"<time datetime='{day.isoformat()}'>{day.isoformat()}</time>{paragraphs}</article></body></html>"
+    ).encode()
+
+
+def generate(out: str, sites: int, articles: int, seed: int):
+    rng = random.Random(seed)
+    today = date.today()
+    pages, sources = {}, []
+    html = {'content-type': 'text/html; charset=utf-8'}
+    for host, topic, words in SITES[:sites]:
+        base = f"https://www.{host}"
+        sources.append(f"{base}/")
+        cards = []
+        for i in range(articles):
+            day = today - timedelta(days=rng.choice([0, 0, 1, 2, 5, 30]))
+            title = f"{rng.choice(words)} {topic} update {i}"
+            path = f"/news/{day:%Y/%m/%d}/{topic}-update-{i}-{rng.randint(1000, 9999)}.html"
+            pages[base + path] = (200, html, article_page(title, day, topic, words, rng))
+            cards.append(f"<div class='story-card'><a href='{path}'>{title}</a>"
+                         f"<time datetime='{day.isoformat()}'>{day.isoformat()}</time></div>")
+        homepage = (f"<!DOCTYPE html><html><head><title>{host}</title></head><body>"
+                    f"<div class='article-list'>{''.join(cards)}</div><a href='/about'>About</a></body></html>")
+        pages[f"{base}/"] = (200, html, homepage.encode())
+    write_corpus(out, pages, sources, today.isoformat())
+    print(f"✅ Generated {len(pages)} pages for {len(sources)} sites into {out}")
+
+
+# -- serve -------------------------------------------------------------------
+
+def loopback_servers(count: int, handler_factory):
+    """One server per origin: 127.0.0.2, .3, ... where bindable, otherwise 127.0.0.1 on separate ports"""
+    servers = []
+    for i in range(count):
+        try:
+            server = ThreadingHTTPServer((f"127.0.0.{i + 2}", 0), handler_factory())
+        except OSError:
+            server = ThreadingHTTPServer(("127.0.0.1", 0), handler_factory())
+        server.daemon_threads = True
+        servers.append(server)
+    return servers
+
+
+class FixtureServer:
+    """Serves a corpus on local servers; ``sources`` are the local URLs of the recorded sources"""
+
+    def __init__(self, directory: str, latency_ms: float = 0, shift_dates: bool = True):
+        self.corpus = Corpus(directory)
+        self.latency = latency_ms / 1000
+        days = (date.today() - self.corpus.recorded_at).days if shift_dates else 0
+        self.shifter = DateShifter(self.corpus.recorded_at, days)
+        self.routes = {}  # local origin -> {path?query: (status, headers, body)}
+        self.requests = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.servers = loopback_servers(len(self.corpus.origins), self.handler_class)
+        self.local = {
+            recorded: f"http://{server.server_address[0]}:{server.server_address[1]}"
+            for recorded, server in zip(self.corpus.origins, self.servers)
+        }
+        self.sources = [self.rewrite(url) for url in self.corpus.manifest.get('sources', [])]
+        self.build_routes()
+
+    def rewrite(self, text: str) -> str:
+        """Recorded origins -> local servers (longest first, http and https alike), then dates"""
+        for recorded in sorted(self.local, key=len, reverse=True):
+            netloc = urlsplit(recorded).netloc
+            local = self.local[recorded]
+            text = text.replace(f"https://{netloc}", local).replace(f"http://{netloc}", local)
+            text = text.replace(f"//{netloc}", "//" + urlsplit(local).netloc)
+        return self.shifter.apply(text)
+
+    def build_routes(self):
+        for url, page in self.corpus.pages.items():
+            local = urlsplit(self.rewrite(url))
+            key = local.path + (f"?{local.query}" if local.query else "")
+            headers = {name: self.rewrite(value) if name == 'location' else value
+                       for name, value in page.get('headers', {}).items()}
+            body = self.corpus.body(page)
+            if body and is_text(headers):
+                charset = re.search(r'charset=([\w-]+)', headers.get('content-type', ''))
+                encoding = charset.group(1) if charset else 'utf-8'
+                try:
+                    body = self.rewrite(body.decode(encoding)).encode(encoding)
+                except (UnicodeDecodeError, LookupError):
+                    body = self.rewrite(body.decode('latin-1')).encode('latin-1')
+            self.routes.setdefault(f"{local.scheme}://{local.netloc}", {})[key] = (page['status'], headers, body)
+
+    def handler_class(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def respond(self, with_body: bool):
+                local = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+                status, headers, body = fixture.routes.get(local, {}).get(self.path, (404, {}, b"Not recorded"))
+                with fixture._lock:
+                    fixture.requests += 1
+                    fixture.misses += status == 404 and self.path not in fixture.routes.get(local, {})
+                if fixture.latency:
+                    time.sleep(fixture.latency)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name.title(), value)
+                if 'content-type' not in headers:
+                    self.send_header('Content-Type', 'text/plain')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if with_body:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                self.respond(True)
+
+            def do_HEAD(self):
+                self.respond(False)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        for server in self.servers:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+
+def serve(directory: str, latency_ms: float, shift_dates: bool):
+    fixture = FixtureServer(directory, latency_ms, shift_dates).start()
+    print(json.dumps({'sources': fixture.sources, 'origins': fixture.local}), flush=True)
+    print(f"🌐 Serving {len(fixture.corpus.pages)} recorded responses from {len(fixture.servers)} origins "
+          f"(dates moved {fixture.shifter.days} days); Ctrl+C to stop", file=sys.stderr, flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fixture.stop()
+        print(f"{fixture.requests} requests, {fixture.misses} not recorded", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record, generate and serve web fixtures for benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="crawl live sources with the spider and record responses")
+    record_parser.add_argument("sources", nargs="+")
+    record_parser.add_argument("--out", required=True)
+    generate_parser = commands.add_parser("generate", help="write a synthetic corpus")
+    generate_parser.add_argument("--out", required=True)
+    generate_parser.add_argument("--sites", type=int, default=3)
+    generate_parser.add_argument("--articles", type=int, default=12, help="per site")
+    generate_parser.add_argument("--seed", type=int, default=42)
+    serve_parser = commands.add_parser("serve", help="serve a corpus on local HTTP servers")
+    serve_parser.add_argument("corpus")
+    serve_parser.add_argument("--latency-ms", type=float, default=0, help="delay added to every response")
+    serve_parser.add_argument("--no-date-shift", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.sources, args.out)
+    elif args.command == "generate":
+        generate(args.out, args.sites, args.articles, args.seed)
+    else:
+        serve(args.corpus, args.latency_ms, not args.no_date_shift)
+
+
+if __name__ == "__main__":
+    main()
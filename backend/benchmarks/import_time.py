@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the News Analyzer API.
+
+Runs ``python -X importtime -c "import main"`` in a fresh interpreter and fails
+(exit code 1) when the cumulative import time of ``main`` exceeds the budget or
+when a heavy LLM/scraping module is imported eagerly at startup.
+
+Run from the backend directory:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget-ms 800 --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Default budget, overridable with IMPORT_TIME_BUDGET_MS
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+
+# Modules that must only be loaded on first use, never at API startup
+FORBIDDEN_AT_STARTUP = [
+    "langgraph",
+    "langchain",
+    "langchain_core",
+    "langchain_openai",
+    "openai",
+    "scrapy",
+    "trafilatura",
+    "aiohttp",
+    "utils.llm_functions",
+]
+
+
+def measure_import(module: str = "main"):
+    """Import ``module`` once with -X importtime and return (cumulative_ms, imported modules)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        raise RuntimeError(f"Importing {module} failed")
+
+    cumulative_ms = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # Header line
+        name = parts[2].strip()
+        imported.add(name)
+        if name == module:
+            cumulative_ms = int(parts[1]) / 1000
+
+    return cumulative_ms, imported
+
+
+def find_forbidden(imported):
+    """Return the forbidden modules present in an import set"""
+    return sorted(
+        name for name in imported
+        if any(name == prefix or name.startswith(prefix + ".") for prefix in FORBIDDEN_AT_STARTUP)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if API startup imports regress")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Maximum median cumulative import time of main (ms)")
+    parser.add_argument("--runs", type=int, default=3, help="Number of fresh interpreters to sample")
+    parser.add_argument("--module", default="main", help="Module to import")
+    args = parser.parse_args()
+
+    timings = []
+    forbidden = set()
+    for _ in range(args.runs):
+        cumulative_ms, imported = measure_import(args.module)
+        if cumulative_ms is None:
+            print(f"❌ Could not find {args.module} in -X importtime output")
+            return 1
+        timings.append(cumulative_ms)
+        forbidden.update(find_forbidden(imported))
+
+    median_ms = statistics.median(timings)
+    print("🔍 Import-time budget check")
+    print("=" * 40)
+    print(f"Module: {args.module}")
+    print(f"Runs: {', '.join(f'{t:.0f}ms' for t in timings)}")
+    print(f"Median: {median_ms:.0f}ms (budget {args.budget_ms:.0f}ms)")
+
+    failed = False
+    if median_ms > args.budget_ms:
+        print(f"❌ Startup import time over budget by {median_ms - args.budget_ms:.0f}ms")
+        failed = True
+    if forbidden:
+        print("❌ Heavy modules imported at startup:")
+        for name in sorted(forbidden):
+            print(f"   - {name}")
+        failed = True
+
+    if not failed:
+        print("✅ Startup imports within budget")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
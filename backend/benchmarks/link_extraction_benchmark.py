@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Link extraction benchmark.
+
+Compares the previous extraction (one CSS query for all anchors plus 17
+article-selector queries, then urljoin into two sets) with the single-pass
+``LinkExtractor`` on a large homepage.
+
+Run from the backend directory:
+    python benchmarks/link_extraction_benchmark.py --anchors 3000
+    python benchmarks/link_extraction_benchmark.py --html saved_homepage.html --url https://www.cnbc.com/
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from urllib.parse import urljoin, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsel import Selector
+from utils.link_extractor import LinkExtractor, absolutize, netloc_of
+
+ARTICLE_SELECTORS = [
+    'a[href*="/article/"]', 'a[href*="/story/"]', 'a[href*="/news/"]', 'a[href*="/business/"]',
+    'a[href*="/finance/"]', 'a[href*="/markets/"]', 'a[href*="/economy/"]', 'a[href*="/technology/"]',
+    'a[href*="/earnings/"]', 'a[href*="/analysis/"]', '.article-link a', '.story-link a', '.news-link a',
+    '[data-testid*="article"] a', '[class*="article"] a', '[class*="story"] a', '[class*="news"] a',
+]
+
+
+def legacy_extract(selector, base_url, domain):
+    """TrafilaturaSpider.extract_links before single-pass extraction"""
+    links = set()
+    links.update(selector.css('a::attr(href)').getall())
+    for css in ARTICLE_SELECTORS:
+        links.update(selector.css(css + '::attr(href)').getall())
+    absolute_links = []
+    for link in links:
+        if link:
+            absolute_link = urljoin(base_url, link)
+            netloc = urlparse(absolute_link).netloc
+            if netloc == domain or netloc.endswith('.' + domain) or domain.endswith('.' + netloc):
+                absolute_links.append(absolute_link)
+    return list(set(absolute_links))
+
+
+def synthetic_homepage(anchors, seed=3):
+    rng = random.Random(seed)
+    sections = ['news', 'business', 'markets', 'world', 'politics', 'technology', 'video']
+    blocks = []
+    for i in range(anchors):
+        section = rng.choice(sections)
+        href = f"/{section}/2025/06/{rng.randint(10, 28)}/headline-{i}" if rng.random() < 0.7 else f"/{section}/"
+        if rng.random() < 0.1:
+            href = f"https://other-site.com/promo/{i}"
+        wrapper = rng.choice(['article-card', 'story-link', 'nav-item', 'news-feed__item', 'promo'])
+        blocks.append(
+            f'<div class="col"><div class="{wrapper}" data-testid="{rng.choice(["article-teaser", "nav"])}">'
+            f'<a href="{href}">Headline number {i}</a></div></div>'
+        )
+    return "<html><body><main>" + "".join(blocks) + "</main></body></html>"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark link extraction")
+    parser.add_argument("--anchors", type=int, default=3000)
+    parser.add_argument("--html", help="Saved homepage HTML file")
+    parser.add_argument("--url", default="https://www.example.com/")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.html:
+        with open(args.html, "r", encoding="utf-8", errors="replace") as f:
+            html = f.read()
+    else:
+        html = synthetic_homepage(args.anchors)
+    domain = urlparse(args.url).netloc
+
+    selector = Selector(text=html)
+    extractor = LinkExtractor()
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        legacy = legacy_extract(selector, args.url, domain)
+    legacy_time = (time.perf_counter() - start) / args.repeat
+
+    single_time = 0.0
+    for _ in range(args.repeat):
+        # Cold URL caches, as on the first page of a site
+        absolutize.cache_clear()
+        netloc_of.cache_clear()
+        start = time.perf_counter()
+        links = extractor.extract(selector.root, args.url, domain)
+        single_time += time.perf_counter() - start
+    single_time /= args.repeat
+
+    hinted = sum(1 for hints in links.values() if hints)
+    print("📊 Link extraction benchmark")
+    print("=" * 50)
+    print(f"Anchors: {len(selector.css('a'))}")
+    print(f"Legacy (18 CSS queries): {legacy_time * 1000:.2f}ms, {len(legacy)} links")
+    print(f"Single pass:             {single_time * 1000:.2f}ms, {len(links)} links ({hinted} with hints)")
+    print(f"Speedup: {legacy_time / single_time:.1f}x")
+    if set(legacy) != set(links):
+        print(f"⚠️  Link sets differ by {len(set(legacy) ^ set(links))} URLs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+LLM filter batching benchmark: fixed batches of 5 vs token-aware packing.
+
+For synthetic candidate sets of short, mixed and long articles, counts the
+LLM calls and estimated prompt tokens (excerpts plus the per-call prompt)
+needed to filter all of them, then simulates a model whose latency grows with
+prompt size and which fails now and then, to show how ``AdaptiveBatchSizer``
+settles. Finally runs ``batch_filter_articles`` against a fake LLM, and one
+that drops verdicts and sometimes answers in prose, to check that verdicts
+keyed by article id (with targeted retries) select exactly the expected
+articles.
+No API calls are made.
+
+Run from the backend directory:
+    python benchmarks/llm_batching_benchmark.py
+    python benchmarks/llm_batching_benchmark.py --articles 30 --failure-rate 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage
+from prometheus_client import REGISTRY
+
+from utils.constants import LLM_BATCHING_CONFIG, PERFORMANCE_CONFIG
+from utils.llm_batching import AdaptiveBatchSizer, article_excerpt, estimate_tokens, pack_batches
+from utils.llm_functions import batch_filter_articles
+
+PROMPT_TOKENS = 350  # instructions and business interest, sent with every call
+CONTENT_CHARS = 800
+
+CORPORA = {
+    'short': (150, 400),
+    'mixed': (150, 3000),
+    'long': (2000, 6000),
+}
+
+
+def make_articles(count, length_range, rng):
+    return [
+        {'title': f"Article {i}", 'content': "x" * rng.randint(*length_range)}
+        for i in range(count)
+    ]
+
+
+def fixed_batches(excerpts, size):
+    return [excerpts[i:i + size] for i in range(0, len(excerpts), size)]
+
+
+def cost(batches):
+    tokens = sum(PROMPT_TOKENS + sum(estimate_tokens(excerpt) for _, excerpt in batch) for batch in batches)
+    return len(batches), tokens
+
+
+def simulate_sizer(excerpts, rng, base_latency, seconds_per_1k_tokens, failure_rate, rounds):
+    """Simulated seconds and final limit when filtering the same candidates ``rounds`` times"""
+    sizer = AdaptiveBatchSizer()
+    elapsed = 0.0
+    for _ in range(rounds):
+        position = 0
+        while position < len(excerpts):
+            batch = pack_batches(excerpts[position:], LLM_BATCHING_CONFIG['MAX_PROMPT_TOKENS'], sizer.size)[0]
+            tokens = PROMPT_TOKENS + sum(estimate_tokens(excerpt) for _, excerpt in batch)
+            latency = base_latency + tokens / 1000 * seconds_per_1k_tokens * rng.uniform(0.8, 1.5)
+            failed = rng.random() < failure_rate
+            sizer.record(len(batch), latency, error=failed)
+            elapsed += latency
+            if not failed:
+                position += len(batch)
+    return elapsed / rounds, sizer.size
+
+
+class KeywordLLM:
+    """Answers like the filter prompt asks, marking articles whose title ends in 3 as relevant"""
+    model_name = 'benchmark-fake'
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        text = messages[0].content
+        ids = re.findall(r'<article id="(\d+)">\nTitle: Article (\d+)', text)
+        verdicts = {article_id: title.endswith('3') for article_id, title in ids}
+        return AIMessage(content=f"Sure, here are the verdicts:\n```json\n{json.dumps({'verdicts': verdicts})}\n```")
+
+
+class SloppyLLM(KeywordLLM):
+    """Like KeywordLLM, but drops the last verdict of every batch and sometimes answers in prose"""
+
+    def __init__(self, rng):
+        super().__init__()
+        self.rng = rng
+
+    def invoke(self, messages):
+        response = super().invoke(messages)
+        if self.rng.random() < 0.2:
+            return AIMessage(content="Article 1: Yes\nArticle 2: No")
+        verdicts = json.loads(response.content.split("```json\n")[1].split("\n```")[0])['verdicts']
+        if len(verdicts) > 1:
+            verdicts.pop(list(verdicts)[-1])
+        return AIMessage(content=json.dumps({'verdicts': verdicts}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LLM filter batching")
+    parser.add_argument("--articles", type=int, default=PERFORMANCE_CONFIG['RELEVANCE_TOP_K'])
+    parser.add_argument("--base-latency", type=float, default=1.5, help="simulated seconds per call")
+    parser.add_argument("--seconds-per-1k", type=float, default=0.4, help="simulated seconds per 1k prompt tokens")
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    print(f"📊 LLM filter batching, {args.articles} candidates, "
+          f"prompt budget {LLM_BATCHING_CONFIG['MAX_PROMPT_TOKENS']} tokens")
+    print("=" * 78)
+    print(f"{'corpus':8} {'fixed calls':>12} {'packed calls':>13} {'fixed tok':>10} {'packed tok':>11} "
+          f"{'sim s/run':>10} {'limit':>6}")
+    for name, length_range in CORPORA.items():
+        articles = make_articles(args.articles, length_range, rng)
+        excerpts = [(str(i), article_excerpt(str(i), a, CONTENT_CHARS)) for i, a in enumerate(articles)]
+        fixed_calls, fixed_tokens = cost(fixed_batches(excerpts, PERFORMANCE_CONFIG['BATCH_SIZE']))
+        packed_calls, packed_tokens = cost(pack_batches(
+            excerpts, LLM_BATCHING_CONFIG['MAX_PROMPT_TOKENS'], LLM_BATCHING_CONFIG['MAX_BATCH_SIZE']
+        ))
+        seconds, limit = simulate_sizer(excerpts, rng, args.base_latency, args.seconds_per_1k,
+                                        args.failure_rate, args.rounds)
+        print(f"{name:8} {fixed_calls:12} {packed_calls:13} {fixed_tokens:10,} {packed_tokens:11,} "
+              f"{seconds:10.1f} {limit:6}")
+
+    PERFORMANCE_CONFIG['MAX_RELEVANT_ARTICLES'] = args.articles
+    articles = make_articles(args.articles, CORPORA['mixed'], rng)
+    expected = [a['title'] for a in articles if a['title'].endswith('3')]
+    print()
+    for name, llm in (("well-formed", KeywordLLM()), ("sloppy", SloppyLLM(rng))):
+        selected = [a['title'] for a in asyncio.run(batch_filter_articles(articles, "benchmark", llm))]
+        retries = REGISTRY.get_sample_value('llm_verdict_retries_total', {'model': llm.model_name}) or 0
+        print(f"{'✅' if selected == expected else '❌'} {name} answers: selected {len(selected)} of "
+              f"{len(expected)} expected articles in {llm.calls} calls ({retries:.0f} retries so far)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+PerformanceMonitor streaming statistics benchmark.
+
+Feeds the same lognormal step durations to the streaming ``PerformanceMonitor``
+and to the previous list-per-step aggregation, then reports memory held,
+recording cost, summary cost and the error of the P² p50/p95/p99 estimates
+against exact quantiles. Also records from several threads at once and checks
+that no sample is lost.
+
+Run from the backend directory:
+    python benchmarks/monitor_benchmark.py
+    python benchmarks/monitor_benchmark.py --samples 1000000 --threads 8
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.constants import PERFORMANCE_CONFIG
+from utils.performance_monitor import PerformanceMonitor
+
+PERFORMANCE_CONFIG['LOG_PERFORMANCE'] = False
+
+STEPS = ["scrape", "filter", "summarize", "db_commit"]
+
+
+class LegacyMonitor:
+    """The aggregation as it was: every duration kept, summaries scan the lists"""
+
+    def __init__(self):
+        self.step_times = {}
+
+    def log_step(self, step_name, duration):
+        self.step_times.setdefault(step_name, []).append(duration)
+
+    def get_summary(self):
+        return {
+            step_name: {
+                'total': sum(times),
+                'average': sum(times) / len(times),
+                'min': min(times),
+                'max': max(times),
+                'count': len(times),
+            }
+            for step_name, times in self.step_times.items()
+        }
+
+
+def exact_quantile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def feed(factory, samples):
+    """(monitor, record s, summary s, bytes held); memory is traced on a separate run"""
+    monitor = factory()
+    start = time.perf_counter()
+    for step_name, duration in samples:
+        monitor.log_step(step_name, duration)
+    record_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(10):
+        monitor.get_summary()
+    summary_time = (time.perf_counter() - start) / 10
+
+    tracemalloc.start()
+    traced = factory()
+    for step_name, duration in samples:
+        traced.log_step(step_name, duration)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return monitor, record_time, summary_time, memory
+
+
+def new_monitor():
+    monitor = PerformanceMonitor(enabled=True)
+    monitor.start()
+    return monitor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PerformanceMonitor streaming stats")
+    parser.add_argument("--samples", type=int, default=200_000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    samples = [(rng.choice(STEPS), rng.lognormvariate(0, 1)) for _ in range(args.samples)]
+
+    monitor, new_record, new_summary, new_memory = feed(new_monitor, samples)
+    legacy, old_record, old_summary, old_memory = feed(LegacyMonitor, samples)
+
+    print(f"📊 PerformanceMonitor with {args.samples:,} samples over {len(STEPS)} steps")
+    print("=" * 66)
+    print(f"{'':18} {'memory KB':>12} {'record µs':>12} {'summary ms':>12}")
+    n = len(samples)
+    print(f"{'list per step':18} {old_memory / 1024:12.1f} {old_record / n * 1e6:12.2f} {old_summary * 1000:12.3f}")
+    print(f"{'streaming':18} {new_memory / 1024:12.1f} {new_record / n * 1e6:12.2f} {new_summary * 1000:12.3f}")
+
+    print("\nQuantile estimates vs exact (relative error)")
+    summary = monitor.get_summary()['step_times']
+    worst = 0.0
+    for step_name in STEPS:
+        exact = sorted(legacy.step_times[step_name])
+        stats = summary[step_name]
+        assert stats['count'] == len(exact)
+        assert abs(stats['stddev'] - statistics.stdev(exact)) < 1e-6 * statistics.stdev(exact)
+        errors = []
+        for q in PERFORMANCE_CONFIG['SUMMARY_QUANTILES']:
+            key = f"p{q * 100:g}"
+            error = abs(stats[key] - exact_quantile(exact, q)) / exact_quantile(exact, q)
+            worst = max(worst, error)
+            errors.append(f"{key} {error * 100:5.2f}%")
+        print(f"  {step_name:10} " + "  ".join(errors))
+
+    threaded = new_monitor()
+    per_thread = args.samples // args.threads
+    workers = [
+        threading.Thread(target=lambda: [threaded.log_step("step", 1.0) for _ in range(per_thread)])
+        for _ in range(args.threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    recorded = threaded.get_summary()['step_counts']['step']
+
+    print(f"\nWorst quantile error: {worst * 100:.2f}%")
+    print(f"{'✅' if recorded == per_thread * args.threads else '❌'} {args.threads} threads recorded "
+          f"{recorded:,} of {per_thread * args.threads:,} samples")
+
+
+if __name__ == "__main__":
+    main()
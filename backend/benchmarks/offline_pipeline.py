@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Offline load test of the news pipeline with a synthetic or replayed LLM.
+
+Runs ``get_news_async`` on a generated article corpus (no scraping) with the
+``synthetic`` backend from ``utils.llm_providers``, so filter and summarize
+latency come from a seeded lognormal distribution instead of the network.
+Each concurrency level runs the same number of analyses; the report shows
+analyses/s and p50/p95 latency, so the effect of concurrency changes in the
+pipeline can be measured reproducibly.
+
+``--backend replay`` answers from recordings instead (make them once with
+``LLM_BACKEND=record``); ``--check-replay`` records a synthetic run into a
+temporary directory and checks that replaying it gives identical summaries.
+
+Run from the backend directory:
+    python benchmarks/offline_pipeline.py
+    python benchmarks/offline_pipeline.py --concurrency 1,4,16 --latency 0.2 --failure-rate 0.05
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.constants import LLM_PROVIDER_CONFIG, PERFORMANCE_CONFIG
+from utils.llm_batching import reset_batch_sizers
+
+PERFORMANCE_CONFIG['LOG_PERFORMANCE'] = False
+
+from utils import llm_functions
+
+INTEREST = "Qatar economy and energy investment"
+RELEVANT = [
+    "Qatar's economy grew {n}% this quarter as LNG exports rose.",
+    "Doha markets rallied after the energy ministry announced new investment.",
+    "Analysts expect the Gulf economy to keep expanding through next year.",
+]
+OTHER = [
+    "The match ended two goals to one after a late penalty.",
+    "The film festival opened with a premiere attended by celebrities.",
+    "Local weather services expect rain over the weekend.",
+]
+
+
+def make_corpus(count, rng):
+    articles = []
+    for i in range(count):
+        sentences = RELEVANT if i % 3 else OTHER
+        content = " ".join(rng.choice(sentences).format(n=rng.randint(1, 9)) for _ in range(12))
+        articles.append({
+            'title': f"{'Qatar economy' if i % 3 else 'Weekend'} story {i}",
+            'url': f"https://example.com/news/{i}",
+            'content': content,
+        })
+    return articles
+
+
+def use_backend(backend, **synthetic):
+    LLM_PROVIDER_CONFIG['BACKEND'] = backend
+    LLM_PROVIDER_CONFIG['SYNTHETIC'].update(synthetic)
+    llm_functions.get_llm.cache_clear()
+
+
+async def run_level(articles, concurrency, analyses):
+    """Latencies of ``analyses`` pipeline runs, ``concurrency`` at a time"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await llm_functions.get_news_async(INTEREST, [], articles=articles)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(analyses)))
+    return latencies, time.perf_counter() - start
+
+
+def quiet(coro):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(coro)
+
+
+def check_replay(articles):
+    with tempfile.TemporaryDirectory() as directory:
+        LLM_PROVIDER_CONFIG['RECORDINGS_DIR'] = directory
+        LLM_PROVIDER_CONFIG['RECORD_UPSTREAM'] = 'synthetic'
+        use_backend('record', SEED=7, FAILURE_RATE=0.0)
+        recorded = quiet(llm_functions.get_news_async(INTEREST, [], articles=articles))
+        reset_batch_sizers()  # same batches as the recorded run
+        use_backend('replay')
+        start = time.perf_counter()
+        replayed = quiet(llm_functions.get_news_async(INTEREST, [], articles=articles))
+        elapsed = time.perf_counter() - start
+    ok = recorded == replayed and "Summary:" in replayed
+    print(f"{'✅' if ok else '❌'} replay reproduced the recorded summary in {elapsed * 1000:.0f}ms")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline pipeline load test with a synthetic LLM")
+    parser.add_argument("--articles", type=int, default=15)
+    parser.add_argument("--analyses", type=int, default=16, help="pipeline runs per concurrency level")
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument("--backend", default="synthetic", choices=["synthetic", "replay"])
+    parser.add_argument("--latency", type=float, default=0.1, help="median seconds per synthetic LLM call")
+    parser.add_argument("--sigma", type=float, default=0.5, help="lognormal spread of synthetic latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--check-replay", action="store_true")
+    args = parser.parse_args()
+
+    articles = make_corpus(args.articles, random.Random(args.seed))
+    if args.check_replay:
+        sys.exit(0 if check_replay(articles) else 1)
+
+    print(f"📊 Offline pipeline, {args.articles} articles, {args.backend} LLM "
+          f"(median {args.latency}s, sigma {args.sigma}, failures {args.failure_rate:.0%})")
+    print("=" * 66)
+    print(f"{'concurrency':>11} {'analyses/s':>11} {'p50 s':>8} {'p95 s':>8} {'max s':>8}")
+    for concurrency in [int(level) for level in args.concurrency.split(",")]:
+        reset_batch_sizers()
+        use_backend(args.backend, LATENCY=args.latency, LATENCY_SIGMA=args.sigma,
+                    FAILURE_RATE=args.failure_rate, SEED=args.seed)
+        latencies, elapsed = quiet(run_level(articles, concurrency, args.analyses))
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+        print(f"{concurrency:11} {len(latencies) / elapsed:11.2f} {statistics.median(latencies):8.2f} "
+              f"{p95:8.2f} {latencies[-1]:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Keyword pre-filter benchmark.
+
+Compares the compiled single-pass ``KeywordPreFilter`` with the previous
+per-keyword substring loops on a synthetic batch of articles, checks that both
+keep the same articles, and reports the per-article cost.
+
+Run from the backend directory:
+    python benchmarks/prefilter_benchmark.py --articles 5000
+    python benchmarks/prefilter_benchmark.py --input tmp/output.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.prefilter import KeywordPreFilter
+
+INTERESTS = [
+    "Qatar economy and financial markets",
+    "USA technology policy",
+    "UK politics",
+    "China economic growth and technology innovation",
+    "football transfer market",
+    "global shipping",
+]
+
+WORDS = (
+    "the government announced new policy measures for the economy while markets in doha "
+    "and london reacted to the financial news from beijing shanghai america analysts said "
+    "growth technology digital innovation trade tariffs inflation energy oil prices company "
+    "earnings revenue investors banks players team match game film music concert show"
+).split()
+
+
+def legacy_pre_filter(articles, business_interest):
+    """The pre-filter as it was before the compiled engine"""
+    business_interest_lower = business_interest.lower()
+    filtered_articles = []
+
+    geographic_keywords = []
+    if 'qatar' in business_interest_lower:
+        geographic_keywords.extend(['qatar', 'doha', 'gulf', 'middle east'])
+    if 'usa' in business_interest_lower or 'united states' in business_interest_lower:
+        geographic_keywords.extend(['usa', 'united states', 'america', 'american'])
+    if 'uk' in business_interest_lower or 'britain' in business_interest_lower:
+        geographic_keywords.extend(['uk', 'britain', 'england', 'london'])
+    if 'china' in business_interest_lower:
+        geographic_keywords.extend(['china', 'chinese', 'beijing', 'shanghai'])
+
+    topic_keywords = []
+    if 'economy' in business_interest_lower or 'economic' in business_interest_lower:
+        topic_keywords.extend(['economy', 'economic', 'finance', 'financial', 'business', 'market'])
+    if 'politics' in business_interest_lower or 'political' in business_interest_lower:
+        topic_keywords.extend(['politics', 'political', 'government', 'policy'])
+    if 'technology' in business_interest_lower or 'tech' in business_interest_lower:
+        topic_keywords.extend(['technology', 'tech', 'digital', 'innovation'])
+
+    for article in articles:
+        title = article.get('title', '').lower()
+        content = article.get('content', '').lower()
+        sports_keywords = ['football', 'soccer', 'basketball', 'tennis', 'golf', 'sport', 'match', 'game', 'player', 'team']
+        entertainment_keywords = ['movie', 'film', 'celebrity', 'actor', 'actress', 'music', 'concert', 'show']
+        is_sports = any(keyword in title or keyword in content[:200] for keyword in sports_keywords)
+        is_entertainment = any(keyword in title or keyword in content[:200] for keyword in entertainment_keywords)
+        if (is_sports or is_entertainment) and not any(keyword in business_interest_lower for keyword in ['sport', 'entertainment', 'football', 'movie', 'music']):
+            continue
+        if geographic_keywords:
+            if not any(keyword in title or keyword in content[:500] for keyword in geographic_keywords):
+                continue
+        if topic_keywords:
+            has_topic_match = any(keyword in title or keyword in content[:500] for keyword in topic_keywords)
+            if len(topic_keywords) > 2 and not has_topic_match:
+                continue
+        filtered_articles.append(article)
+    return filtered_articles
+
+
+def synthetic_articles(count, seed=42):
+    rng = random.Random(seed)
+    articles = []
+    for i in range(count):
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))).capitalize()
+        content = " ".join(rng.choice(WORDS) for _ in range(rng.randint(150, 900)))
+        articles.append({"title": title, "content": content, "url": f"https://example.com/news/story-{i}"})
+    return articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the keyword pre-filter")
+    parser.add_argument("--articles", type=int, default=5000, help="Synthetic batch size")
+    parser.add_argument("--input", help="JSON list of scraped articles (e.g. tmp/output.json)")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, "r") as f:
+            articles = json.load(f)
+    else:
+        articles = synthetic_articles(args.articles)
+
+    engine = KeywordPreFilter()
+
+    print("📊 Keyword pre-filter benchmark")
+    print("=" * 50)
+    print(f"Articles: {len(articles)}")
+    legacy_total = compiled_total = 0.0
+    for interest in INTERESTS:
+        start = time.perf_counter()
+        legacy = legacy_pre_filter(articles, interest)
+        legacy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        compiled = engine.filter(articles, interest)
+        compiled_time = time.perf_counter() - start
+        legacy_total += legacy_time
+        compiled_total += compiled_time
+
+        same = [a["url"] for a in legacy] == [a["url"] for a in compiled]
+        status = "✅" if same else "❌ results differ"
+        print(f"{interest!r}: kept {len(compiled)} | legacy {legacy_time * 1e6 / len(articles):.1f}µs/article"
+              f" | compiled {compiled_time * 1e6 / len(articles):.1f}µs/article {status}")
+
+    print(f"Speedup: {legacy_total / compiled_total:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
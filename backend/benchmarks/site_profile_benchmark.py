@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Site profile extraction benchmark.
+
+For every outlet in the profile registry, extracts the same pages with the
+generic trafilatura/CSS cascade and with the outlet's profile selectors, and
+reports time per page and yield (pages with content, title and date).
+
+Run from the backend directory:
+    python benchmarks/site_profile_benchmark.py                   # synthetic pages per profile
+    python benchmarks/site_profile_benchmark.py --corpus tmp/site_pages
+The corpus directory holds saved pages named <domain>__<anything>.html,
+e.g. cnbc.com__fed-rates.html.
+"""
+
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.article_extractor import extract_article
+from utils.site_profiles import PROFILES
+
+WORDS = (
+    "markets stocks earnings rates inflation energy oil gas bank investors revenue "
+    "quarter growth policy central trade shares guidance outlook economy analysts"
+).split()
+
+
+def class_of(css):
+    """'.article__content' -> 'article__content' (first class selector only)"""
+    css = css.split(',')[0].strip()
+    return css[1:].split('.')[0].split(' ')[0] if css.startswith('.') else 'content'
+
+
+def synthetic_page(profile, index, rng):
+    body = "".join(
+        "<p>" + " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 90))) + ".</p>"
+        for _ in range(rng.randint(12, 25))
+    )
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(120))
+    title_class = class_of(profile.title_selectors[0]) if profile.title_selectors else 'headline'
+    date_class = class_of(profile.date_selectors[0]) if profile.date_selectors else 'timestamp'
+    content_class = class_of(profile.content_selectors[0])
+    return (
+        f"<html><head><title>{profile.domain} story {index}</title></head><body>"
+        f"<nav><ul>{nav}</ul></nav><main>"
+        f'<h1 class="{title_class}">Markets story {index} from {profile.domain}</h1>'
+        f'<time class="{date_class}" datetime="2026-10-1{index % 9}T08:00:00Z">Oct 1{index % 9}, 2026</time>'
+        f'<div class="{content_class}">{body}</div>'
+        f'<aside>{"".join(f"<p>Related headline {i}</p>" for i in range(20))}</aside>'
+        f"</main><footer>{nav}</footer></body></html>"
+    )
+
+
+def load_pages(args):
+    """{domain: [page bytes]} from --corpus or synthesized per profile"""
+    pages = defaultdict(list)
+    if args.corpus:
+        for path in sorted(glob.glob(os.path.join(args.corpus, "*__*.html"))):
+            domain = os.path.basename(path).split("__")[0]
+            with open(path, "rb") as f:
+                pages[domain].append(f.read())
+    else:
+        rng = random.Random(5)
+        for domain, profile in PROFILES.profiles.items():
+            if profile.content_selectors:
+                pages[domain] = [synthetic_page(profile, i, rng).encode("utf-8") for i in range(args.pages)]
+    return pages
+
+
+def measure(pages, url, profile):
+    found = {"content": 0, "title": 0, "date": 0}
+    start = time.perf_counter()
+    for body in pages:
+        result = extract_article(body, url, profile=profile)
+        if result:
+            found["content"] += 1
+            found["title"] += bool(result["title"])
+            found["date"] += bool(result["publish_date"])
+    elapsed = (time.perf_counter() - start) / len(pages)
+    return elapsed, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark site profile extraction")
+    parser.add_argument("--corpus", help="Directory of saved <domain>__*.html pages")
+    parser.add_argument("--pages", type=int, default=30, help="Synthetic pages per site")
+    args = parser.parse_args()
+
+    pages = load_pages(args)
+    print("📊 Site profile extraction benchmark")
+    print("=" * 78)
+    print(f"{'site':22} {'pages':>5} {'generic ms':>11} {'profile ms':>11} {'speedup':>8}  yield c/t/d generic -> profile")
+    for domain, site_pages in pages.items():
+        profile = PROFILES.lookup(domain)
+        if profile is None:
+            print(f"{domain:22} no profile registered, skipped")
+            continue
+        url = f"https://www.{domain}/news/2026/10/18/story"
+        generic_time, generic = measure(site_pages, url, None)
+        profile_time, profiled = measure(site_pages, url, profile)
+        n = len(site_pages)
+        print(
+            f"{domain:22} {n:5d} {generic_time * 1000:11.2f} {profile_time * 1000:11.2f} "
+            f"{generic_time / profile_time:7.1f}x  "
+            f"{generic['content']}/{generic['title']}/{generic['date']} -> "
+            f"{profiled['content']}/{profiled['title']}/{profiled['date']} of {n}"
+        )
+
+
+if __name__ == "__main__":
+    main()
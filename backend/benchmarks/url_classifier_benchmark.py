@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+URL classification benchmark.
+
+Replays a link corpus through the previous per-pattern ``re.search`` loops and
+through the compiled ``UrlClassifier`` and reports links/second for each.
+
+Run from the backend directory:
+    python benchmarks/url_classifier_benchmark.py                      # synthetic corpus
+    python benchmarks/url_classifier_benchmark.py --record https://www.cnbc.com --corpus tmp/links.txt
+    python benchmarks/url_classifier_benchmark.py --corpus tmp/links.txt
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import urllib.request
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.url_classifier import UrlClassifier
+
+SKIP_PATTERNS = [
+    r'/login', r'/signup', r'/subscribe', r'/advertise', r'/contact',
+    r'/about', r'/privacy', r'/terms', r'/cookie', r'/sitemap',
+    r'/search', r'/tag/', r'/category/', r'/author/', r'/user/',
+    r'\.pdf$', r'\.jpg$', r'\.png$', r'\.gif$', r'\.mp4$', r'\.mp3$',
+    r'/video/', r'/gallery/', r'/slideshow/', r'/interactive/',
+    r'/newsletter', r'/rss', r'/feed', r'/api/', r'/ajax/',
+    r'#', r'\?utm_', r'\?fbclid', r'\?ref=', r'\?source='
+]
+LEGACY_ARTICLE_PATTERNS = [
+    r'/article/', r'/story/', r'/news/', r'/business/', r'/finance/',
+    r'/markets/', r'/economy/', r'/technology/', r'/earnings/',
+    r'/analysis/', r'/commentary/', r'/opinion/', r'/report/',
+    r'\d{4}/\d{2}/\d{2}', r'\d{4}-\d{2}-\d{2}', r'[a-z-]+-\d+',
+]
+LEGACY_CATEGORY_PATTERNS = [
+    r'/business/', r'/finance/', r'/markets/', r'/economy/', r'/technology/',
+    r'/news/', r'/world/', r'/politics/', r'/opinion/', r'/analysis/',
+    r'/earnings/', r'/stocks/', r'/commodities/', r'/currencies/',
+    r'/cryptocurrency/', r'/crypto/', r'/blockchain/', r'/ai/', r'/artificial-intelligence/',
+    r'/startups/', r'/venture-capital/', r'/ipo/', r'/mergers/', r'/acquisitions/',
+    r'/regulation/', r'/policy/', r'/trade/', r'/tariffs/', r'/inflation/',
+    r'/interest-rates/', r'/federal-reserve/', r'/central-bank/', r'/monetary-policy/'
+]
+LEGACY_PAGINATION_PATTERNS = [
+    r'/page/\d+', r'/p/\d+', r'/page\d+', r'/p\d+',
+    r'\?page=\d+', r'\&page=\d+', r'\?p=\d+', r'\&p=\d+',
+    r'/news/page/\d+', r'/business/page/\d+', r'/technology/page/\d+',
+    r'/finance/page/\d+', r'/markets/page/\d+', r'/economy/page/\d+',
+    r'page=\d+', r'p=\d+', r'offset=\d+', r'start=\d+'
+]
+
+
+def legacy_classify(url, domain):
+    """The is_* chain from TrafilaturaSpider.parse before the compiled classifier"""
+    skipped = any(re.search(p, url, re.IGNORECASE) for p in SKIP_PATTERNS)
+    if not skipped and (any(re.search(p, url, re.IGNORECASE) for p in LEGACY_ARTICLE_PATTERNS) or len(url) > 50):
+        return 'article'
+    if any(re.search(p, url, re.IGNORECASE) for p in LEGACY_CATEGORY_PATTERNS):
+        return 'category'
+    if any(re.search(p, url, re.IGNORECASE) for p in LEGACY_PAGINATION_PATTERNS):
+        return 'pagination'
+    if not skipped:
+        netloc = urlparse(url).netloc
+        if netloc == domain or netloc.endswith('.' + domain) or domain.endswith('.' + netloc):
+            return 'internal'
+    return None
+
+
+class _LinkParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.hrefs = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            href = dict(attrs).get('href')
+            if href:
+                self.hrefs.append(href)
+
+
+def record_links(url, path):
+    """Fetch a homepage and save its absolute links, one per line"""
+    request = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
+    with urllib.request.urlopen(request, timeout=15) as response:
+        html = response.read().decode('utf-8', errors='replace')
+    parser = _LinkParser()
+    parser.feed(html)
+    links = [urljoin(url, href) for href in parser.hrefs]
+    with open(path, 'a') as f:
+        for link in links:
+            f.write(link + '\n')
+    print(f"Recorded {len(links)} links from {url} to {path}")
+
+
+def synthetic_links(count, seed=7):
+    rng = random.Random(seed)
+    sections = ['news', 'business', 'markets', 'world', 'politics', 'tech', 'video', 'tag', 'author', 'live']
+    links = []
+    for i in range(count):
+        host = rng.choice(['https://www.example.com', 'https://news.example.com', 'https://cdn.other.net'])
+        kind = rng.random()
+        if kind < 0.4:
+            path = f"/{rng.choice(sections)}/2025/0{rng.randint(1, 9)}/1{rng.randint(0, 9)}/some-headline-words-{i}"
+        elif kind < 0.6:
+            path = f"/{rng.choice(sections)}/"
+        elif kind < 0.7:
+            path = f"/{rng.choice(sections)}/page/{rng.randint(2, 9)}"
+        elif kind < 0.8:
+            path = rng.choice(['/about', '/privacy', '/login', '/subscribe?utm_source=nav', '/#main'])
+        else:
+            path = f"/{rng.choice(sections)}/{'x' * rng.randint(3, 12)}"
+        links.append(host + path)
+    return links
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark URL classification")
+    parser.add_argument("--corpus", help="File with one recorded link per line")
+    parser.add_argument("--record", nargs="*", help="Homepages to record into --corpus first")
+    parser.add_argument("--links", type=int, default=20000, help="Synthetic corpus size")
+    parser.add_argument("--domain", default="example.com")
+    args = parser.parse_args()
+
+    if args.record:
+        if not args.corpus:
+            parser.error("--record requires --corpus")
+        for url in args.record:
+            record_links(url, args.corpus)
+
+    if args.corpus:
+        with open(args.corpus) as f:
+            links = [line.strip() for line in f if line.strip()]
+    else:
+        links = synthetic_links(args.links)
+
+    # Legacy: every link on every page
+    start = time.perf_counter()
+    legacy = [legacy_classify(link, args.domain) for link in links]
+    legacy_time = time.perf_counter() - start
+
+    # Compiled, without the cross-page cache
+    classifier = UrlClassifier(cache_size=0)
+    start = time.perf_counter()
+    compiled = [classifier._classify(link, args.domain) for link in links]
+    compiled_time = time.perf_counter() - start
+
+    # Compiled with the cache, as when pages share navigation links
+    cached = UrlClassifier()
+    for link in links:
+        cached.classify(link, args.domain)
+    start = time.perf_counter()
+    for link in links:
+        cached.classify(link, args.domain)
+    cached_time = time.perf_counter() - start
+
+    changed = sum(1 for a, b in zip(legacy, compiled) if a != b)
+    print("📊 URL classification benchmark")
+    print("=" * 50)
+    print(f"Links: {len(links)}")
+    print(f"Legacy pattern loops: {len(links) / legacy_time:,.0f} links/s")
+    print(f"Compiled classifier:  {len(links) / compiled_time:,.0f} links/s ({legacy_time / compiled_time:.1f}x)")
+    print(f"Compiled + cache hit: {len(links) / cached_time:,.0f} links/s ({legacy_time / cached_time:.1f}x)")
+    print(f"Classification changes from ARTICLE_PATTERNS config: {changed}")
+
+
+if __name__ == "__main__":
+    main()
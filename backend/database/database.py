@@ -1,8 +1,14 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
 from dotenv import load_dotenv
+from utils.env import env_float, env_int
 
 load_dotenv()
 
@@ -28,6 +34,77 @@ else:
         connect_args={"check_same_thread": False}
     )
 
+# Statement timing: slow-query log and per-request query stats
+SLOW_QUERY_MS = env_float("SLOW_QUERY_MS", 200.0)
+# Identical statements run this often in one request are reported as N+1
+N_PLUS_ONE_THRESHOLD = env_int("N_PLUS_ONE_THRESHOLD", 5)
+
+class QueryStats:
+    """Statements run on behalf of one request"""
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+        self.slow = 0
+        self.statements = Counter()
+
+    def add(self, statement: str, duration: float, slow: bool):
+        self.queries += 1
+        self.duration += duration
+        self.slow += slow
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int = None) -> List[Tuple[str, int]]:
+        """Statements run at least ``threshold`` times (likely N+1 queries)"""
+        threshold = threshold or N_PLUS_ONE_THRESHOLD
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+@contextmanager
+def track_queries():
+    """Collect stats for every statement executed in this context (e.g. one request)"""
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+def redact_parameters(parameters):
+    """Parameter shapes without their values, safe to log"""
+    if isinstance(parameters, dict):
+        return {key: f"<{type(value).__name__}>" for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} parameter sets>"  # executemany
+        return [f"<{type(value).__name__}>" for value in parameters]
+    return "<redacted>"
+
+@event.listens_for(engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+@event.listens_for(engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_times")
+    if not start_times:
+        return
+    duration = time.perf_counter() - start_times.pop()
+    slow = duration * 1000 >= SLOW_QUERY_MS
+    if slow:
+        print(f"[DB] Slow query ({duration * 1000:.1f}ms): {' '.join(statement.split())} "
+              f"params={redact_parameters(parameters)}")
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.add(statement, duration, slow)
+
+@event.listens_for(engine, "handle_error")
+def _discard_query_timer(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_times"):
+        conn.info["query_start_times"].pop()
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
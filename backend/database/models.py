@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.ext.declarative import declarative_base
@@ -16,6 +16,7 @@ class Client(Base):
     business_interests = relationship("BusinessInterest", back_populates="client", cascade="all, delete-orphan")
     analysis_sessions = relationship("AnalysisSession", back_populates="client", cascade="all, delete-orphan")
     client_sources = relationship("ClientSource", back_populates="client", cascade="all, delete-orphan")
+    llm_usage = relationship("LLMUsage", back_populates="client", cascade="all, delete-orphan")
 
 class Source(Base):
     __tablename__ = "source"
@@ -62,4 +63,30 @@ class AnalysisSession(Base):
     
     # Relationships
     client = relationship("Client", back_populates="analysis_sessions")
-    business_interest = relationship("BusinessInterest", back_populates="analysis_sessions") 
\ No newline at end of file
+    business_interest = relationship("BusinessInterest", back_populates="analysis_sessions")
+    llm_usage = relationship("LLMUsage", back_populates="analysis_session")
+
+class LLMUsage(Base):
+    """Tokens and estimated cost of one LLM call"""
+    __tablename__ = "llm_usage"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    client_id = Column(String(255), ForeignKey("client.client_id"), nullable=False)
+    # Null when the analysis failed before its session was saved
+    analysis_session_id = Column(Integer, ForeignKey("analysis_session.id", ondelete="SET NULL"), nullable=True, index=True)
+    stage = Column(String(50), nullable=False)
+    model = Column(String(100), nullable=False)
+    input_tokens = Column(Integer, nullable=False, default=0)
+    output_tokens = Column(Integer, nullable=False, default=0)
+    cost_usd = Column(Float, nullable=False, default=0.0)
+    budget_mode = Column(String(20), nullable=False, default="normal")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    client = relationship("Client", back_populates="llm_usage")
+    analysis_session = relationship("AnalysisSession", back_populates="llm_usage")
+    
+    __table_args__ = (
+        Index("ix_llm_usage_client_created", "client_id", "created_at"),
+    )
+ 
\ No newline at end of file
@@ -1,16 +1,21 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, status, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from contextlib import asynccontextmanager
 import uvicorn
+import asyncio
 import os
+import time
 from dotenv import load_dotenv
-from database.database import engine
+from database.database import engine, track_queries
 from database.models import Base
 
 # Import routers
-from api.routes import auth, sources, news, analysis
+from api.routes import auth, sources, news, analysis, admin
 from database.database import init_db
+from utils.http_client import close_session
+from utils import metrics, tracing, profiler
+from utils.constants import TRACING_CONFIG
 
 # Load environment variables
 load_dotenv()
@@ -29,6 +34,8 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     print("Shutting down News Analyzer API...")
+    await close_session()
+    metrics.mark_process_dead()
 
 # Create FastAPI app
 app = FastAPI(
@@ -45,8 +52,80 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Trace-Id", "Server-Timing", "X-Profile-Id"],
 )
 
+# Request counts and latencies per route template, plus the request's DB time
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status_code = 500  # unless the app produces a response
+    with track_queries() as queries:
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            elapsed = time.perf_counter() - start
+            response.headers["Server-Timing"] = (
+                f'db;dur={queries.duration * 1000:.1f};desc="{queries.queries} queries", '
+                f'app;dur={elapsed * 1000:.1f}'
+            )
+            return response
+        finally:
+            route = metrics.route_template(request)
+            repeated = queries.repeated()
+            for statement, count in repeated:
+                print(f"[DB] Possible N+1 in {request.method} {route}: {count}x {' '.join(statement.split())[:200]}")
+            metrics.record_request(request.method, route, status_code, time.perf_counter() - start)
+            metrics.record_db_usage(route, queries, bool(repeated))
+            tracing.set_attributes(**{"db.queries": queries.queries, "db.duration_ms": round(queries.duration * 1000, 1)})
+
+# One trace per request; its id is returned in X-Trace-Id
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    if request.url.path in TRACING_CONFIG['EXCLUDED_PATHS']:
+        return await call_next(request)
+    trace_id, parent_span_id = tracing.parse_traceparent(request.headers.get("traceparent"))
+    with tracing.start_trace(
+        f"{request.method} {request.url.path}", trace_id, parent_span_id,
+        **{"http.method": request.method, "http.target": request.url.path}
+    ) as root:
+        response = await call_next(request)
+        route = metrics.route_template(request)
+        root.name = f"{request.method} {route}"
+        root.set_attributes(**{"http.route": route, "http.status_code": response.status_code})
+        response.headers["X-Trace-Id"] = root.trace_id
+        return response
+
+# Admins can profile a single request by tagging it with X-Profile
+@app.middleware("http")
+async def profile_tagged_requests(request: Request, call_next):
+    tag = request.headers.get("X-Profile")
+    credentials = request.headers.get("Authorization", "")
+    if not tag or not admin.is_admin(credentials.removeprefix("Bearer ").strip()):
+        return await call_next(request)
+    request_profiler = profiler.SamplingProfiler(loop=asyncio.get_running_loop())
+    try:
+        request_profiler.start()
+    except profiler.ProfilerBusy:
+        return await call_next(request)
+    except Exception as e:
+        print(f"[Profiler] Could not start profiling: {e}")
+        return await call_next(request)
+    try:
+        response = await call_next(request)
+    finally:
+        # Joining the sampler and writing the report would otherwise stall the event loop
+        await asyncio.to_thread(request_profiler.stop)
+    summary = await asyncio.to_thread(profiler.save_profile, request_profiler, profiler.new_profile_id(), tag=tag)
+    response.headers["X-Profile-Id"] = summary["id"]
+    return response
+
+# Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    content, content_type = metrics.render_latest()
+    return Response(content=content, headers={"Content-Type": content_type})
+
 # Health check endpoint
 @app.get("/api/health")
 async def health_check():
@@ -57,6 +136,7 @@ app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(sources.router, prefix="/api/sources", tags=["Sources"])
 app.include_router(news.router, prefix="/api/news", tags=["News"])
 app.include_router(analysis.router, prefix="/api/analysis", tags=["Analysis"])
+app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
 
 @app.get("/")
 async def root():
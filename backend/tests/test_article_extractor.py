@@ -0,0 +1,34 @@
+"""Site profile fast path of the article extractor"""
+from utils.article_extractor import extract_article
+from utils.site_profiles import SiteProfile
+
+BODY = " ".join(f"Sentence {i} of the story about Gulf energy investment." for i in range(20))
+NAV = "".join(f'<li><a href="/section/{i}">Section number {i} of the site</a></li>' for i in range(40))
+
+
+def page(article_class):
+    return f"""<html><head><title>Energy story headline</title></head><body>
+    <div class="content"><nav><ul>{NAV}</ul></nav>
+    <h1 class="headline__text">Energy story headline</h1>
+    <div class="{article_class}"><p>{BODY}</p></div></div></body></html>"""
+
+
+def test_profile_selector_matching_the_article_body():
+    profile = SiteProfile(domain='example.com', content_selectors=['.body-copy'], title_selectors=['.headline__text'])
+    result = extract_article(page('body-copy'), 'https://example.com/news/1', profile=profile)
+    assert result['extraction_method'] == 'profile'
+    assert result['content'] == BODY
+    assert result['title'] == 'Energy story headline'
+
+
+def test_profile_match_on_page_wrapper_falls_back_to_generic_cascade():
+    profile = SiteProfile(domain='example.com', content_selectors=['.content'])
+    result = extract_article(page('story-body'), 'https://example.com/news/1', profile=profile)
+    assert result['extraction_method'] != 'profile'
+    assert 'Section number' not in result['content']
+
+
+def test_link_heavy_match_is_rejected():
+    profile = SiteProfile(domain='example.com', content_selectors=['ul'])
+    result = extract_article(page('story-body'), 'https://example.com/news/1', profile=profile)
+    assert result['extraction_method'] != 'profile'
@@ -0,0 +1,84 @@
+"""Crawl frontier scoring and per-domain budgets"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from utils import crawl_frontier
+from utils.crawl_frontier import CrawlFrontier, FrontierBudgetMiddleware
+from utils.scraping_config import CRAWL_FRONTIER
+
+
+def config(**overrides):
+    return dict(CRAWL_FRONTIER, **overrides)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(crawl_frontier, 'time', SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def test_articles_outrank_category_pages():
+    frontier = CrawlFrontier()
+    assert frontier.score('article') > frontier.score('category') > frontier.score('internal')
+
+
+def test_fresher_articles_score_higher():
+    frontier = CrawlFrontier(max_age_days=7)
+    today = frontier.score('article', publish_date=datetime.now())
+    week_old = frontier.score('article', publish_date=datetime.now() - timedelta(days=6))
+    undated = frontier.score('article')
+    assert today > undated > week_old
+
+
+def test_future_dates_count_as_today():
+    frontier = CrawlFrontier()
+    tomorrow = frontier.score('article', publish_date=datetime.now() + timedelta(days=1))
+    assert tomorrow == pytest.approx(frontier.score('article', publish_date=datetime.now()), abs=1)
+
+
+def test_hint_bonus_is_capped():
+    frontier = CrawlFrontier(config=config(hint_weight=5, max_hint_bonus=15))
+    base = frontier.score('article')
+    assert frontier.score('article', hints={'h1'}) == base + 5
+    assert frontier.score('article', hints={'h1', 'h2', 'h3', 'h4', 'h5'}) == base + 15
+
+
+def test_depth_penalty():
+    frontier = CrawlFrontier(config=config(depth_penalty=15))
+    assert frontier.score('category', depth=0) - frontier.score('category', depth=2) == 30
+
+
+def test_priority_rounds_the_score():
+    assert CrawlFrontier().priority(141.6) == 142
+
+
+def test_request_budget(clock):
+    frontier = CrawlFrontier(config=config(max_requests_per_domain=2))
+    assert [frontier.admit('a.com') for _ in range(3)] == [True, True, False]
+    assert frontier.admit('b.com')
+    assert frontier.stats() == {'a.com': {'requests': 2, 'rejected': 1}, 'b.com': {'requests': 1, 'rejected': 0}}
+
+
+def test_time_budget(clock):
+    frontier = CrawlFrontier(config=config(time_budget_seconds=60))
+    assert frontier.admit('a.com')
+    assert not frontier.expired('a.com')
+    clock.value += 61
+    assert frontier.expired('a.com')
+    assert not frontier.admit('a.com')
+    assert not frontier.expired('unseen.com')
+
+
+def test_middleware_drops_requests_of_expired_domains(clock):
+    frontier = CrawlFrontier(config=config(time_budget_seconds=60))
+    spider = SimpleNamespace(frontier=frontier)
+    request = SimpleNamespace(meta={'domain': 'a.com'})
+    frontier.admit('a.com')
+    assert FrontierBudgetMiddleware().process_request(request, spider) is None
+    clock.value += 61
+    with pytest.raises(crawl_frontier.IgnoreRequest):
+        FrontierBudgetMiddleware().process_request(request, spider)
+    assert frontier.rejected['a.com'] == 1
@@ -0,0 +1,36 @@
+"""Listing-page dates for article links"""
+from datetime import datetime
+
+import lxml.html
+
+from utils.date_inference import listing_dates
+
+BASE = "https://news.example.com/world/"
+
+
+def dates_of(html):
+    return listing_dates(lxml.html.fromstring(html), BASE)
+
+
+def test_time_inside_link():
+    dates = dates_of('<div><a href="/a/1"><time datetime="2026-10-01">1 Oct</time> Story</a></div>')
+    assert list(dates) == ["https://news.example.com/a/1"]
+    assert dates["https://news.example.com/a/1"].date() == datetime(2026, 10, 1).date()
+
+
+def test_time_in_teaser_block_with_one_link():
+    dates = dates_of('<article><h2><a href="story">Story</a></h2><time datetime="2026-10-02"></time></article>')
+    assert list(dates) == ["https://news.example.com/world/story"]
+
+
+def test_ambiguous_block_is_skipped():
+    assert dates_of('<div><a href="/a/1">One</a><a href="/a/2">Two</a><time datetime="2026-10-02"></time></div>') == {}
+
+
+def test_link_without_href_falls_back_to_enclosing_block():
+    html = '<article><a href="/a/3">Story</a><a><time datetime="2026-10-03">3 Oct</time></a></article>'
+    assert list(dates_of(html)) == ["https://news.example.com/a/3"]
+
+
+def test_link_without_href_and_no_other_link():
+    assert dates_of('<div><a><time datetime="2026-10-03">3 Oct</time></a></div>') == {}
@@ -0,0 +1,107 @@
+"""Feed autodiscovery, sitemap parsing and article selection"""
+from datetime import datetime
+
+import lxml.html
+
+from utils.feed_discovery import (
+    DiscoveredArticle, candidate_urls, find_feed_links, is_sitemap, parse_feed, parse_sitemap,
+    pick_child_sitemaps, select_articles,
+)
+from utils.scraping_config import FEED_DISCOVERY
+
+BASE = "https://news.example.com/"
+
+RSS = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>News</title>
+<item><title>First</title><link>https://news.example.com/a/1</link><pubDate>Mon, 12 Oct 2026 08:00:00 GMT</pubDate></item>
+<item><title>No link</title></item>
+<item><title>Relative</title><link>/a/2</link></item>
+</channel></rss>"""
+
+URLSET = b"""<?xml version="1.0"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">
+<url><loc>https://news.example.com/a/1</loc>
+  <news:news><news:publication_date>2026-10-12T08:00:00Z</news:publication_date><news:title>First</news:title></news:news></url>
+<url><loc> https://news.example.com/a/2 </loc><lastmod>2026-10-10</lastmod></url>
+<url><loc></loc></url>
+</urlset>"""
+
+INDEX = b"""<?xml version="1.0"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+<sitemap><loc>https://news.example.com/sitemap-pages.xml</loc><lastmod>2026-10-12</lastmod></sitemap>
+<sitemap><loc>https://news.example.com/sitemap-news.xml</loc><lastmod>2026-01-01</lastmod></sitemap>
+<sitemap><loc>https://news.example.com/sitemap-2025.xml</loc><lastmod>2025-01-01</lastmod></sitemap>
+</sitemapindex>"""
+
+
+def test_find_feed_links():
+    root = lxml.html.fromstring("""<html><head>
+        <link rel="alternate" type="application/rss+xml" href="/feed.xml">
+        <link rel="Alternate" type="application/atom+xml; charset=utf-8" href="https://news.example.com/atom">
+        <link rel="alternate" type="application/rss+xml" href="/feed.xml">
+        <link rel="alternate" type="text/html" href="/fr/">
+        <link rel="stylesheet" type="text/css" href="/style.css">
+        </head><body></body></html>""")
+    assert find_feed_links(root, BASE) == ["https://news.example.com/feed.xml", "https://news.example.com/atom"]
+
+
+def test_candidate_urls_prefer_advertised_feeds():
+    config = dict(FEED_DISCOVERY, max_feeds_per_source=1)
+    urls = candidate_urls(BASE, ["https://news.example.com/feed.xml", "https://news.example.com/atom"], config)
+    assert urls == ["https://news.example.com/feed.xml", "https://news.example.com/sitemap.xml"]
+
+
+def test_candidate_urls_probe_usual_paths():
+    assert candidate_urls(BASE, []) == [
+        "https://news.example.com/feed", "https://news.example.com/rss", "https://news.example.com/sitemap.xml",
+    ]
+
+
+def test_is_sitemap():
+    assert is_sitemap(URLSET) and is_sitemap(INDEX)
+    assert not is_sitemap(RSS)
+
+
+def test_parse_feed():
+    articles = parse_feed(RSS, BASE)
+    assert [a.url for a in articles] == ["https://news.example.com/a/1", "https://news.example.com/a/2"]
+    assert articles[0].title == "First"
+    assert articles[0].publish_date is not None
+    assert articles[1].publish_date is None
+
+
+def test_parse_feed_of_html_is_empty():
+    assert parse_feed(b"<html><body>Not a feed</body></html>", BASE) == []
+
+
+def test_parse_news_sitemap():
+    articles, children = parse_sitemap(URLSET)
+    assert children == []
+    assert [a.url for a in articles] == ["https://news.example.com/a/1", "https://news.example.com/a/2"]
+    assert articles[0].title == "First"
+    assert articles[0].publish_date.date() == datetime(2026, 10, 12).date()
+    assert articles[1].publish_date.date() == datetime(2026, 10, 10).date()
+
+
+def test_parse_garbage_sitemap():
+    assert parse_sitemap(b"not xml at all") == ([], [])
+
+
+def test_child_sitemaps_news_first_then_newest():
+    _, children = parse_sitemap(INDEX)
+    assert pick_child_sitemaps(children, 2) == [
+        "https://news.example.com/sitemap-news.xml", "https://news.example.com/sitemap-pages.xml",
+    ]
+
+
+def test_select_articles_same_site_unique_newest_first():
+    articles = [
+        DiscoveredArticle("https://news.example.com/a/old", datetime(2026, 10, 1)),
+        DiscoveredArticle("https://news.example.com/a/undated", None),
+        DiscoveredArticle("https://www.example.com/a/new", datetime(2026, 10, 12)),
+        DiscoveredArticle("https://news.example.com/a/old", datetime(2026, 10, 1)),
+        DiscoveredArticle("https://other.com/a/newest", datetime(2026, 10, 13)),
+    ]
+    selected = select_articles(articles, "example.com", limit=3)
+    assert [a.url for a in selected] == [
+        "https://www.example.com/a/new", "https://news.example.com/a/old", "https://news.example.com/a/undated",
+    ]
+    assert len(select_articles(articles, "example.com", limit=1)) == 1
@@ -0,0 +1,49 @@
+"""Connection reuse of the shared HTTP client"""
+import asyncio
+
+from aiohttp import web
+
+from utils import http_client
+
+
+async def serve(handler):
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def status_checks(body, checks=3):
+    """Statuses of repeated GET status checks and the client ports the server saw"""
+    async def run():
+        peers = set()
+
+        async def handler(request):
+            peers.add(request.transport.get_extra_info('peername')[1])
+            return web.Response(body=body)
+
+        runner, base = await serve(handler)
+        try:
+            statuses = [await http_client.fetch_status(f"{base}/page/{i}") for i in range(checks)]
+        finally:
+            await http_client.close_session()
+            await runner.cleanup()
+        return statuses, peers
+
+    return asyncio.run(run())
+
+
+def test_get_status_checks_reuse_one_connection():
+    statuses, peers = status_checks(b"x" * 100_000)
+    assert statuses == [200, 200, 200]
+    assert len(peers) == 1
+
+
+def test_oversized_body_is_not_downloaded_in_full():
+    statuses, peers = status_checks(b"x" * (http_client.HTTP_CLIENT_CONFIG['MAX_DRAIN_BYTES'] * 8), checks=2)
+    assert statuses == [200, 200]
+    assert len(peers) == 2
@@ -0,0 +1,103 @@
+"""Id-keyed filter verdicts: response validation and targeted retries"""
+import json
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from utils.llm_batching import _json_object, validate_verdicts
+from utils.llm_functions import request_verdicts
+
+IDS = ['1', '2', '3']
+PROMPT = "{business_interest}\n{articles_text}\n{example_id}"
+
+
+def answer(verdicts):
+    return json.dumps({'verdicts': verdicts})
+
+
+class StubLLM:
+    """Replays canned answers (or raises canned errors) and records the prompts it got"""
+    model_name = 'test-stub'
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.prompts = []
+
+    def invoke(self, messages):
+        self.prompts.append(messages[0].content)
+        reply = self.answers.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return AIMessage(content=reply)
+
+
+def batch(ids):
+    return [(i, f'<article id="{i}">\nTitle: Article {i}\n</article>') for i in ids]
+
+
+def test_json_object_accepts_code_fences_and_prose():
+    assert _json_object('{"a": 1}') == {'a': 1}
+    assert _json_object('Here you go:\n```json\n{"a": 1}\n```') == {'a': 1}
+    assert _json_object('not json at all') is None
+    assert _json_object('[1, 2]') is None
+
+
+def test_valid_verdicts():
+    check = validate_verdicts(answer({'1': True, '2': False, '3': True}), IDS)
+    assert check.verdicts == {'1': True, '2': False, '3': True}
+    assert check.missing == []
+    assert check.errors == []
+
+
+def test_code_fenced_verdicts():
+    check = validate_verdicts(f"```json\n{answer({'1': True, '2': False, '3': False})}\n```", IDS)
+    assert check.verdicts == {'1': True, '2': False, '3': False}
+    assert check.errors == []
+
+
+def test_invalid_json_leaves_every_id_missing():
+    check = validate_verdicts("Article 1: Yes\nArticle 2: No", IDS)
+    assert check.verdicts == {}
+    assert check.missing == IDS
+    assert check.errors == ['invalid_json']
+
+
+def test_unknown_ids_are_ignored():
+    check = validate_verdicts(answer({'1': True, '2': False, '3': True, '99': True}), IDS)
+    assert '99' not in check.verdicts
+    assert check.missing == []
+    assert check.errors == ['unknown_id']
+
+
+def test_string_and_non_bool_values():
+    check = validate_verdicts(answer({'1': 'yes', '2': ' False ', '3': 1}), IDS)
+    assert check.verdicts == {'1': True, '2': False}
+    assert check.missing == ['3']
+    assert check.errors == ['invalid_value', 'missing_ids']
+
+
+def test_missing_ids():
+    check = validate_verdicts(answer({'2': True}), IDS)
+    assert check.verdicts == {'2': True}
+    assert check.missing == ['1', '3']
+    assert check.errors == ['missing_ids']
+
+
+def test_retry_asks_only_about_missing_articles():
+    llm = StubLLM(answer({'1': True, '2': False}), answer({'3': True}))
+    verdicts = request_verdicts(llm, PROMPT, "interest", batch(IDS))
+    assert verdicts == {'1': True, '2': False, '3': True}
+    assert len(llm.prompts) == 2
+    assert '<article id="3">' in llm.prompts[1]
+    assert '<article id="1">' not in llm.prompts[1] and '<article id="2">' not in llm.prompts[1]
+
+
+def test_failed_retry_keeps_collected_verdicts():
+    llm = StubLLM(answer({'1': True, '2': True}), RuntimeError("upstream down"))
+    assert request_verdicts(llm, PROMPT, "interest", batch(IDS)) == {'1': True, '2': True}
+
+
+def test_failed_first_call_is_raised():
+    llm = StubLLM(RuntimeError("upstream down"))
+    with pytest.raises(RuntimeError):
+        request_verdicts(llm, PROMPT, "interest", batch(IDS))
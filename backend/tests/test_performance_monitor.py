@@ -0,0 +1,53 @@
+"""Streaming statistics against the exact results from the statistics module"""
+import random
+import statistics
+
+import pytest
+
+from utils.performance_monitor import P2Quantile, StreamingStats
+
+
+@pytest.fixture
+def sample():
+    # Skewed like request latencies
+    rng = random.Random(1234)
+    return [rng.lognormvariate(0, 0.75) for _ in range(5000)]
+
+
+def exact(values, p):
+    return statistics.quantiles(values, n=100, method='inclusive')[round(p * 100) - 1]
+
+
+@pytest.mark.parametrize('p', [0.5, 0.95])
+def test_p2_quantile_close_to_exact(sample, p):
+    estimator = P2Quantile(p)
+    for x in sample:
+        estimator.add(x)
+    assert estimator.value() == pytest.approx(exact(sample, p), rel=0.03)
+
+
+def test_p2_quantile_exact_for_few_values():
+    estimator = P2Quantile(0.5)
+    for x in (5.0, 1.0, 3.0):
+        estimator.add(x)
+    assert estimator.value() == 3.0
+
+
+def test_welford_mean_and_variance(sample):
+    stats = StreamingStats()
+    for x in sample:
+        stats.add(x)
+    assert stats.count == len(sample)
+    assert stats.mean == pytest.approx(statistics.fmean(sample), rel=1e-12)
+    assert stats.m2 / stats.count == pytest.approx(statistics.pvariance(sample), rel=1e-9)
+    assert stats.stddev == pytest.approx(statistics.stdev(sample), rel=1e-9)
+    assert (stats.min, stats.max) == (min(sample), max(sample))
+
+
+def test_summary_quantiles(sample):
+    stats = StreamingStats()
+    for x in sample:
+        stats.add(x)
+    summary = stats.summary()
+    assert summary['p50'] == pytest.approx(exact(sample, 0.5), rel=0.03)
+    assert summary['p95'] == pytest.approx(exact(sample, 0.95), rel=0.03)
@@ -0,0 +1,102 @@
+"""Throttling backoff, Retry-After handling and the rate limit middleware"""
+import logging
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+
+from scrapy.http import HtmlResponse, Request
+
+from utils.rate_limiter import AdaptiveRateLimiter, RateLimitMiddleware, parse_retry_after
+from utils.scraping_config import RATE_LIMITING
+
+
+def middleware():
+    downloader = SimpleNamespace(slots={}, get_slot_key=lambda request: 'news.example.com')
+    crawler = SimpleNamespace(engine=SimpleNamespace(downloader=downloader))
+    return RateLimitMiddleware(crawler, AdaptiveRateLimiter(dict(RATE_LIMITING)))
+
+
+SPIDER = SimpleNamespace(logger=logging.getLogger('test'))
+
+
+def throttled(request):
+    return HtmlResponse(request.url, status=429, headers={'Retry-After': '1'}, body=b'', request=request)
+
+
+def test_throttled_request_is_retried():
+    request = Request('https://news.example.com/a/1')
+    retry = middleware().process_response(request, throttled(request), SPIDER)
+    assert isinstance(retry, Request)
+    assert retry.meta['throttle_retries'] == 1
+    assert retry.dont_filter
+
+
+def test_throttle_retries_are_bounded():
+    limiter = middleware()
+    request = Request('https://news.example.com/a/1', meta={'throttle_retries': RATE_LIMITING['max_throttle_retries']})
+    assert isinstance(limiter.process_response(request, throttled(request), SPIDER), HtmlResponse)
+
+
+def test_half_open_probe_is_not_retried():
+    limiter = middleware()
+    request = Request('https://news.example.com/', meta={'max_retry_times': 0})
+    response = limiter.process_response(request, throttled(request), SPIDER)
+    assert isinstance(response, HtmlResponse) and response.status == 429
+    # The backoff is still recorded for the domain's other requests
+    assert limiter.limiter.stats()['news.example.com']['throttled'] == 1
+    assert limiter.limiter.stats()['news.example.com']['retried'] == 0
+
+
+def test_parse_retry_after_seconds_and_dates():
+    assert parse_retry_after('120') == 120.0
+    assert parse_retry_after(b' 5 ') == 5.0
+    future = formatdate(time.time() + 30, usegmt=True)
+    assert 25 <= parse_retry_after(future) <= 31
+    assert parse_retry_after(formatdate(time.time() - 300, usegmt=True)) == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+
+
+def test_backoff_grows_and_is_capped():
+    limiter = AdaptiveRateLimiter(dict(RATE_LIMITING, backoff_factor=2.0, max_delay=4.0))
+    now = 0.0
+    delays = []
+    for _ in range(5):
+        limiter.record('a.com', 429, 0.1, 0, now=now)
+        delays.append(limiter.state('a.com').penalty_delay)
+        now = limiter.state('a.com').penalty_until  # next response after the penalty expired
+    assert delays == [1.0, 2.0, 4.0, 4.0, 4.0]
+
+
+def test_responses_during_backoff_do_not_compound_it():
+    limiter = AdaptiveRateLimiter(dict(RATE_LIMITING, backoff_factor=2.0))
+    limiter.record('a.com', 429, 0.1, 0, now=0.0)
+    limiter.record('a.com', 429, 0.1, 0, now=0.5)
+    assert limiter.state('a.com').penalty_delay == 1.0
+    assert limiter.retry_wait('a.com', now=0.5) == 0.5
+
+
+def test_retry_after_sets_the_delay():
+    limiter = AdaptiveRateLimiter(dict(RATE_LIMITING, max_delay=60.0))
+    limiter.record('a.com', 429, 0.1, 0, retry_after=30, now=0.0)
+    assert limiter.state('a.com').penalty_delay == 30
+    assert limiter.delay_for('a.com', current=1.0) == 30
+    limiter.record('b.com', 429, 0.1, 0, retry_after=3600, now=0.0)
+    assert limiter.state('b.com').penalty_delay == 60.0
+
+
+def test_recovery_drops_the_penalty():
+    limiter = AdaptiveRateLimiter(dict(RATE_LIMITING))
+    limiter.record('a.com', 429, 0.1, 0, now=0.0)
+    limiter.record('a.com', 200, 0.1, 100, now=0.5)
+    assert limiter.state('a.com').penalty_delay > 0  # still inside the penalty window
+    limiter.record('a.com', 200, 0.1, 100, now=10.0)
+    assert limiter.state('a.com').penalty_delay == 0
+    assert limiter.delay_for('a.com', current=0.1) == limiter.min_delay
+
+
+def test_hourly_quota():
+    limiter = AdaptiveRateLimiter(dict(RATE_LIMITING, requests_per_hour=2))
+    assert [limiter.admit('a.com', now=t) for t in (0, 1, 2)] == [True, True, False]
+    assert limiter.admit('a.com', now=3601)
+    assert limiter.stats()['a.com']['dropped'] == 1
@@ -1,10 +1,21 @@
+import importlib
 
-from .llm_functions import get_news
-from .source_functions import add_source , get_sources , add_client
+# Heavy stacks (langgraph, langchain, requests) are only imported on first use
+# so that workers serving CRUD routes do not pay for them at startup.
+_LAZY_EXPORTS = {
+    'get_news': '.llm_functions',
+    'add_source': '.source_functions',
+    'get_sources': '.source_functions',
+    'add_client': '.source_functions',
+}
 
 __all__ = ['get_news' , 'add_source' , 'get_sources' , 'add_client']
 
 
-
-
-
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,246 @@
+"""
+Single-parse article extraction.
+
+The page is parsed into one lxml tree (or the tree Scrapy already built is
+reused) and that tree feeds trafilatura's ``bare_extraction`` once for content,
+title and date, plus the CSS/text fallbacks when trafilatura finds nothing.
+Pages of outlets with a site profile try the profile's selectors first.
+"""
+import re
+from datetime import datetime
+from typing import Dict, Optional, Union
+
+import trafilatura
+from htmldate import find_date
+from lxml.html import HtmlElement
+from parsel import Selector
+from trafilatura.utils import load_html
+
+MIN_CONTENT_LENGTH = 100
+# A profile match with more of its text in links than this, or holding a
+# <nav>, is a page wrapper rather than an article body
+MAX_PROFILE_LINK_DENSITY = 0.3
+
+CONTENT_SELECTORS = [
+    'article',
+    '.article-content',
+    '.story-content',
+    '.post-content',
+    '.entry-content',
+    '.content-body',
+    '.article-body',
+    '.story-body',
+    '[data-testid="article-content"]',
+    '.article__content',
+    '.story__content',
+    '.post__content'
+]
+
+TITLE_SELECTORS = [
+    'h1',
+    '.article-title',
+    '.story-title',
+    '.post-title',
+    '.entry-title',
+    '[data-testid="article-title"]',
+    'title'
+]
+
+DATE_SELECTORS = [
+    'time::attr(datetime)',
+    '.publish-date::text',
+    '.article-date::text',
+    '.story-date::text',
+    '.post-date::text',
+    '[data-testid="publish-date"]::text',
+    'meta[property="article:published_time"]::attr(content)',
+    'meta[name="publish_date"]::attr(content)'
+]
+
+# Visible text only: skip script/style/noscript contents
+VISIBLE_TEXT_XPATH = './/text()[not(ancestor::script) and not(ancestor::style) and not(ancestor::noscript)]'
+WHITESPACE_RE = re.compile(r'\s+')
+
+DATE_EXTRACTION_PARAMS = {
+    'extensive_search': True,
+    'original_date': True
+}
+
+
+def parse_date(value) -> Optional[datetime]:
+    """Parse an ISO-like date string into a naive local datetime"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).strip().replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        # Compare like-for-like with datetime.now() in the age checks
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def visible_text(selector: Selector) -> str:
+    """Whitespace-normalised visible text of a selector"""
+    return WHITESPACE_RE.sub(' ', ' '.join(selector.xpath(VISIBLE_TEXT_XPATH).getall())).strip()
+
+
+def extract_with_css(selector: Selector, selectors=CONTENT_SELECTORS) -> Optional[str]:
+    """Text of the first common article container with enough content"""
+    for css in selectors:
+        for match in selector.css(css):
+            text = visible_text(match)
+            if len(text) > MIN_CONTENT_LENGTH:
+                return text
+    return None
+
+
+def link_density(element: Selector, text: str) -> float:
+    """Share of an element's visible text inside links"""
+    link_text = sum(len(visible_text(link)) for link in element.css('a'))
+    return link_text / len(text) if text else 1.0
+
+
+def extract_profile_content(selector: Selector, selectors) -> Optional[str]:
+    """Text of the first profile match that looks like an article body, not a page container"""
+    for css in selectors:
+        for match in selector.css(css):
+            text = visible_text(match)
+            if len(text) <= MIN_CONTENT_LENGTH or match.css('nav'):
+                continue
+            if link_density(match, text) <= MAX_PROFILE_LINK_DENSITY:
+                return text
+    return None
+
+
+def extract_basic_text(selector: Selector) -> Optional[str]:
+    """Visible body text as last resort"""
+    body = selector.css('body')
+    text = visible_text(body[0]) if body else ''
+    return text if len(text) > MIN_CONTENT_LENGTH else None
+
+
+def extract_title(selector: Selector, selectors=TITLE_SELECTORS) -> Optional[str]:
+    for css in selectors:
+        title = selector.css(css + '::text').get()
+        if title and len(title.strip()) > 5:
+            return title.strip()
+    return None
+
+
+def extract_date(selector: Selector, selectors=DATE_SELECTORS) -> Optional[datetime]:
+    for css in selectors:
+        if '::' not in css:
+            css += '::text'
+        publish_date = parse_date(selector.css(css).get())
+        if publish_date:
+            return publish_date
+    return None
+
+
+def extract_profile_date(selector: Selector, tree: HtmlElement, selectors, url: Optional[str] = None) -> Optional[datetime]:
+    """Profile date selectors, then the generic ones, then htmldate's quick search"""
+    for css in selectors:
+        for element in selector.css(css):
+            attributes = element.attrib
+            publish_date = parse_date(attributes.get('datetime') or attributes.get('content') or visible_text(element))
+            if publish_date:
+                return publish_date
+    publish_date = extract_date(selector)
+    if publish_date:
+        return publish_date
+    return parse_date(find_date(tree, extensive_search=False, original_date=True, url=url))
+
+
+def extract_with_profile(tree: HtmlElement, selector: Selector, url: Optional[str], profile) -> Optional[Dict]:
+    """Fast path for outlets with a site profile; None if its selectors miss"""
+    if profile.extract is not None:
+        result = profile.extract(tree, url)
+        if result and result.get('content'):
+            return dict(result, extraction_method='profile')
+        return None
+    if not profile.content_selectors:
+        return None
+    content = extract_profile_content(selector, profile.content_selectors)
+    if not content:
+        return None
+    return {
+        'content': content,
+        'title': extract_title(selector, profile.title_selectors) or extract_title(selector),
+        'publish_date': extract_profile_date(selector, tree, profile.date_selectors, url),
+        'extraction_method': 'profile',
+    }
+
+
+def run_trafilatura(tree: HtmlElement, url: Optional[str] = None) -> Dict:
+    """One bare_extraction pass over the tree: text, title and date"""
+    document = trafilatura.bare_extraction(
+        tree,
+        url=url,
+        include_comments=False,
+        include_tables=True,
+        with_metadata=True,
+        date_extraction_params=DATE_EXTRACTION_PARAMS,
+    )
+    if document is None:
+        return {}
+    if not isinstance(document, dict):
+        document = document.as_dict()
+    return document
+
+
+def extract_article(html: Union[HtmlElement, bytes, str], url: Optional[str] = None, profile=None) -> Optional[Dict]:
+    """Extract content, title and publish date from one page
+
+    ``html`` may be raw bytes/str or an already parsed lxml tree (e.g.
+    ``response.selector.root``), which is then reused rather than re-parsed.
+    ``profile`` is the outlet's ``SiteProfile``, if any.
+    Returns None when no usable content is found.
+    """
+    tree = load_html(html)
+    if tree is None:
+        return None
+    selector = Selector(root=tree, type='html')
+
+    # Method 0: Site profile selectors, skipping the generic cascade
+    if profile is not None:
+        try:
+            result = extract_with_profile(tree, selector, url, profile)
+        except Exception as e:
+            print(f"[DEBUG] Profile extraction failed for {profile.domain}: {e}")
+            result = None
+        if result:
+            return result
+
+    # Method 1: Trafilatura (primary method)
+    try:
+        document = run_trafilatura(tree, url)
+    except Exception as e:
+        print(f"[DEBUG] Trafilatura extraction failed: {e}")
+        document = {}
+    content = document.get('text')
+    method = 'trafilatura'
+
+    # Method 2: Fallback to CSS selectors if trafilatura fails
+    if not content or len(content.strip()) < MIN_CONTENT_LENGTH:
+        content = extract_with_css(selector)
+        method = 'css'
+
+    # Method 3: Basic text extraction as last resort
+    if not content or len(content.strip()) < MIN_CONTENT_LENGTH:
+        content = extract_basic_text(selector)
+        method = 'text'
+
+    if not content or len(content.strip()) <= MIN_CONTENT_LENGTH:
+        return None
+
+    return {
+        'content': content,
+        'title': document.get('title') or extract_title(selector),
+        'publish_date': parse_date(document.get('date')) or extract_date(selector),
+        'extraction_method': method,
+    }
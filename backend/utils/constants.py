@@ -1,5 +1,7 @@
 import os
 
+from .env import env_float, env_int
+
 # Database path - updated for new structure
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "db", "analyzer.db")
 
@@ -20,6 +22,11 @@ PERFORMANCE_CONFIG = {
     'MAX_ARTICLES_PER_SITE': 5,
     'MAX_RELEVANT_ARTICLES': 5,
     
+    # Local relevance ranking before the LLM filter
+    'RELEVANCE_TOP_K': 15,  # Candidates sent to the LLM filter
+    'RELEVANCE_MIN_SCORE': 0.0,  # Normalised 0..1 BM25 score
+    'RELEVANCE_CONTENT_CHARS': 3000,
+    
     # Content Settings
     'MIN_CONTENT_LENGTH': 100,
     'MAX_DAYS_OLD': 2,
@@ -31,19 +38,131 @@ PERFORMANCE_CONFIG = {
     # Monitoring
     'ENABLE_PERFORMANCE_MONITORING': True,
     'LOG_PERFORMANCE': True,
+    'SUMMARY_QUANTILES': (0.5, 0.95, 0.99),  # streaming estimates per step
+    'MAX_LOGGED_ERRORS': 100,  # most recent errors kept in summaries
 }
 
 # Model Configuration
 MODEL_CONFIG = {
     'FILTER_MODEL': 'gpt-4o',
-    'SUMMARIZE_MODEL': 'gpt-4o',
+    'SUMMARIZE_MODEL': 'gpt-4o-mini',
     'TEMPERATURE': 0,
+    'SUMMARIZE_TEMPERATURE': 0.3,
     'MAX_TOKENS': 4000,
 }
 
+# USD per 1M tokens (input, output), used for LLM cost accounting
+MODEL_PRICING = {
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4o-mini': (0.15, 0.60),
+}
+
+# Chat model backend (utils.llm_providers): 'openai', 'synthetic', 'record' or 'replay'
+LLM_PROVIDER_CONFIG = {
+    'BACKEND': os.getenv('LLM_BACKEND', 'openai'),
+    'RECORDINGS_DIR': os.getenv('LLM_RECORDINGS_DIR', os.path.join(os.path.dirname(os.path.dirname(__file__)), "tmp", "llm_recordings")),
+    'RECORD_UPSTREAM': os.getenv('LLM_RECORD_UPSTREAM', 'openai'),  # backend the record mode calls on a miss
+    'SYNTHETIC': {
+        'LATENCY': env_float('LLM_SYNTHETIC_LATENCY', 0.5),  # median seconds per call
+        'LATENCY_SIGMA': env_float('LLM_SYNTHETIC_LATENCY_SIGMA', 0.5),  # lognormal spread
+        'FAILURE_RATE': env_float('LLM_SYNTHETIC_FAILURE_RATE', 0.0),
+        'SEED': env_int('LLM_SYNTHETIC_SEED'),
+    },
+}
+
+# LLM filter batching (see utils.llm_batching)
+LLM_BATCHING_CONFIG = {
+    'MAX_PROMPT_TOKENS': env_int('LLM_BATCH_MAX_TOKENS', 6000),  # article excerpts per call
+    'CHARS_PER_TOKEN': 4,
+    'INITIAL_BATCH_SIZE': PERFORMANCE_CONFIG['BATCH_SIZE'],
+    'MIN_BATCH_SIZE': 1,
+    'MAX_BATCH_SIZE': 20,
+    'TARGET_LATENCY': 10.0,  # seconds; slower calls halve the batch size
+    'JSON_MODE': True,  # OpenAI response_format=json_object for verdicts
+    'VERDICT_RETRIES': 2,  # re-asks about articles left without a valid verdict
+}
+
+# Per-client LLM budgets (utils.llm_usage). As a client's spend over the period
+# approaches its budget, analyses degrade instead of failing:
+#   economy     - filter with the cheaper model
+#   minimal     - cheaper model, fewer candidates and shorter excerpts per LLM call
+#   cached_only - no LLM calls; local relevance ranking and extractive summaries
+LLM_BUDGET_CONFIG = {
+    'ENABLED': os.getenv('LLM_BUDGETS_ENABLED', 'true').lower() != 'false',
+    'PERIOD_DAYS': 30,
+    # USD per period for clients without their own entry; unset means unlimited
+    'DEFAULT_BUDGET_USD': env_float('LLM_BUDGET_USD'),
+    # JSON file of {client_id: USD per period}, null for unlimited
+    'CLIENT_BUDGETS_FILE': os.getenv('LLM_CLIENT_BUDGETS_FILE'),
+    # Fraction of the budget spent -> mode
+    'DEGRADE_AT': {'economy': 0.8, 'minimal': 0.95, 'cached_only': 1.0},
+    'ECONOMY_FILTER_MODEL': 'gpt-4o-mini',
+    'MINIMAL_TOP_K': 5,  # candidates sent to the LLM filter
+    'MINIMAL_CONTENT_CHARS': 400,  # article excerpt per LLM call
+}
+
+# Keyword pre-filter configuration (compiled by utils.prefilter.KeywordPreFilter)
+# Set PREFILTER_KEYWORDS_FILE to a JSON file with the same keys to override these tables.
+PREFILTER_CONFIG = {
+    # Articles mentioning these in the title or content head are dropped
+    # unless the business interest mentions one of the override words
+    'EXCLUDED_CATEGORIES': {
+        'sports': ['football', 'soccer', 'basketball', 'tennis', 'golf', 'sport', 'match', 'game', 'player', 'team'],
+        'entertainment': ['movie', 'film', 'celebrity', 'actor', 'actress', 'music', 'concert', 'show'],
+    },
+    'EXCLUSION_OVERRIDES': ['sport', 'entertainment', 'football', 'movie', 'music'],
+
+    # trigger words in the business interest -> keywords the article must mention
+    'GEOGRAPHIC_KEYWORDS': {
+        'qatar': {'triggers': ['qatar'], 'keywords': ['qatar', 'doha', 'gulf', 'middle east']},
+        'usa': {'triggers': ['usa', 'united states'], 'keywords': ['usa', 'united states', 'america', 'american']},
+        'uk': {'triggers': ['uk', 'britain'], 'keywords': ['uk', 'britain', 'england', 'london']},
+        'china': {'triggers': ['china'], 'keywords': ['china', 'chinese', 'beijing', 'shanghai']},
+    },
+    'TOPIC_KEYWORDS': {
+        'economy': {'triggers': ['economy', 'economic'], 'keywords': ['economy', 'economic', 'finance', 'financial', 'business', 'market']},
+        'politics': {'triggers': ['politics', 'political'], 'keywords': ['politics', 'political', 'government', 'policy']},
+        'technology': {'triggers': ['technology', 'tech'], 'keywords': ['technology', 'tech', 'digital', 'innovation']},
+    },
+
+    # Characters of content scanned after the title
+    'EXCLUSION_WINDOW': 200,
+    'MATCH_WINDOW': 500,
+    # Topic matches are only required when more keywords than this are active
+    'MIN_TOPIC_KEYWORDS': 2,
+
+    'KEYWORDS_FILE': os.getenv('PREFILTER_KEYWORDS_FILE'),
+}
+
+# Shared outbound HTTP client (utils.http_client)
+HTTP_CLIENT_CONFIG = {
+    'LIMIT': env_int('HTTP_CLIENT_LIMIT', 100),  # open connections in total
+    'LIMIT_PER_HOST': env_int('HTTP_CLIENT_LIMIT_PER_HOST', 8),
+    'DNS_CACHE_TTL': 300,  # seconds
+    'KEEPALIVE_TIMEOUT': 30,  # seconds an idle connection stays pooled
+    'TIMEOUT': 10,  # total seconds per request
+    'MAX_DRAIN_BYTES': 256 * 1024,  # unread body a status check reads to keep its connection pooled
+    'USER_AGENT': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+}
+
+# Per-request tracing (utils.tracing)
+TRACING_CONFIG = {
+    'ENABLED': os.getenv('TRACING_ENABLED', 'true').lower() != 'false',
+    'EXPORTER': os.getenv('TRACE_EXPORTER', 'none'),  # 'file', 'otlp' or 'none'
+    'FILE': os.getenv('TRACE_FILE', os.path.join(os.path.dirname(os.path.dirname(__file__)), "tmp", "traces.jsonl")),
+    'FILE_MAX_BYTES': env_int('TRACE_FILE_MAX_BYTES', 50 * 1024 * 1024),  # rotated past this size
+    'FILE_BACKUPS': 3,  # rotated files kept (traces.jsonl.1 ... .3)
+    'FILE_QUEUE_SIZE': 1000,  # traces waiting for the writer thread; more are dropped
+    'OTLP_ENDPOINT': os.getenv('OTEL_EXPORTER_OTLP_TRACES_ENDPOINT', 'http://localhost:4318/v1/traces'),
+    'SERVICE_NAME': os.getenv('OTEL_SERVICE_NAME', 'news-analyzer-api'),
+    'MAX_SPANS': 1000,  # per trace
+    'EXCLUDED_PATHS': ('/metrics', '/api/health'),
+}
+
 # File Paths - updated for new structure
 PATHS = {
     'SOURCES_FILE': os.path.join(os.path.dirname(os.path.dirname(__file__)), "tmp", "sources.json"),
     'OUTPUT_FILE': os.path.join(os.path.dirname(os.path.dirname(__file__)), "tmp", "output.json"),
     'SPIDER_FILE': os.path.join(os.path.dirname(__file__), "trafilatura_spider.py"),
+    'CRAWL_REPORT_FILE': os.path.join(os.path.dirname(os.path.dirname(__file__)), "tmp", "crawl_report.json"),
 }
@@ -0,0 +1,84 @@
+"""
+Crawl frontier: scores candidate URLs and enforces per-domain budgets.
+
+Scores combine link type (article likelihood), inferred publish-date recency,
+link-extractor selector hints and crawl depth. They become Scrapy request
+priorities, so the most valuable URLs are downloaded first, and they decide
+which links survive the per-page limits.
+"""
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from scrapy.exceptions import IgnoreRequest
+
+try:
+    from .scraping_config import CRAWL_FRONTIER
+    from .date_inference import days_old
+except ImportError:
+    # ``scrapy runspider`` loads the spider and its helpers as top-level modules
+    from scraping_config import CRAWL_FRONTIER
+    from date_inference import days_old
+
+
+class CrawlFrontier:
+    """URL scoring plus per-domain request and time budgets"""
+
+    def __init__(self, max_age_days: int = 7, config: Optional[Dict] = None):
+        self.config = config or CRAWL_FRONTIER
+        self.max_age_days = max_age_days
+        self.requests = {}  # domain -> requests admitted
+        self.started = {}  # domain -> monotonic time of the first request
+        self.rejected = {}  # domain -> requests refused by a budget
+
+    def score(self, link_type: str, hints: Iterable[str] = (), publish_date: Optional[datetime] = None,
+              depth: int = 0) -> float:
+        """Higher is more valuable: likely, fresh, well-hinted articles close to the homepage"""
+        config = self.config
+        score = config['type_scores'].get(link_type, 0)
+        if publish_date is not None:
+            age = max(days_old(publish_date), 0)
+            freshness = max(0.0, 1 - age / (self.max_age_days + 1))
+        else:
+            freshness = config['undated_freshness']
+        score += config['recency_weight'] * freshness
+        score += min(config['hint_weight'] * len(hints), config['max_hint_bonus'])
+        score -= config['depth_penalty'] * depth
+        return score
+
+    def priority(self, score: float) -> int:
+        """Scrapy request priority for a score (higher runs first)"""
+        return int(round(score))
+
+    def admit(self, domain: str) -> bool:
+        """Count a request against the domain's budgets; False if it is exhausted"""
+        now = time.monotonic()
+        started = self.started.setdefault(domain, now)
+        if (self.requests.get(domain, 0) >= self.config['max_requests_per_domain'] or
+                now - started > self.config['time_budget_seconds']):
+            self.rejected[domain] = self.rejected.get(domain, 0) + 1
+            return False
+        self.requests[domain] = self.requests.get(domain, 0) + 1
+        return True
+
+    def expired(self, domain: str) -> bool:
+        started = self.started.get(domain)
+        return started is not None and time.monotonic() - started > self.config['time_budget_seconds']
+
+    def stats(self) -> Dict[str, Dict]:
+        return {
+            domain: {'requests': count, 'rejected': self.rejected.get(domain, 0)}
+            for domain, count in self.requests.items()
+        }
+
+
+class FrontierBudgetMiddleware:
+    """Downloader middleware dropping queued requests of domains past their time budget"""
+
+    def process_request(self, request, spider):
+        frontier = getattr(spider, 'frontier', None)
+        domain = request.meta.get('domain')
+        if frontier is not None and domain and frontier.expired(domain):
+            frontier.rejected[domain] = frontier.rejected.get(domain, 0) + 1
+            raise IgnoreRequest(f"Time budget exhausted for {domain}")
+        return None
@@ -0,0 +1,103 @@
+"""
+Publish-date inference for article candidates before they are fetched.
+
+Dates come from feed/sitemap metadata, ``<time>`` tags next to the link on a
+listing page, or date segments in the URL itself, so stale candidates can be
+dropped without downloading and extracting them.
+"""
+import calendar
+import re
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+try:
+    from .article_extractor import parse_date
+    from .link_extractor import absolutize
+except ImportError:
+    # ``scrapy runspider`` loads the spider and its helpers as top-level modules
+    from article_extractor import parse_date
+    from link_extractor import absolutize
+
+# Full dates first; a bare /yyyy/mm/ is only a month and resolves to its last day
+URL_DATE_PATTERNS = [
+    re.compile(r'/(\d{4})/(\d{1,2})/(\d{1,2})(?:/|$|[-_])'),
+    re.compile(r'(?<!\d)(\d{4})-(\d{2})-(\d{2})(?!\d)'),
+    re.compile(r'/(\d{4})(\d{2})(\d{2})(?:/|$|[-_])'),
+]
+URL_MONTH_PATTERN = re.compile(r'/(\d{4})/(\d{1,2})/')
+
+MIN_YEAR = 1995
+# Ancestors of a <time> tag searched for the single article link it belongs to
+LISTING_ANCESTOR_LEVELS = 3
+
+
+def _valid_date(year: int, month: int, day: int) -> Optional[datetime]:
+    if not MIN_YEAR <= year <= datetime.now().year + 1:
+        return None
+    try:
+        return datetime(year, month, day)
+    except ValueError:
+        return None
+
+
+def date_from_url(url: str) -> Optional[datetime]:
+    """Date encoded in the URL path, e.g. /2025/06/14/ or 2025-06-14"""
+    for pattern in URL_DATE_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            date = _valid_date(*(int(part) for part in match.groups()))
+            if date:
+                return date
+    match = URL_MONTH_PATTERN.search(url)
+    if match:
+        year, month = int(match.group(1)), int(match.group(2))
+        if 1 <= month <= 12:
+            # Month-only URLs are stale only if the whole month is
+            return _valid_date(year, month, calendar.monthrange(year, month)[1])
+    return None
+
+
+def listing_dates(root, base_url: str) -> Dict[str, datetime]:
+    """{article URL: date} from <time datetime> tags on a listing page
+
+    A <time> belongs to the link that encloses it, or to the only link in its
+    nearest enclosing teaser block.
+    """
+    dates = {}
+    for time_tag in root.iter('time'):
+        date = parse_date(time_tag.get('datetime'))
+        if not date:
+            continue
+        node = time_tag
+        for _ in range(LISTING_ANCESTOR_LEVELS + 1):
+            if node is None:
+                break
+            if node.tag == 'a':
+                hrefs = {node.get('href')} if node.get('href') else set()
+            else:
+                hrefs = {a.get('href') for a in node.iter('a') if a.get('href')}
+            if len(hrefs) == 1:
+                url = absolutize(base_url, hrefs.pop().strip())
+                dates.setdefault(url, date)
+                break
+            if len(hrefs) > 1:
+                break  # block holds several links, the date is ambiguous
+            node = node.getparent()
+    return dates
+
+
+def infer_date(url: str, metadata_date: Optional[datetime] = None,
+               listing_date: Optional[datetime] = None) -> Tuple[Optional[datetime], Optional[str]]:
+    """Best pre-fetch date for a candidate and where it came from"""
+    if metadata_date:
+        return metadata_date, 'metadata'
+    if listing_date:
+        return listing_date, 'listing'
+    url_date = date_from_url(url)
+    if url_date:
+        return url_date, 'url'
+    return None, None
+
+
+def days_old(date: datetime, now: Optional[datetime] = None) -> int:
+    return ((now or datetime.now()) - date).days
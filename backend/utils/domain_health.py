@@ -0,0 +1,169 @@
+"""
+Persistent per-domain circuit breaker for news sources.
+
+Each domain has a health record (consecutive and total failures, last error,
+state). After ``failure_threshold`` consecutive failures the circuit opens and
+the domain is skipped until its cooldown elapses; the next run then lets one
+probe through (half-open). A success closes the circuit, another failure
+re-opens it with a doubled cooldown. Records live in a small JSON file shared
+by the API process and the spider subprocess.
+"""
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    from .scraping_config import CIRCUIT_BREAKER
+except ImportError:
+    # ``scrapy runspider`` loads the spider and its helpers as top-level modules
+    from scraping_config import CIRCUIT_BREAKER
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+DEFAULT_HEALTH_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tmp", "domain_health.json")
+
+
+def source_domain(source: str) -> str:
+    """Domain of a source URL, accepting bare hostnames like the spider does"""
+    source = source.strip()
+    if not source.startswith(('http://', 'https://')):
+        source = "https://" + source
+    return urlparse(source).netloc.lower()
+
+
+class DomainHealth:
+    """Health records and circuit state for every domain seen so far"""
+
+    def __init__(self, path: Optional[str] = None, config: Optional[Dict] = None):
+        self.config = config or CIRCUIT_BREAKER
+        self.path = path or self.config.get('health_file') or DEFAULT_HEALTH_FILE
+        self.records = {}
+        self.touched = set()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                self.records = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.records = {}
+
+    def save(self):
+        """Merge this process's updates into the file and replace it atomically"""
+        if not self.touched:
+            return
+        try:
+            with open(self.path, 'r') as f:
+                merged = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            merged = {}
+        for domain in self.touched:
+            merged[domain] = self.records[domain]
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.domain_health.')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(merged, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.records = merged
+        self.touched.clear()
+
+    def _record(self, domain: str) -> Dict:
+        record = self.records.get(domain)
+        if record is None:
+            record = self.records[domain] = {
+                'state': CLOSED,
+                'failures': 0,
+                'total_failures': 0,
+                'last_error': None,
+                'last_failure': None,
+                'last_success': None,
+                'opened_at': None,
+                'cooldown': self.config['cooldown_seconds'],
+            }
+        self.touched.add(domain)
+        return record
+
+    def state(self, domain: str, now: Optional[float] = None) -> str:
+        """Current circuit state; an open circuit turns half-open after its cooldown"""
+        record = self.records.get(domain)
+        if not record or record['state'] == CLOSED:
+            return CLOSED
+        now = time.time() if now is None else now
+        if record['state'] == OPEN and now - record['opened_at'] >= record['cooldown']:
+            return HALF_OPEN
+        return record['state']
+
+    def allow(self, domain: str, now: Optional[float] = None) -> bool:
+        """False while the domain's circuit is open (a half-open probe is allowed)"""
+        state = self.state(domain, now)
+        if state == HALF_OPEN:
+            self._record(domain)['state'] = HALF_OPEN
+        return state != OPEN
+
+    def record_success(self, domain: str):
+        record = self._record(domain)
+        record.update({
+            'state': CLOSED,
+            'failures': 0,
+            'last_success': time.time(),
+            'opened_at': None,
+            'cooldown': self.config['cooldown_seconds'],
+        })
+
+    def record_failure(self, domain: str, error: str, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        record = self._record(domain)
+        record['failures'] += 1
+        record['total_failures'] += 1
+        record['last_error'] = str(error)[:500]
+        record['last_failure'] = now
+        if record['state'] == HALF_OPEN:
+            # The probe failed: back off for longer
+            record['cooldown'] = min(record['cooldown'] * 2, self.config['max_cooldown_seconds'])
+            record['state'] = OPEN
+            record['opened_at'] = now
+        elif record['failures'] >= self.config['failure_threshold']:
+            record['state'] = OPEN
+            record['opened_at'] = now
+
+    def retry_at(self, domain: str) -> Optional[datetime]:
+        record = self.records.get(domain)
+        if not record or not record.get('opened_at'):
+            return None
+        return datetime.fromtimestamp(record['opened_at'] + record['cooldown'])
+
+    def skipped_entry(self, source: str, domain: str) -> Dict:
+        """Description of a skipped source for logs and the analysis response"""
+        record = self.records.get(domain, {})
+        retry_at = self.retry_at(domain)
+        return {
+            'source': source,
+            'domain': domain,
+            'state': OPEN,
+            'failures': record.get('failures', 0),
+            'last_error': record.get('last_error'),
+            'retry_after': retry_at.isoformat() if retry_at else None,
+        }
+
+    def partition(self, sources: List[str]) -> Tuple[List[str], List[Dict]]:
+        """Split sources into (allowed, skipped entries) by circuit state"""
+        allowed, skipped = [], []
+        for source in sources:
+            domain = source_domain(source)
+            if self.allow(domain):
+                allowed.append(source)
+            else:
+                skipped.append(self.skipped_entry(source, domain))
+        return allowed, skipped
@@ -0,0 +1,32 @@
+"""
+Numeric settings from environment variables.
+
+A malformed value is logged and replaced by the default instead of raising
+at import time, so one typo in the environment can't stop the API or the
+spider from starting.
+"""
+import os
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar('T', int, float)
+
+
+def _env_number(name: str, default: Optional[T], parse: Callable[[str], T]) -> Optional[T]:
+    value = os.getenv(name, '').strip()
+    if not value:
+        return default
+    try:
+        return parse(value)
+    except ValueError:
+        print(f"[Config] Ignoring {name}={value!r}: not a valid {parse.__name__}, using {default!r}")
+        return default
+
+
+def env_int(name: str, default: Optional[int] = None) -> Optional[int]:
+    """Integer value of an environment variable; ``default`` if unset or malformed"""
+    return _env_number(name, default, int)
+
+
+def env_float(name: str, default: Optional[float] = None) -> Optional[float]:
+    """Float value of an environment variable; ``default`` if unset or malformed"""
+    return _env_number(name, default, float)
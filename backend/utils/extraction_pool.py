@@ -0,0 +1,105 @@
+"""
+Process pool for CPU-bound article extraction in the spider.
+
+Trafilatura extraction would otherwise run on the Twisted reactor thread and
+serialise every article. Pages are shipped to worker processes as the raw
+response bytes (no decode/re-encode), and a ``DeferredSemaphore`` bounds how
+many pages are in flight; responses waiting on it stay in Scrapy's scraper
+slot, so ``SCRAPER_SLOT_MAX_ACTIVE_SIZE`` pauses downloads when the pool is
+saturated.
+"""
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+from twisted.internet import defer
+
+try:
+    from .article_extractor import extract_article
+    from .scraping_config import SPIDER_CONFIG
+    from .site_profiles import get_profile
+except ImportError:
+    # ``scrapy runspider`` loads the spider and its helpers as top-level modules
+    from article_extractor import extract_article
+    from scraping_config import SPIDER_CONFIG
+    from site_profiles import get_profile
+
+
+def extract_page(body: bytes, url: Optional[str] = None) -> Optional[Dict]:
+    """Worker entry point: extract one page from its raw bytes"""
+    # Profiles are looked up in the worker, custom extract callables need not pickle
+    return extract_article(body, url, profile=get_profile(url))
+
+
+def warm_up():
+    """Import trafilatura's lazily loaded parts once per worker"""
+    extract_article(b'<html><body><p>warm up</p></body></html>')
+
+
+def default_workers() -> int:
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+class ExtractionPool:
+    """Runs ``extract_page`` in worker processes and returns Deferreds"""
+
+    def __init__(self, workers: Optional[int] = None, max_in_flight: Optional[int] = None,
+                 start_method: Optional[str] = None):
+        if workers is None:
+            workers = SPIDER_CONFIG.get('extraction_workers')
+        self.workers = default_workers() if workers is None else int(workers)
+        if max_in_flight is None:
+            max_in_flight = SPIDER_CONFIG.get('extraction_max_in_flight')
+        self.max_in_flight = max_in_flight or max(1, self.workers) * 2
+        self.start_method = start_method or SPIDER_CONFIG.get('extraction_start_method', 'spawn')
+        self.semaphore = defer.DeferredSemaphore(self.max_in_flight)
+        self.executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created on first use so a spider that finds no articles never spawns workers
+        if self.executor is None:
+            if not __package__:
+                # Workers unpickle extract_page by module name; as a top-level
+                # module that name only resolves with this directory on sys.path
+                module_dir = os.path.dirname(os.path.abspath(__file__))
+                if module_dir not in sys.path:
+                    sys.path.append(module_dir)
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=warm_up,
+            )
+        return self.executor
+
+    def _submit(self, body: bytes, url: Optional[str]) -> defer.Deferred:
+        # Imported here: importing the reactor at module load would install the
+        # default one before Scrapy installs the configured TWISTED_REACTOR
+        from twisted.internet import reactor
+
+        d = defer.Deferred()
+        future = self._get_executor().submit(extract_page, body, url)
+
+        def done(future):
+            # Called from the executor's management thread
+            error = future.exception()
+            if error is not None:
+                reactor.callFromThread(d.errback, error)
+            else:
+                reactor.callFromThread(d.callback, future.result())
+
+        future.add_done_callback(done)
+        return d
+
+    def extract(self, body: bytes, url: Optional[str] = None) -> defer.Deferred:
+        """Extract a page off the reactor thread; waits while the pool is full"""
+        if self.workers <= 0:
+            # In-process mode (EXTRACTION_WORKERS=0), e.g. for debugging
+            return defer.maybeDeferred(extract_page, body, url)
+        return self.semaphore.run(self._submit, body, url)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,162 @@
+"""
+Shared outbound HTTP client for the API and the utils.
+
+One ``aiohttp.ClientSession`` per event loop, with keep-alive pooling, a
+per-host connection limit and a DNS cache from ``HTTP_CLIENT_CONFIG``. Async
+code awaits the helpers directly; synchronous callers use ``run_sync``, which
+runs them on a long-lived background loop so their connections are pooled
+as well. aiohttp is imported on first use to keep API startup light.
+"""
+import asyncio
+import atexit
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from .constants import HTTP_CLIENT_CONFIG
+
+# Statuses that still prove a site exists (many block HEAD or bots)
+REACHABLE_STATUSES = (401, 403)
+
+_sessions: Dict[asyncio.AbstractEventLoop, "aiohttp.ClientSession"] = {}
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_lock = threading.Lock()
+
+
+def _create_session(config: Dict = None):
+    import aiohttp
+
+    config = config or HTTP_CLIENT_CONFIG
+    connector = aiohttp.TCPConnector(
+        limit=config['LIMIT'],
+        limit_per_host=config['LIMIT_PER_HOST'],
+        ttl_dns_cache=config['DNS_CACHE_TTL'],
+        keepalive_timeout=config['KEEPALIVE_TIMEOUT'],
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=config['TIMEOUT']),
+        headers={'User-Agent': config['USER_AGENT']},
+    )
+
+
+async def get_session():
+    """The shared session of the running event loop"""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        # Sessions are bound to their loop; forget those of loops closed by asyncio.run()
+        for stale in [other for other in _sessions if other.is_closed()]:
+            del _sessions[stale]
+        session = _sessions[loop] = _create_session()
+    return session
+
+
+async def close_session():
+    """Close the running loop's session (e.g. on application shutdown)"""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+async def drain(response, limit: Optional[int] = None):
+    """Discard the rest of a body and release the response
+
+    aiohttp only returns a connection to the pool once its body was read to
+    the end; a body longer than ``limit`` is cut off and its connection closed.
+    """
+    limit = HTTP_CLIENT_CONFIG['MAX_DRAIN_BYTES'] if limit is None else limit
+    read = 0
+    while read <= limit:
+        chunk = await response.content.read(64 * 1024)
+        if not chunk:
+            break
+        read += len(chunk)
+    response.release()
+
+
+async def fetch_status(url: str, method: str = 'GET', proxy: Optional[str] = None,
+                       timeout: Optional[float] = None) -> Optional[int]:
+    """Status code of a request following redirects, or None if it failed"""
+    import aiohttp
+
+    session = await get_session()
+    kwargs = {'allow_redirects': True, 'proxy': proxy}
+    if timeout is not None:
+        kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+    try:
+        async with session.request(method, url, **kwargs) as response:
+            status = response.status
+            await drain(response)
+            return status
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        print(f"[HTTP] {method} {url} failed: {type(e).__name__}: {e}")
+        return None
+
+
+async def post_json(url: str, payload, timeout: Optional[float] = None) -> Optional[int]:
+    """POST a JSON body and return the status code, or None if the request failed"""
+    import aiohttp
+
+    session = await get_session()
+    kwargs = {'json': payload}
+    if timeout is not None:
+        kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+    try:
+        async with session.post(url, **kwargs) as response:
+            if response.status >= 400:
+                print(f"[HTTP] POST {url} returned {response.status}")
+            return response.status
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        print(f"[HTTP] POST {url} failed: {type(e).__name__}: {e}")
+        return None
+
+
+def normalize_url(url: str) -> Optional[str]:
+    """Add a scheme to bare hostnames; None if there is no host"""
+    url = url.strip()
+    if not url.startswith(('http://', 'https://')):
+        url = "https://" + url
+    return url if urlparse(url).netloc else None
+
+
+async def check_url(url: str) -> bool:
+    """True if the URL answers a HEAD (or, failing that, a GET) request"""
+    url = normalize_url(url)
+    if url is None:
+        return False
+    for method in ('HEAD', 'GET'):
+        status = await fetch_status(url, method)
+        if status is not None and (status < 400 or status in REACHABLE_STATUSES):
+            return True
+    return False
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    global _background_loop
+    with _background_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="http-client", daemon=True).start()
+            _background_loop = loop
+    return _background_loop
+
+
+def run_sync(coro, timeout: Optional[float] = None):
+    """Run a coroutine of this module from synchronous code"""
+    loop = _get_background_loop()
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+
+def submit(coro) -> "concurrent.futures.Future":
+    """Schedule a coroutine of this module on the background loop without waiting for it"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_background_loop())
+
+
+@atexit.register
+def _close_background_session():
+    if _background_loop is not None and _background_loop in _sessions:
+        try:
+            run_sync(close_session(), timeout=5)
+        except Exception:
+            pass
@@ -0,0 +1,116 @@
+"""
+Single-pass link extraction over an already parsed lxml tree.
+
+Walks every ``<a href>`` once and records which ``LINK_HINTS`` matched (href
+substrings and ancestor class/attribute hints), instead of re-running one CSS
+query per article selector. Ancestor hints are memoised per element, so shared
+containers are only inspected once per page.
+"""
+from functools import lru_cache
+from typing import Dict, FrozenSet
+from urllib.parse import urljoin, urlparse
+
+try:
+    from .scraping_config import LINK_HINTS
+    from .url_classifier import is_same_site
+except ImportError:
+    # ``scrapy runspider`` loads the spider and its helpers as top-level modules
+    from scraping_config import LINK_HINTS
+    from url_classifier import is_same_site
+
+EMPTY_HINTS: FrozenSet[str] = frozenset()
+
+
+@lru_cache(maxsize=65536)
+def absolutize(base_url: str, href: str) -> str:
+    """Resolve an href against the page URL (cached, pages share navigation links)"""
+    return urljoin(base_url, href)
+
+
+@lru_cache(maxsize=65536)
+def netloc_of(url: str) -> str:
+    """Network location of a URL, or '' if it cannot be parsed"""
+    try:
+        return urlparse(url).netloc
+    except ValueError:
+        return ''
+
+
+class LinkExtractor:
+    """Extracts same-site links and the selector hints that matched them"""
+
+    def __init__(self, hints: Dict = None):
+        hints = hints or LINK_HINTS
+        self.href_contains = [(f'href:{needle}', needle) for needle in hints['href_contains']]
+        self.class_tokens = [(f'class:.{token}', token) for token in hints['ancestor_class_tokens']]
+        self.class_contains = [(f'class*={needle}', needle) for needle in hints['ancestor_class_contains']]
+        self.attribute_contains = [
+            (f'{attribute}*={needle}', attribute, needle)
+            for attribute, needles in hints['ancestor_attribute_contains'].items()
+            for needle in needles
+        ]
+
+    def own_hints(self, element) -> FrozenSet[str]:
+        """Hints contributed by an element's own class and attributes"""
+        hints = set()
+        class_attr = element.get('class')
+        if class_attr:
+            tokens = class_attr.split()
+            for name, token in self.class_tokens:
+                if token in tokens:
+                    hints.add(name)
+            for name, needle in self.class_contains:
+                if needle in class_attr:
+                    hints.add(name)
+        for name, attribute, needle in self.attribute_contains:
+            value = element.get(attribute)
+            if value and needle in value:
+                hints.add(name)
+        return frozenset(hints) if hints else EMPTY_HINTS
+
+    def inherited_hints(self, element, cache: Dict) -> FrozenSet[str]:
+        """Union of own hints of an element and all of its ancestors"""
+        # Walk up to the nearest memoised ancestor, then fill the cache downwards
+        path = []
+        node = element
+        while node is not None and node not in cache:
+            path.append(node)
+            node = node.getparent()
+        hints = cache[node] if node is not None else EMPTY_HINTS
+        for node in reversed(path):
+            own = self.own_hints(node)
+            hints = hints | own if own else hints
+            cache[node] = hints
+        return hints
+
+    def extract(self, root, base_url: str, domain: str) -> Dict[str, FrozenSet[str]]:
+        """Return {absolute same-site URL: hints} for every anchor in the tree"""
+        links = {}
+        cache = {}
+        base_netloc = netloc_of(base_url)
+        origin = base_url[:base_url.find(base_netloc) + len(base_netloc)] if base_netloc else ''
+        base_is_same_site = is_same_site(base_netloc, domain)
+        for anchor in root.iter('a'):
+            href = anchor.get('href')
+            if not href:
+                continue
+            href = href.strip()
+            if origin and href.startswith('/') and not href.startswith('//') and '/.' not in href:
+                # Root-relative links (most of a news homepage) need no urljoin
+                if not base_is_same_site:
+                    continue
+                url = origin + href
+            else:
+                url = absolutize(base_url, href)
+                if not is_same_site(netloc_of(url), domain):
+                    continue
+
+            parent = anchor.getparent()
+            hints = self.inherited_hints(parent, cache) if parent is not None else EMPTY_HINTS
+            matched = [name for name, needle in self.href_contains if needle in href]
+            if matched:
+                hints = hints | frozenset(matched)
+
+            previous = links.get(url)
+            links[url] = previous | hints if previous else hints
+        return links
@@ -0,0 +1,146 @@
+"""
+Token-aware batching for the LLM relevance filter.
+
+``pack_batches`` fills each LLM call with as many candidate articles as fit
+in a prompt token budget, estimated from the text length, so short articles
+no longer cost a round trip per five. ``AdaptiveBatchSizer`` caps the number
+of articles per call per model: the cap grows by one after each call that
+answers within the target latency and halves after an error or a slow call
+(additive increase, multiplicative decrease), so a struggling model gets
+smaller requests and a fast one gets fewer, larger ones.
+
+Each article in a batch carries an id, and the model answers with a JSON
+object of verdicts keyed by those ids. ``validate_verdicts`` checks the answer
+against the ids asked about and reports the ones without a valid verdict, so
+only those articles need to be asked about again.
+"""
+import json
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .constants import LLM_BATCHING_CONFIG
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)"""
+    return len(text) // LLM_BATCHING_CONFIG['CHARS_PER_TOKEN'] + 1
+
+
+def article_excerpt(article_id: str, article: Dict, content_chars: int) -> str:
+    """Prompt text for one article, tagged with its id"""
+    title = article.get('title') or 'No title'
+    content = (article.get('content') or '')[:content_chars]
+    return f'<article id="{article_id}">\nTitle: {title}\nContent: {content}\n</article>\n'
+
+
+def pack_batches(excerpts: Sequence[Tuple[str, str]], max_tokens: int,
+                 max_articles: int) -> List[List[Tuple[str, str]]]:
+    """Split (id, excerpt) pairs, in order, into batches within the token and article limits.
+
+    An excerpt larger than ``max_tokens`` on its own still gets a batch of one.
+    """
+    batches, batch, batch_tokens = [], [], 0
+    for article_id, excerpt in excerpts:
+        tokens = estimate_tokens(excerpt)
+        if batch and (batch_tokens + tokens > max_tokens or len(batch) >= max_articles):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append((article_id, excerpt))
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class AdaptiveBatchSizer:
+    """Articles-per-call limit for one model, adjusted from observed latency and errors"""
+
+    def __init__(self, config: Optional[Dict] = None):
+        config = config or LLM_BATCHING_CONFIG
+        self.min_size = config['MIN_BATCH_SIZE']
+        self.max_size = config['MAX_BATCH_SIZE']
+        self.target_latency = config['TARGET_LATENCY']
+        self.size = config['INITIAL_BATCH_SIZE']
+        self.calls = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, articles: int, latency: float, error: bool = False):
+        with self._lock:
+            self.calls += 1
+            if error or latency > self.target_latency:
+                self.errors += error
+                self.size = max(self.min_size, self.size // 2)
+            elif articles >= self.size:
+                # Only grow when the limit was actually the constraint
+                self.size = min(self.max_size, self.size + 1)
+
+
+_sizers: Dict[str, AdaptiveBatchSizer] = {}
+_sizers_lock = threading.Lock()
+
+
+def get_batch_sizer(model: str) -> AdaptiveBatchSizer:
+    """Process-wide sizer per model, so what one analysis learns carries over to the next"""
+    with _sizers_lock:
+        sizer = _sizers.get(model)
+        if sizer is None:
+            sizer = _sizers[model] = AdaptiveBatchSizer()
+        return sizer
+
+
+def reset_batch_sizers():
+    """Forget the learned batch sizes (e.g. between benchmark runs)"""
+    with _sizers_lock:
+        _sizers.clear()
+
+
+def _json_object(text: str) -> Optional[Dict]:
+    """The JSON object in a response, tolerating code fences or surrounding prose"""
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        match = re.search(r'\{.*\}', text, re.DOTALL)
+        if not match:
+            return None
+        try:
+            data = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return None
+    return data if isinstance(data, dict) else None
+
+
+VERDICT_STRINGS = {'true': True, 'yes': True, 'false': False, 'no': False}
+
+
+class VerdictCheck(NamedTuple):
+    verdicts: Dict[str, bool]  # valid verdicts for the expected ids
+    missing: List[str]  # expected ids without a valid verdict
+    errors: List[str]  # validation failures: invalid_json, unknown_id, invalid_value, missing_ids
+
+
+def validate_verdicts(text: str, expected_ids: Sequence[str]) -> VerdictCheck:
+    """Check a ``{"verdicts": {"<id>": true|false}}`` response against the ids that were asked about"""
+    data = _json_object(text)
+    verdicts = data.get('verdicts', data) if data is not None else None
+    if not isinstance(verdicts, dict):
+        return VerdictCheck({}, list(expected_ids), ['invalid_json'])
+
+    expected = set(expected_ids)
+    valid, errors = {}, []
+    for article_id, verdict in verdicts.items():
+        article_id = str(article_id).strip()
+        if article_id not in expected:
+            errors.append('unknown_id')
+            continue
+        if isinstance(verdict, str):
+            verdict = VERDICT_STRINGS.get(verdict.strip().lower())
+        if not isinstance(verdict, bool):
+            errors.append('invalid_value')
+            continue
+        valid[article_id] = verdict
+    missing = [article_id for article_id in expected_ids if article_id not in valid]
+    if missing:
+        errors.append('missing_ids')
+    return VerdictCheck(valid, missing, sorted(set(errors)))
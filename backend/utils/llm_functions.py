@@ -1,19 +1,28 @@
 import os
 import asyncio
-import aiohttp
 from langgraph.graph import END, StateGraph
-from langchain_openai import ChatOpenAI
-from langchain.agents import initialize_agent, AgentType
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.tools import tool
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from dotenv import load_dotenv
 from typing import TypedDict, List, Dict
 import traceback
+import time
 import json
 import subprocess
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import time
+import uuid
 from functools import lru_cache
+from .constants import MODEL_CONFIG, PATHS, PERFORMANCE_CONFIG, LLM_BATCHING_CONFIG, LLM_BUDGET_CONFIG
+from .prefilter import get_prefilter
+from .relevance import rank_articles
+from .domain_health import DomainHealth
+from .scraping_config import CIRCUIT_BREAKER
+from .metrics import observe_stage, timed_stage, count_articles, record_cache, record_verdict_check
+from .llm_usage import record_call, NORMAL, ECONOMY, MINIMAL, CACHED_ONLY
+from .llm_providers import get_chat_model, supports_json_mode
+from .llm_batching import article_excerpt, get_batch_sizer, pack_batches, validate_verdicts
+from .performance_monitor import PerformanceMonitor, PerformanceContext, use_performance_monitor
+from . import tracing
 
 # Load .env
 load_dotenv()
@@ -27,12 +36,21 @@ class MyState(TypedDict):
     articles: list
     relevant_articles: list
     summary: str
+    skipped_sources: list
+    budget_mode: str
+    force_fresh: bool
 
 # Performance configuration
 MAX_CONCURRENT_REQUESTS = 10
-BATCH_SIZE = 5  # Process articles in batches for LLM calls
 CACHE_TTL = 3600  # 1 hour cache
 
+# Long-lived LLM clients, created once per worker so their HTTP connection
+# pools are reused across nodes and requests
+@lru_cache(maxsize=None)
+def get_llm(model: str, temperature: float = 0) -> BaseChatModel:
+    """Return a shared chat model from the configured backend (LLM_BACKEND)"""
+    return get_chat_model(model, temperature)
+
 # Cache for LLM responses
 @lru_cache(maxsize=1000)
 def cached_llm_response(business_interest: str, content_hash: str) -> str:
@@ -61,8 +79,10 @@ def run_scraper(sources, force_fresh=False):
     
     cache_key = tuple(sorted(sources))
     if hasattr(run_scraper, '_cache') and cache_key in run_scraper._cache:
+        record_cache('scraper', hit=True)
         print(f"[DEBUG] Using cached results for {len(sources)} sources")
         return run_scraper._cache[cache_key]
+    record_cache('scraper', hit=False)
     
     print(f"[DEBUG] run_scraper called with sources: {sources}")
     print(f"[DEBUG] Number of sources: {len(sources)}")
@@ -71,14 +91,20 @@ def run_scraper(sources, force_fresh=False):
 
     spider_path = os.path.join(os.path.dirname(__file__), "trafilatura_spider.py")
 
+    # One report per run, so concurrent analyses don't read each other's (or a stale) report
+    report_base, report_ext = os.path.splitext(PATHS['CRAWL_REPORT_FILE'])
+    report_path = f"{report_base}_{os.getpid()}_{uuid.uuid4().hex[:12]}{report_ext}"
+
     # Pass sources directly as JSON string to the spider
     sources_json = json.dumps(sources)
     print(f"[DEBUG] Sources JSON: {sources_json}")
 
     # Run spider with sources as command line argument
-    result = subprocess.run([
-        "scrapy", "runspider", spider_path, "-a", f"sources={sources_json}"
-    ], capture_output=True, text=True)
+    with observe_stage('scrape', sources=len(sources)):
+        result = subprocess.run([
+            "scrapy", "runspider", spider_path, "-a", f"sources={sources_json}",
+            "-a", f"report_path={report_path}"
+        ], capture_output=True, text=True)
 
     print("SCRAPY STDOUT:")
     print(result.stdout)
@@ -97,6 +123,19 @@ def run_scraper(sources, force_fresh=False):
         print("Invalid JSON in output file")
         articles = []
 
+    try:
+        with open(report_path, "r") as f:
+            report = json.load(f)
+        print(f"[DEBUG] Crawl report: {report['fetches_avoided']} article fetches avoided by early date filtering "
+              f"({report['candidates']} candidates, {report['fetched']} fetched)")
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        pass
+    finally:
+        if os.path.exists(report_path):
+            os.remove(report_path)
+
+    count_articles('scrape', len(articles))
+
     # Cache the results
     if not hasattr(run_scraper, '_cache'):
         run_scraper._cache = {}
@@ -110,66 +149,17 @@ def pre_filter_articles(articles: List[Dict], business_interest: str) -> List[Di
     if not articles:
         return []
     
-    business_interest_lower = business_interest.lower()
-    filtered_articles = []
-    
-    # Extract geographic keywords from business interest
-    geographic_keywords = []
-    if 'qatar' in business_interest_lower:
-        geographic_keywords.extend(['qatar', 'doha', 'gulf', 'middle east'])
-    if 'usa' in business_interest_lower or 'united states' in business_interest_lower:
-        geographic_keywords.extend(['usa', 'united states', 'america', 'american'])
-    if 'uk' in business_interest_lower or 'britain' in business_interest_lower:
-        geographic_keywords.extend(['uk', 'britain', 'england', 'london'])
-    if 'china' in business_interest_lower:
-        geographic_keywords.extend(['china', 'chinese', 'beijing', 'shanghai'])
-    
-    # Extract topic keywords
-    topic_keywords = []
-    if 'economy' in business_interest_lower or 'economic' in business_interest_lower:
-        topic_keywords.extend(['economy', 'economic', 'finance', 'financial', 'business', 'market'])
-    if 'politics' in business_interest_lower or 'political' in business_interest_lower:
-        topic_keywords.extend(['politics', 'political', 'government', 'policy'])
-    if 'technology' in business_interest_lower or 'tech' in business_interest_lower:
-        topic_keywords.extend(['technology', 'tech', 'digital', 'innovation'])
-    
-    for article in articles:
-        title = article.get('title', '').lower()
-        content = article.get('content', '').lower()
-        
-        # Skip obvious sports/entertainment content unless specifically requested
-        sports_keywords = ['football', 'soccer', 'basketball', 'tennis', 'golf', 'sport', 'match', 'game', 'player', 'team']
-        entertainment_keywords = ['movie', 'film', 'celebrity', 'actor', 'actress', 'music', 'concert', 'show']
-        
-        # Check if article is sports/entertainment focused
-        is_sports = any(keyword in title or keyword in content[:200] for keyword in sports_keywords)
-        is_entertainment = any(keyword in title or keyword in content[:200] for keyword in entertainment_keywords)
-        
-        # If business interest doesn't mention sports/entertainment, skip these articles
-        if (is_sports or is_entertainment) and not any(keyword in business_interest_lower for keyword in ['sport', 'entertainment', 'football', 'movie', 'music']):
-            continue
-        
-        # If geographic keywords are specified, article must mention them
-        if geographic_keywords:
-            has_geographic_match = any(keyword in title or keyword in content[:500] for keyword in geographic_keywords)
-            if not has_geographic_match:
-                continue
-        
-        # If topic keywords are specified, article should mention them (but be less strict)
-        if topic_keywords:
-            has_topic_match = any(keyword in title or keyword in content[:500] for keyword in topic_keywords)
-            # Only require topic match if business interest is very specific
-            if len(topic_keywords) > 2 and not has_topic_match:
-                continue
-        
-        filtered_articles.append(article)
+    with observe_stage('prefilter'):
+        filtered_articles = get_prefilter().filter(articles, business_interest)
+    count_articles('prefilter', len(filtered_articles))
     
     print(f"[PreFilter] Filtered {len(articles)} articles down to {len(filtered_articles)} based on geographic/topic matching")
     return filtered_articles
 
 # Batch LLM processing for filtering
-async def batch_filter_articles(articles: List[Dict], business_interest: str, llm: ChatOpenAI) -> List[Dict]:
-    """Process articles in batches for better performance with improved filtering"""
+async def batch_filter_articles(articles: List[Dict], business_interest: str, llm: BaseChatModel,
+                                content_chars: int = 800) -> List[Dict]:
+    """Filter articles with as few LLM calls as fit the prompt budget, keeping their order"""
     if not articles:
         return []
     
@@ -185,57 +175,111 @@ async def batch_filter_articles(articles: List[Dict], business_interest: str, ll
     
     Business Interest: "{business_interest}"
     
-    For each article below, analyze the title and content. Respond with ONLY "Yes" or "No" on a new line.
-    - "Yes" = Article is DIRECTLY relevant to the business interest
-    - "No" = Article is NOT relevant or only tangentially related
+    For each article below, analyze the title and content and decide:
+    - true = Article is DIRECTLY relevant to the business interest
+    - false = Article is NOT relevant or only tangentially related
     
     Articles:
     {articles_text}
     
-    Respond with one Yes/No per article, each on a new line.
+    Respond with ONLY a JSON object with one verdict per article id, e.g.
+    {{"verdicts": {{"{example_id}": true}}}}
     """
     
+    max_relevant = PERFORMANCE_CONFIG['MAX_RELEVANT_ARTICLES']
+    sizer = get_batch_sizer(llm.model_name)
+    excerpts = [(str(i), article_excerpt(str(i), article, content_chars)) for i, article in enumerate(articles)]
     relevant_articles = []
+    position = batch_index = 0
     
-    # Process articles in batches
-    for i in range(0, len(articles), BATCH_SIZE):
-        batch = articles[i:i + BATCH_SIZE]
-        
-        # Create batch text with both title and content for better analysis
-        articles_text = ""
-        for j, article in enumerate(batch):
-            title = article.get('title', 'No title')
-            content = article.get('content', '')[:800] if article.get('content') else ''
-            articles_text += f"Article {j+1}:\nTitle: {title}\nContent: {content}...\n\n"
+    while position < len(excerpts):
+        # Pack the next batch with the sizer's current limit, which adapts between calls
+        batch = pack_batches(excerpts[position:], LLM_BATCHING_CONFIG['MAX_PROMPT_TOKENS'], sizer.size)[0]
+        position += len(batch)
         
-        # Single LLM call for the batch
+        with tracing.span('llm_filter.batch', batch=batch_index, articles=len(batch), batch_limit=sizer.size):
+            start = time.perf_counter()
+            try:
+                verdicts = request_verdicts(llm, filter_prompt, business_interest, batch)
+                sizer.record(len(batch), time.perf_counter() - start)
+                print(f"[Filter] Batch {batch_index}: {len(batch)} articles, verdicts {verdicts}")
+                for article_id, _ in batch:
+                    if verdicts.get(article_id):
+                        relevant_articles.append(articles[int(article_id)])
+                        if len(relevant_articles) >= max_relevant:
+                            return relevant_articles
+            except Exception as e:
+                sizer.record(len(batch), time.perf_counter() - start, error=True)
+                tracing.record_error(e)
+                print(f"Error in batch filtering: {e}")
+        batch_index += 1
+    
+    return relevant_articles
+
+def json_mode(llm):
+    """The LLM with OpenAI JSON mode on, where the client supports it"""
+    if not LLM_BATCHING_CONFIG['JSON_MODE'] or not supports_json_mode(llm):
+        return llm
+    return llm.bind(response_format={"type": "json_object"})
+
+def request_verdicts(llm, filter_prompt: str, business_interest: str, batch: List) -> Dict[str, bool]:
+    """Verdicts for one batch of (id, excerpt); articles the answer leaves out are asked about again"""
+    model = llm.model_name
+    client = json_mode(llm)
+    verdicts, pending = {}, batch
+    for attempt in range(LLM_BATCHING_CONFIG['VERDICT_RETRIES'] + 1):
         messages = [
             SystemMessage(content=filter_prompt.format(
-                business_interest=business_interest, articles_text=articles_text
+                business_interest=business_interest,
+                articles_text="\n".join(excerpt for _, excerpt in pending),
+                example_id=pending[0][0]
             ))
         ]
         try:
-            response = llm.invoke(messages)
-            if isinstance(response, AIMessage):
-                # Parse batch response
-                lines = response.content.strip().split('\n')
-                print(f"[Filter] LLM response: {response.content.strip()}")
-                for j, line in enumerate(lines):
-                    if j < len(batch) and "Yes" in line.strip():
-                        relevant_articles.append(batch[j])
-                        if len(relevant_articles) >= 5:  # Max relevant articles
-                            return relevant_articles
+            response = client.invoke(messages)
         except Exception as e:
-            print(f"Error in batch filtering: {e}")
-    
-    return relevant_articles
+            record_call(model, 'llm_filter', error=e)
+            if attempt == 0:
+                raise
+            # Keep the verdicts the earlier answers gave; only the re-asked articles are lost
+            record_verdict_check(model, ['retry_failed'], missing=len(pending))
+            print(f"[Filter] Retry for articles {[i for i, _ in pending]} failed ({type(e).__name__}: {e}), "
+                  f"treating them as not relevant")
+            break
+        record_call(model, 'llm_filter', response)
+        
+        check = validate_verdicts(response.content if isinstance(response, AIMessage) else "", [i for i, _ in pending])
+        verdicts.update(check.verdicts)
+        if not check.missing:
+            record_verdict_check(model, check.errors)
+            break
+        if attempt == LLM_BATCHING_CONFIG['VERDICT_RETRIES']:
+            record_verdict_check(model, check.errors, missing=len(check.missing))
+            print(f"[Filter] No valid verdict for articles {check.missing} after {attempt} retries, treating them as not relevant")
+            break
+        record_verdict_check(model, check.errors, retry=True)
+        print(f"[Filter] Invalid verdicts ({', '.join(check.errors)}), asking again about articles {check.missing}")
+        pending = [(article_id, excerpt) for article_id, excerpt in pending if article_id in check.missing]
+    return verdicts
 
 # Preprocess node - Keep synchronous for now
 def preprocess(state):
+    if state["articles"]:
+        # Articles supplied by the caller (e.g. a recorded corpus): nothing to scrape
+        print(f"[Preprocess] Using {len(state['articles'])} supplied articles")
+        state["skipped_sources"] = []
+        return state
     try:
         # Check if we need fresh data (you can add logic here to determine when to force fresh)
         force_fresh = state.get("force_fresh", False)
-        articles = run_scraper(state["sources"], force_fresh=force_fresh)
+        sources, skipped = state["sources"], []
+        if CIRCUIT_BREAKER['enabled']:
+            # Known-bad domains are not handed to the spider until their cooldown ends
+            sources, skipped = DomainHealth().partition(state["sources"])
+            for entry in skipped:
+                print(f"[Preprocess] Skipping {entry['source']}: circuit open until {entry['retry_after']} ({entry['last_error']})")
+        state["skipped_sources"] = skipped
+        articles = run_scraper(sources, force_fresh=force_fresh) if sources else []
         print(f"[Preprocess] Fetched {len(articles)} articles")
     except Exception as e:
         print(f"[Preprocess] Error during scraping: {e}")
@@ -267,16 +311,36 @@ async def filter_articles_async(state):
         state["relevant_articles"] = []
         return state
     
-    print(f"[Filter] {len(pre_filtered_articles)} articles passed pre-filtering, sending to LLM")
-    
-    llm = ChatOpenAI(model="gpt-4o", temperature=0)
-    
-    # Step 2: Use LLM for final filtering
-    relevant_articles = await batch_filter_articles(
-        pre_filtered_articles, 
-        state["business_interest"], 
-        llm
-    )
+    # Step 2: Rank locally by relevance and keep only the top candidates
+    with observe_stage('relevance'):
+        ranked_articles = rank_articles(pre_filtered_articles, state["business_interest"])
+    
+    budget_mode = state.get("budget_mode") or NORMAL
+    if budget_mode == CACHED_ONLY:
+        # Over budget: no LLM calls, trust the local ranking
+        relevant_articles = ranked_articles[:PERFORMANCE_CONFIG['MAX_RELEVANT_ARTICLES']]
+        print(f"[Filter] Budget mode {budget_mode}: skipping the LLM filter, keeping the top {len(relevant_articles)} ranked articles")
+    else:
+        filter_model, content_chars = MODEL_CONFIG['FILTER_MODEL'], 800
+        if budget_mode in (ECONOMY, MINIMAL):
+            filter_model = LLM_BUDGET_CONFIG['ECONOMY_FILTER_MODEL']
+        if budget_mode == MINIMAL:
+            ranked_articles = ranked_articles[:LLM_BUDGET_CONFIG['MINIMAL_TOP_K']]
+            content_chars = LLM_BUDGET_CONFIG['MINIMAL_CONTENT_CHARS']
+        
+        print(f"[Filter] {len(pre_filtered_articles)} articles passed pre-filtering, sending top {len(ranked_articles)} to {filter_model} (budget mode {budget_mode})")
+        
+        llm = get_llm(filter_model, MODEL_CONFIG['TEMPERATURE'])
+        
+        # Step 3: Use LLM for final filtering
+        with observe_stage('llm_filter'):
+            relevant_articles = await batch_filter_articles(
+                ranked_articles, 
+                state["business_interest"], 
+                llm,
+                content_chars
+            )
+    count_articles('llm_filter', len(relevant_articles))
     
     print(f"[Filter] Selected {len(relevant_articles)} relevant articles")
     
@@ -288,7 +352,13 @@ async def filter_articles_async(state):
     state["relevant_articles"] = relevant_articles
     return state
 
+def extractive_summary(content: str) -> str:
+    """First few sentences of an article, used when no LLM summary is available"""
+    sentences = content.split('.')[:3]
+    return '. '.join(sentences) + '.' if sentences else content[:200] + "..."
+
 # SummarizeArticles node
+@timed_stage('summarize')
 async def summarize_articles_async(state):
     if not state["relevant_articles"]:
         state["summary"] = "No relevant information found for this topic."
@@ -316,7 +386,9 @@ async def summarize_articles_async(state):
         return state
 
     # Initialize LLM for summarization
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
+    llm = get_llm(MODEL_CONFIG['SUMMARIZE_MODEL'], MODEL_CONFIG['SUMMARIZE_TEMPERATURE'])
+    budget_mode = state.get("budget_mode") or NORMAL
+    content_chars = 1000 if budget_mode == MINIMAL else 2000
     
     # Create a well-formatted summary with proper sections and metadata
     summary_lines = []
@@ -353,7 +425,11 @@ async def summarize_articles_async(state):
         
         # Generate summary for the content
         content = article.get('content', '')
-        if content:
+        if content and budget_mode == CACHED_ONLY:
+            summary_lines.append("**Summary:**")
+            summary_lines.append("")
+            summary_lines.append(extractive_summary(content))
+        elif content:
             try:
                 # Create summary prompt
                 summary_prompt = f"""
@@ -362,7 +438,7 @@ async def summarize_articles_async(state):
                 Write in a clear, professional tone suitable for a business news summary.
                 
                 Title: {title}
-                Content: {content[:2000]}  # Limit content length for efficiency
+                Content: {content[:content_chars]}  # Limit content length for efficiency
                 
                 Summary:
                 """
@@ -372,7 +448,9 @@ async def summarize_articles_async(state):
                     HumanMessage(content=summary_prompt)
                 ]
                 
-                response = llm.invoke(messages)
+                with tracing.span('summarize.article', article=i, url=url):
+                    response = llm.invoke(messages)
+                    record_call(llm.model_name, 'summarize', response)
                 summary = response.content.strip()
                 
                 # Clean up the summary
@@ -384,13 +462,12 @@ async def summarize_articles_async(state):
                 summary_lines.append(summary)
                 
             except Exception as e:
+                record_call(llm.model_name, 'summarize', error=e)
                 print(f"Error generating summary for article {i}: {e}")
                 # Fallback: use first few sentences
-                sentences = content.split('.')[:3]
-                fallback_summary = '. '.join(sentences) + '.' if sentences else content[:200] + "..."
                 summary_lines.append("**Summary:**")
                 summary_lines.append("")
-                summary_lines.append(fallback_summary)
+                summary_lines.append(extractive_summary(content))
         
         # Separator between articles
         summary_lines.append("")
@@ -408,7 +485,8 @@ def show_summary(state):
     return state
 
 # Main Workflow with async support
-async def get_news_async(business_interest="", sources=[]):
+def build_news_graph():
+    """Build and compile the news analysis workflow"""
     workflow = StateGraph(state_schema=MyState)
 
     workflow.add_node("Preprocess", preprocess)  # Keep synchronous
@@ -422,16 +500,30 @@ async def get_news_async(business_interest="", sources=[]):
     workflow.add_edge("SummarizeArticles", "ShowSummary")
     workflow.add_edge("ShowSummary", END)
 
-    graph = workflow.compile()
+    return workflow.compile()
+
+# Compiled once per worker; the graph holds no per-request state
+NEWS_GRAPH = build_news_graph()
+
+async def run_news_pipeline(business_interest="", sources=[], budget_mode=NORMAL, articles=None, force_fresh=False):
+    """Run the news workflow and return its final state.
 
-    final_state = await graph.ainvoke({
+    ``articles`` skips scraping and filters/summarizes the given articles instead;
+    ``force_fresh`` bypasses the scraper cache.
+    """
+    return await NEWS_GRAPH.ainvoke({
         "business_interest": business_interest,
         "sources": sources,
-        "articles": [],
+        "articles": list(articles or []),
         "relevant_articles": [],
-        "summary": ""
+        "summary": "",
+        "skipped_sources": [],
+        "budget_mode": budget_mode,
+        "force_fresh": force_fresh
     })
 
+async def get_news_async(business_interest="", sources=[], articles=None, force_fresh=False):
+    final_state = await run_news_pipeline(business_interest, sources, articles=articles, force_fresh=force_fresh)
     return final_state["summary"]
 
 # Synchronous wrapper for backward compatibility
@@ -439,28 +531,6 @@ def get_news(business_interest="", sources=[]):
     """Synchronous wrapper for the async get_news function"""
     return asyncio.run(get_news_async(business_interest, sources))
 
-# Performance monitoring
-class PerformanceMonitor:
-    def __init__(self):
-        self.start_time = None
-        self.step_times = {}
-    
-    def start(self):
-        self.start_time = time.time()
-    
-    def log_step(self, step_name: str):
-        if self.start_time:
-            elapsed = time.time() - self.start_time
-            self.step_times[step_name] = elapsed
-            print(f"[Performance] {step_name}: {elapsed:.2f}s")
-    
-    def get_summary(self):
-        total_time = time.time() - self.start_time if self.start_time else 0
-        return {
-            "total_time": total_time,
-            "step_times": self.step_times
-        }
-
 # Enhanced version with performance monitoring
 async def get_news_with_monitoring(business_interest="", sources=[]):
     """Enhanced version with performance monitoring"""
@@ -468,9 +538,9 @@ async def get_news_with_monitoring(business_interest="", sources=[]):
     monitor.start()
     
     try:
-        result = await get_news_async(business_interest, sources)
-        monitor.log_step("Total Processing")
-        print(f"[Performance] Summary: {monitor.get_summary()}")
+        with use_performance_monitor(monitor), PerformanceContext("Total Processing", monitor):
+            result = await get_news_async(business_interest, sources)
+        monitor.print_summary()
         return result
     except Exception as e:
         print(f"Error in get_news: {e}")
@@ -0,0 +1,223 @@
+"""
+Pluggable chat model backends for the news pipeline.
+
+``get_chat_model`` builds the client ``llm_functions.get_llm`` hands to the
+pipeline, for the backend named by ``LLM_BACKEND``:
+
+- ``openai``: ``ChatOpenAI`` (the default)
+- ``synthetic``: answers locally after a lognormal delay, failing at a
+  configurable rate; filter prompts get JSON verdicts from keyword overlap,
+  other prompts the first sentences of the content. No network, no spend.
+- ``record``: calls the upstream backend (``LLM_RECORD_UPSTREAM``, default
+  openai) and stores every request/response pair under ``LLM_RECORDINGS_DIR``;
+  requests already recorded are answered from disk.
+- ``replay``: answers only from recordings and raises ``ReplayMissError``
+  for anything not recorded, so benchmark runs are reproducible.
+
+All backends are LangChain chat models, so ``bind``/``invoke`` and the
+token usage read by ``utils.llm_usage`` behave the same. Further backends
+can be added with ``register_provider``. Only backends registered with
+``json_mode=True`` (openai, and record/replay of it) are sent OpenAI's
+``response_format``; ``supports_json_mode`` tells which a model came from.
+"""
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.pydantic_v1 import PrivateAttr
+
+from .constants import LLM_PROVIDER_CONFIG
+from .llm_batching import estimate_tokens
+
+
+class SyntheticLLMError(RuntimeError):
+    """Injected failure of the synthetic backend"""
+
+
+class ReplayMissError(KeyError):
+    """A request with no recording in replay mode"""
+
+
+def usage(messages: List[BaseMessage], output: str) -> Dict[str, int]:
+    input_tokens = sum(estimate_tokens(str(message.content)) for message in messages)
+    output_tokens = estimate_tokens(output)
+    return {'input_tokens': input_tokens, 'output_tokens': output_tokens,
+            'total_tokens': input_tokens + output_tokens}
+
+
+class SyntheticChatModel(BaseChatModel):
+    """Offline stand-in for a chat model with configurable latency and failures"""
+
+    model_name: str = 'synthetic'
+    temperature: float = 0
+    latency: float = 0.5  # median seconds per call
+    latency_sigma: float = 0.5  # lognormal shape; 0 for a fixed delay
+    failure_rate: float = 0.0
+    seed: Optional[int] = None
+    _rng: random.Random = PrivateAttr()
+    _lock: Any = PrivateAttr()
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    @property
+    def _llm_type(self) -> str:
+        return 'synthetic'
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        with self._lock:
+            delay = self.latency * self._rng.lognormvariate(0, self.latency_sigma) if self.latency_sigma else self.latency
+            failed = self._rng.random() < self.failure_rate
+        time.sleep(delay)
+        if failed:
+            raise SyntheticLLMError(f"Synthetic failure after {delay:.2f}s")
+        text = "\n".join(str(message.content) for message in messages)
+        content = self.verdicts(text) if '<article id="' in text else self.summary(text)
+        message = AIMessage(content=content, usage_metadata=usage(messages, content))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    @staticmethod
+    def verdicts(prompt: str) -> str:
+        """Filter answer: relevant when an article shares a word of 4+ letters with the business interest"""
+        interest = re.search(r'Business Interest: "([^"]*)"', prompt)
+        words = {w for w in re.findall(r'[a-z]{4,}', interest.group(1).lower())} if interest else set()
+        verdicts = {}
+        for article_id, body in re.findall(r'<article id="([^"]+)">(.*?)</article>', prompt, re.DOTALL):
+            verdicts[article_id] = bool(words & set(re.findall(r'[a-z]{4,}', body.lower())))
+        return json.dumps({'verdicts': verdicts})
+
+    @staticmethod
+    def summary(prompt: str) -> str:
+        match = re.search(r'Content: (.*)', prompt)
+        sentences = re.split(r'(?<=[.!?])\s+', match.group(1).strip()) if match else []
+        return " ".join(sentences[:2]) or "No content to summarize."
+
+
+class RecordReplayChatModel(BaseChatModel):
+    """Answers from request->response recordings on disk, recording misses when an upstream is set"""
+
+    model_name: str
+    temperature: float = 0
+    directory: str
+    upstream: Optional[BaseChatModel] = None  # None: replay only
+
+    @property
+    def _llm_type(self) -> str:
+        return 'record' if self.upstream is not None else 'replay'
+
+    def request_key(self, messages: List[BaseMessage], kwargs: Dict) -> str:
+        request = {
+            'model': self.model_name,
+            'temperature': self.temperature,
+            'messages': [[message.type, message.content] for message in messages],
+            'options': {key: value for key, value in sorted(kwargs.items()) if key != 'stop'},
+        }
+        return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        key = self.request_key(messages, kwargs)
+        path = self.path(key)
+        try:
+            with open(path, 'r') as f:
+                recorded = json.load(f)
+        except FileNotFoundError:
+            if self.upstream is None:
+                raise ReplayMissError(f"No recording for {self.model_name} request {key[:12]} in {self.directory}")
+            recorded = self.record(messages, kwargs, path)
+        message = AIMessage(content=recorded['content'], usage_metadata=recorded.get('usage_metadata'))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def record(self, messages: List[BaseMessage], kwargs: Dict, path: str) -> Dict:
+        response = self.upstream.bind(**kwargs).invoke(messages) if kwargs else self.upstream.invoke(messages)
+        recorded = {
+            'model': self.model_name,
+            'messages': [[message.type, message.content] for message in messages],
+            'options': kwargs,
+            'content': response.content,
+            'usage_metadata': getattr(response, 'usage_metadata', None) or usage(messages, response.content),
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(recorded, f, default=str)
+        os.replace(tmp_path, path)
+        return recorded
+
+
+def openai_model(model: str, temperature: float, config: Dict) -> BaseChatModel:
+    # Imported lazily so offline backends work without the OpenAI client configured
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(model=model, temperature=temperature)
+
+
+def synthetic_model(model: str, temperature: float, config: Dict) -> BaseChatModel:
+    synthetic = config['SYNTHETIC']
+    return SyntheticChatModel(
+        model_name=model, temperature=temperature, latency=synthetic['LATENCY'],
+        latency_sigma=synthetic['LATENCY_SIGMA'], failure_rate=synthetic['FAILURE_RATE'], seed=synthetic['SEED'],
+    )
+
+
+def record_model(model: str, temperature: float, config: Dict) -> BaseChatModel:
+    upstream = get_chat_model(model, temperature, config['RECORD_UPSTREAM'], config)
+    return RecordReplayChatModel(model_name=model, temperature=temperature,
+                                 directory=config['RECORDINGS_DIR'], upstream=upstream)
+
+
+def replay_model(model: str, temperature: float, config: Dict) -> BaseChatModel:
+    return RecordReplayChatModel(model_name=model, temperature=temperature, directory=config['RECORDINGS_DIR'])
+
+
+PROVIDERS: Dict[str, Callable[[str, float, Dict], BaseChatModel]] = {
+    'openai': openai_model,
+    'synthetic': synthetic_model,
+    'record': record_model,
+    'replay': replay_model,
+}
+
+# Backends accepting response_format={"type": "json_object"}
+JSON_MODE_PROVIDERS = {'openai'}
+
+
+def register_provider(name: str, factory: Callable[[str, float, Dict], BaseChatModel], json_mode: bool = False):
+    """Add a backend: ``factory(model, temperature, config)`` returns a LangChain chat model"""
+    PROVIDERS[name] = factory
+    if json_mode:
+        JSON_MODE_PROVIDERS.add(name)
+    else:
+        JSON_MODE_PROVIDERS.discard(name)
+
+
+def supports_json_mode(llm) -> bool:
+    """Whether ``llm`` was built by ``get_chat_model`` for a backend with OpenAI JSON mode"""
+    return isinstance(llm, BaseChatModel) and bool((llm.metadata or {}).get('json_mode'))
+
+
+def get_chat_model(model: str, temperature: float = 0, backend: Optional[str] = None,
+                   config: Optional[Dict] = None) -> BaseChatModel:
+    """Chat model for ``model`` from the configured (or given) backend"""
+    config = config or LLM_PROVIDER_CONFIG
+    backend = backend or config['BACKEND']
+    if backend not in PROVIDERS:
+        raise ValueError(f"Unknown LLM backend '{backend}', expected one of {sorted(PROVIDERS)}")
+    if backend == 'record' and config['RECORD_UPSTREAM'] in ('record', 'replay'):
+        raise ValueError("LLM_RECORD_UPSTREAM must be a backend that calls a model")
+    llm = PROVIDERS[backend](model, temperature, config)
+    # Recordings are keyed by the request options, so replay sends what the recorded upstream got
+    answering = config['RECORD_UPSTREAM'] if backend in ('record', 'replay') else backend
+    llm.metadata = {**(llm.metadata or {}), 'json_mode': answering in JSON_MODE_PROVIDERS}
+    return llm
@@ -0,0 +1,120 @@
+"""
+LLM token/cost accounting and per-client budget modes.
+
+Every LLM call goes through ``record_call``, which updates the Prometheus
+counters and, inside ``track_usage()``, appends the call to that analysis's
+``UsageLedger``; the API stores the ledger as ``LLMUsage`` rows. Before an
+analysis runs, ``budget_mode`` turns the client's spend over the budget
+period into a degradation mode that the pipeline applies (see
+``LLM_BUDGET_CONFIG``).
+"""
+import json
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional
+
+from .constants import LLM_BUDGET_CONFIG
+from .metrics import llm_cost, record_llm_call, token_usage
+
+NORMAL = 'normal'
+ECONOMY = 'economy'
+MINIMAL = 'minimal'
+CACHED_ONLY = 'cached_only'
+MODES = (NORMAL, ECONOMY, MINIMAL, CACHED_ONLY)
+
+
+class LLMCall(NamedTuple):
+    stage: str
+    model: str
+    input_tokens: int
+    output_tokens: int
+    cost_usd: float
+
+
+class UsageLedger:
+    """LLM calls made on behalf of one analysis"""
+
+    def __init__(self, budget_mode: str = NORMAL):
+        self.budget_mode = budget_mode
+        self.calls: List[LLMCall] = []
+        self._lock = threading.Lock()
+
+    def add(self, call: LLMCall):
+        with self._lock:
+            self.calls.append(call)
+
+    def totals(self, key: Optional[str] = None) -> Dict:
+        """Token and cost totals, overall or grouped by 'stage' or 'model'"""
+        def empty():
+            return {'calls': 0, 'input_tokens': 0, 'output_tokens': 0, 'cost_usd': 0.0}
+
+        groups = {}
+        for call in list(self.calls):
+            group = groups.setdefault(getattr(call, key) if key else 'total', empty())
+            group['calls'] += 1
+            group['input_tokens'] += call.input_tokens
+            group['output_tokens'] += call.output_tokens
+            group['cost_usd'] += call.cost_usd
+        return groups if key else groups.get('total', empty())
+
+
+_current_ledger: ContextVar[Optional[UsageLedger]] = ContextVar('llm_usage_ledger', default=None)
+
+
+@contextmanager
+def track_usage(budget_mode: str = NORMAL):
+    """Collect the LLM calls made in this context (e.g. one analysis)"""
+    ledger = UsageLedger(budget_mode)
+    token = _current_ledger.set(ledger)
+    try:
+        yield ledger
+    finally:
+        _current_ledger.reset(token)
+
+
+def record_call(model: str, stage: str, response=None, error: Optional[Exception] = None):
+    """Account for one LLM call in the metrics and the current ledger"""
+    record_llm_call(model, stage, response, error)
+    ledger = _current_ledger.get()
+    if ledger is None or response is None:
+        return
+    input_tokens, output_tokens = token_usage(response)
+    ledger.add(LLMCall(stage, model, input_tokens, output_tokens, llm_cost(model, input_tokens, output_tokens)))
+
+
+@lru_cache(maxsize=1)
+def _client_budgets(path: Optional[str]) -> Dict[str, Optional[float]]:
+    if not path:
+        return {}
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"[Budget] Could not load client budgets from {path}: {e}")
+        return {}
+
+
+def client_budget(client_id: str, config: Dict = None) -> Optional[float]:
+    """USD budget per period for a client, None if unlimited"""
+    config = config or LLM_BUDGET_CONFIG
+    budgets = _client_budgets(config['CLIENT_BUDGETS_FILE'])
+    if client_id in budgets:
+        return budgets[client_id]
+    return config['DEFAULT_BUDGET_USD']
+
+
+def budget_mode(spent: float, budget: Optional[float], config: Dict = None) -> str:
+    """Degradation mode for a client that has spent ``spent`` USD of ``budget``"""
+    config = config or LLM_BUDGET_CONFIG
+    if not config['ENABLED'] or budget is None:
+        return NORMAL
+    if budget <= 0:
+        return CACHED_ONLY
+    used = spent / budget
+    mode = NORMAL
+    for candidate in MODES[1:]:
+        if used >= config['DEGRADE_AT'][candidate]:
+            mode = candidate
+    return mode
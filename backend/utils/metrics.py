@@ -0,0 +1,292 @@
+"""
+Prometheus metrics for the API and the news pipeline, served at ``/metrics``.
+
+Per-stage latency histograms (scrape, prefilter, relevance, llm_filter,
+summarize, db_persist) use log-spaced buckets so that every stage, from
+sub-millisecond pre-filtering to minute-long crawls, is resolved with the
+same relative error. Alongside them: HTTP request counts and latencies per
+route, DB time and query counts per route, cache hits and misses, LLM
+token and cost counters, and filter verdict validation failures and retries.
+
+With several uvicorn workers, set ``PROMETHEUS_MULTIPROC_DIR`` to an empty
+directory before the server starts; each worker then writes its samples
+there and ``/metrics`` aggregates them across processes.
+"""
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, List, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+
+from .constants import MODEL_PRICING
+from . import tracing
+
+MULTIPROC_DIR = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+
+
+def log_buckets(start: float, stop: float, per_decade: int = 8) -> Tuple[float, ...]:
+    """Bucket bounds from start to stop, evenly spaced on a log scale (~33% apart at 8/decade)"""
+    factor = 10 ** (1.0 / per_decade)
+    bounds = []
+    bound = start
+    while bound < stop * (1 + 1e-9):
+        bounds.append(float(f"{bound:.3g}"))
+        bound *= factor
+    return tuple(bounds)
+
+
+# 1ms .. 10min
+STAGE_BUCKETS = log_buckets(0.001, 600)
+# 1ms .. 5min
+REQUEST_BUCKETS = log_buckets(0.001, 300, per_decade=4)
+
+STAGE_DURATION = Histogram(
+    'news_pipeline_stage_duration_seconds',
+    'Time spent in each news pipeline stage',
+    ['stage'],
+    buckets=STAGE_BUCKETS,
+)
+STAGE_ERRORS = Counter(
+    'news_pipeline_stage_errors_total',
+    'Pipeline stage runs that raised',
+    ['stage'],
+)
+PIPELINE_ARTICLES = Counter(
+    'news_pipeline_articles_total',
+    'Articles leaving each pipeline stage',
+    ['stage'],
+)
+HTTP_REQUESTS = Counter(
+    'http_requests_total',
+    'HTTP requests handled, by route template and status',
+    ['method', 'route', 'status'],
+)
+HTTP_DURATION = Histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency by route template',
+    ['method', 'route'],
+    buckets=REQUEST_BUCKETS,
+)
+DB_QUERIES = Counter(
+    'db_queries_total',
+    'SQL statements executed, by route template',
+    ['route'],
+)
+DB_DURATION = Histogram(
+    'db_request_duration_seconds',
+    'Total time spent in SQL statements per HTTP request',
+    ['route'],
+    buckets=REQUEST_BUCKETS,
+)
+DB_SLOW_QUERIES = Counter(
+    'db_slow_queries_total',
+    'Statements slower than SLOW_QUERY_MS, by route template',
+    ['route'],
+)
+DB_N_PLUS_ONE = Counter(
+    'db_n_plus_one_total',
+    'Requests that repeated an identical statement N_PLUS_ONE_THRESHOLD+ times',
+    ['route'],
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests_total',
+    'Cache lookups by cache and result (hit/miss)',
+    ['cache', 'result'],
+)
+LLM_REQUESTS = Counter(
+    'llm_requests_total',
+    'LLM calls by model, pipeline stage and outcome',
+    ['model', 'stage', 'outcome'],
+)
+LLM_TOKENS = Counter(
+    'llm_tokens_total',
+    'LLM tokens used, by model and kind (input/output)',
+    ['model', 'kind'],
+)
+LLM_COST = Counter(
+    'llm_cost_usd_total',
+    'Estimated LLM spend in USD from MODEL_PRICING',
+    ['model'],
+)
+LLM_VERDICT_ERRORS = Counter(
+    'llm_verdict_errors_total',
+    'Filter responses failing validation, by reason (invalid_json, unknown_id, invalid_value, missing_ids, retry_failed)',
+    ['model', 'reason'],
+)
+LLM_VERDICT_RETRIES = Counter(
+    'llm_verdict_retries_total',
+    'Filter calls re-asking only about articles left without a verdict',
+    ['model'],
+)
+LLM_VERDICTS_MISSING = Counter(
+    'llm_verdicts_missing_total',
+    'Articles still without a verdict after the retries (treated as not relevant)',
+    ['model'],
+)
+
+
+# Callbacks (stage, wall seconds, CPU seconds) run after every stage, e.g. by benchmarks
+_stage_observers: List[Callable[[str, float, float], None]] = []
+
+
+def add_stage_observer(observer: Callable[[str, float, float], None]):
+    """Also report each stage's CPU time to ``observer``.
+
+    CPU time is process-wide, including finished child processes such as the
+    scraper, so it is only attributable to one stage when stages do not overlap.
+    """
+    _stage_observers.append(observer)
+
+
+def remove_stage_observer(observer: Callable[[str, float, float], None]):
+    _stage_observers.remove(observer)
+
+
+def process_cpu_seconds() -> float:
+    """User + system CPU of this process and its waited-for children"""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+@contextmanager
+def observe_stage(stage: str, **attributes):
+    """Time a block as one run of a pipeline stage (sync or async code), traced as a span"""
+    start = time.perf_counter()
+    cpu_start = process_cpu_seconds() if _stage_observers else None
+    try:
+        with tracing.span(stage, **attributes):
+            yield
+    except BaseException:
+        STAGE_ERRORS.labels(stage).inc()
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        STAGE_DURATION.labels(stage).observe(duration)
+        if cpu_start is not None:
+            cpu = process_cpu_seconds() - cpu_start
+            for observer in list(_stage_observers):
+                observer(stage, duration, cpu)
+
+
+def timed_stage(stage: str):
+    """Decorator form of observe_stage for sync and async functions"""
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with observe_stage(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with observe_stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count_articles(stage: str, count: int):
+    PIPELINE_ARTICLES.labels(stage).inc(count)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def llm_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """USD cost of a call; 0 for models without a MODEL_PRICING entry"""
+    input_price, output_price = MODEL_PRICING.get(model, (0.0, 0.0))
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def token_usage(response) -> Tuple[int, int]:
+    """(input, output) tokens reported on a LangChain chat response"""
+    usage = getattr(response, 'usage_metadata', None)
+    if usage:
+        return usage.get('input_tokens', 0), usage.get('output_tokens', 0)
+    usage = (getattr(response, 'response_metadata', None) or {}).get('token_usage') or {}
+    return usage.get('prompt_tokens', 0), usage.get('completion_tokens', 0)
+
+
+def record_llm_call(model: str, stage: str, response=None, error: Optional[Exception] = None):
+    """Count an LLM call and the tokens and cost it reported"""
+    LLM_REQUESTS.labels(model, stage, 'error' if error is not None else 'ok').inc()
+    if response is None:
+        return
+    input_tokens, output_tokens = token_usage(response)
+    tracing.set_attributes(**{
+        'llm.model': model, 'llm.input_tokens': input_tokens, 'llm.output_tokens': output_tokens,
+    })
+    LLM_TOKENS.labels(model, 'input').inc(input_tokens)
+    LLM_TOKENS.labels(model, 'output').inc(output_tokens)
+    LLM_COST.labels(model).inc(llm_cost(model, input_tokens, output_tokens))
+
+
+def record_verdict_check(model: str, errors, retry: bool = False, missing: int = 0):
+    """Count validation failures of one filter response, a retry, and verdicts given up on"""
+    for reason in errors:
+        LLM_VERDICT_ERRORS.labels(model, reason).inc()
+    if retry:
+        LLM_VERDICT_RETRIES.labels(model).inc()
+    if missing:
+        LLM_VERDICTS_MISSING.labels(model).inc(missing)
+
+
+def record_request(method: str, route: str, status: int, duration: float):
+    HTTP_REQUESTS.labels(method, route, str(status)).inc()
+    HTTP_DURATION.labels(method, route).observe(duration)
+
+
+def record_db_usage(route: str, stats, repeated: bool):
+    """Per-request DB time and query counts from a database.QueryStats"""
+    DB_QUERIES.labels(route).inc(stats.queries)
+    DB_DURATION.labels(route).observe(stats.duration)
+    if stats.slow:
+        DB_SLOW_QUERIES.labels(route).inc(stats.slow)
+    if repeated:
+        DB_N_PLUS_ONE.labels(route).inc()
+
+
+def route_template(request) -> str:
+    """The matched route's path template (e.g. /api/news/sessions/{session_id})
+
+    Raw paths would give every session id its own time series.
+    """
+    from starlette.routing import Match
+
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+    return 'unmatched'
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """Exposition text for /metrics, aggregated over all workers in multiprocess mode"""
+    if MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: Optional[int] = None):
+    """Drop an exiting worker's live samples from the multiprocess directory"""
+    if MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid or os.getpid())
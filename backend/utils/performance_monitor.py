@@ -1,6 +1,11 @@
 import time
 import asyncio
+import bisect
+import math
 import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Dict, List, Optional, Callable
 from functools import wraps
 import json
@@ -8,16 +13,127 @@ import os
 from datetime import datetime
 from .constants import PERFORMANCE_CONFIG
 
+# Reports (performance summaries, profiles) are written here
+REPORT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tmp")
+
+class P2Quantile:
+    """Streaming estimate of one quantile in constant memory (Jain & Chlamtac's P² algorithm)
+
+    Keeps five markers whose heights track the minimum, p/2, p, (1+p)/2 and
+    maximum quantiles, adjusting them with piecewise-parabolic interpolation.
+    """
+
+    __slots__ = ('p', 'heights', 'positions', 'desired', 'increments')
+
+    def __init__(self, p: float):
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x: float):
+        heights, positions = self.heights, self.positions
+        if len(heights) < 5:
+            bisect.insort(heights, x)
+            return
+
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = bisect.bisect_right(heights, x) - 1
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in (1, 2, 3):
+            offset = self.desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or \
+                    (offset <= -1 and positions[i - 1] - positions[i] < -1):
+                d = 1 if offset > 0 else -1
+                height = self._parabolic(i, d)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + d * (heights[i + d] - heights[i]) / (positions[i + d] - positions[i])
+                heights[i] = height
+                positions[i] += d
+
+    def _parabolic(self, i: int, d: int) -> float:
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> Optional[float]:
+        if not self.heights:
+            return None
+        if len(self.heights) < 5:
+            # Exact (nearest-rank) while there are fewer samples than markers
+            return self.heights[min(len(self.heights) - 1, int(self.p * len(self.heights)))]
+        return self.heights[2]
+
+
+class StreamingStats:
+    """Count, sum, min, max, Welford mean/variance and P² quantiles of a stream in O(1) memory"""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'mean', 'm2', 'quantiles')
+
+    def __init__(self, quantiles=(0.5, 0.95, 0.99)):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.quantiles = {q: P2Quantile(q) for q in quantiles}
+
+    def add(self, x: float):
+        self.count += 1
+        self.total += x
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        for estimator in self.quantiles.values():
+            estimator.add(x)
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def summary(self) -> Dict:
+        stats = {
+            'total': self.total,
+            'average': self.mean,
+            'min': self.min,
+            'max': self.max,
+            'count': self.count,
+            'stddev': self.stddev,
+        }
+        for q, estimator in self.quantiles.items():
+            stats[f"p{q * 100:g}"] = estimator.value()
+        return stats
+
+
 class PerformanceMonitor:
     """Performance monitoring utility for tracking execution times and bottlenecks"""
     
     def __init__(self, enabled: bool = None):
         self.enabled = enabled if enabled is not None else PERFORMANCE_CONFIG['ENABLE_PERFORMANCE_MONITORING']
         self.start_time = None
-        self.step_times = {}
-        self.step_counts = {}
+        self.step_stats: Dict[str, StreamingStats] = {}
         self.memory_usage = {}
-        self.errors = []
+        self.errors = deque(maxlen=PERFORMANCE_CONFIG['MAX_LOGGED_ERRORS'])
+        self.error_count = 0
+        self._lock = threading.Lock()
         self.thread_local = threading.local()
         
     def start(self):
@@ -25,12 +141,17 @@ class PerformanceMonitor:
         if not self.enabled:
             return
             
-        self.start_time = time.time()
-        self.step_times = {}
-        self.step_counts = {}
-        self.errors = []
+        with self._lock:
+            self.start_time = time.time()
+            self.step_stats = {}
+            self.errors.clear()
+            self.error_count = 0
         print(f"[Performance] Monitoring started at {datetime.now()}")
     
+    @property
+    def step_counts(self) -> Dict[str, int]:
+        return {step_name: stats.count for step_name, stats in self.step_stats.items()}
+    
     def log_step(self, step_name: str, duration: float = None):
         """Log a step's execution time"""
         if not self.enabled:
@@ -39,26 +160,28 @@ class PerformanceMonitor:
         if duration is None:
             duration = time.time() - self.start_time if self.start_time else 0
             
-        if step_name not in self.step_times:
-            self.step_times[step_name] = []
-            self.step_counts[step_name] = 0
-            
-        self.step_times[step_name].append(duration)
-        self.step_counts[step_name] += 1
+        with self._lock:
+            stats = self.step_stats.get(step_name)
+            if stats is None:
+                stats = self.step_stats[step_name] = StreamingStats(PERFORMANCE_CONFIG['SUMMARY_QUANTILES'])
+            stats.add(duration)
+            count = stats.count
         
         if PERFORMANCE_CONFIG['LOG_PERFORMANCE']:
-            print(f"[Performance] {step_name}: {duration:.2f}s (count: {self.step_counts[step_name]})")
+            print(f"[Performance] {step_name}: {duration:.2f}s (count: {count})")
     
     def log_error(self, step_name: str, error: Exception):
-        """Log an error during execution"""
+        """Log an error during execution (only the most recent ones are kept)"""
         if not self.enabled:
             return
             
-        self.errors.append({
-            'step': step_name,
-            'error': str(error),
-            'timestamp': datetime.now().isoformat()
-        })
+        with self._lock:
+            self.error_count += 1
+            self.errors.append({
+                'step': step_name,
+                'error': str(error),
+                'timestamp': datetime.now().isoformat()
+            })
         print(f"[Performance] Error in {step_name}: {error}")
     
     def get_summary(self) -> Dict:
@@ -68,26 +191,15 @@ class PerformanceMonitor:
             
         total_time = time.time() - self.start_time
         
-        summary = {
-            'total_time': total_time,
-            'step_times': {},
-            'step_counts': self.step_counts,
-            'errors': self.errors,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        # Calculate averages for each step
-        for step_name, times in self.step_times.items():
-            if times:
-                summary['step_times'][step_name] = {
-                    'total': sum(times),
-                    'average': sum(times) / len(times),
-                    'min': min(times),
-                    'max': max(times),
-                    'count': len(times)
-                }
-        
-        return summary
+        with self._lock:
+            return {
+                'total_time': total_time,
+                'step_times': {step_name: stats.summary() for step_name, stats in self.step_stats.items()},
+                'step_counts': self.step_counts,
+                'errors': list(self.errors),
+                'error_count': self.error_count,
+                'timestamp': datetime.now().isoformat()
+            }
     
     def print_summary(self):
         """Print performance summary"""
@@ -113,39 +225,67 @@ class PerformanceMonitor:
                 print(f"    Min: {stats['min']:.2f}s")
                 print(f"    Max: {stats['max']:.2f}s")
                 print(f"    Count: {stats['count']}")
+                print(f"    Stddev: {stats['stddev']:.2f}s")
+                quantiles = [(key, value) for key, value in stats.items() if key.startswith('p') and value is not None]
+                if quantiles:
+                    print("    " + ", ".join(f"{key}: {value:.2f}s" for key, value in quantiles))
         
         if summary['errors']:
-            print(f"\nErrors ({len(summary['errors'])}):")
+            print(f"\nErrors ({summary['error_count']}, last {len(summary['errors'])} shown):")
             for error in summary['errors']:
                 print(f"  {error['step']}: {error['error']}")
         
         print("="*50 + "\n")
     
-    def save_report(self, filename: str = None):
-        """Save performance report to file"""
-        if not self.enabled:
-            return
+    def save_report(self, filename: str = None, extra: Dict = None) -> Optional[str]:
+        """Save performance report to file, with optional extra sections (e.g. a profile)
+
+        Returns the report path, or None if nothing was written.
+        """
+        if not self.enabled and not extra:
+            return None
             
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"performance_report_{timestamp}.json"
         
-        report_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tmp", filename)
+        report_path = os.path.join(REPORT_DIR, filename)
+        report = self.get_summary() if self.enabled else {}
+        report.update(extra or {})
         
         try:
             os.makedirs(os.path.dirname(report_path), exist_ok=True)
             with open(report_path, 'w') as f:
-                json.dump(self.get_summary(), f, indent=2, default=str)
+                json.dump(report, f, indent=2, default=str)
             print(f"[Performance] Report saved to {report_path}")
+            return report_path
         except Exception as e:
             print(f"[Performance] Failed to save report: {e}")
+            return None
+
+# Monitor of the current request; asyncio tasks and LangGraph's executor threads
+# each see their own copy of the context, so concurrent requests don't mix timings
+_current_monitor: ContextVar[Optional['PerformanceMonitor']] = ContextVar('performance_monitor', default=None)
+
+def current_performance_monitor() -> Optional[PerformanceMonitor]:
+    """The monitor set for the current context, if any"""
+    return _current_monitor.get()
+
+@contextmanager
+def use_performance_monitor(monitor: PerformanceMonitor):
+    """Make a monitor current for the duration of a block (e.g. one request)"""
+    token = _current_monitor.set(monitor)
+    try:
+        yield monitor
+    finally:
+        _current_monitor.reset(token)
 
 def monitor_performance(step_name: str = None):
     """Decorator for monitoring function performance"""
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            monitor = getattr(threading.current_thread(), 'performance_monitor', None)
+            monitor = _current_monitor.get()
             if not monitor or not monitor.enabled:
                 return func(*args, **kwargs)
             
@@ -165,7 +305,7 @@ def monitor_performance(step_name: str = None):
         
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            monitor = getattr(threading.current_thread(), 'performance_monitor', None)
+            monitor = _current_monitor.get()
             if not monitor or not monitor.enabled:
                 return await func(*args, **kwargs)
             
@@ -221,7 +361,8 @@ def get_performance_monitor() -> PerformanceMonitor:
     return _global_monitor
 
 def set_performance_monitor(monitor: PerformanceMonitor):
-    """Set the global performance monitor instance"""
+    """Set the global performance monitor instance and make it current in this context"""
     global _global_monitor
     _global_monitor = monitor
-    threading.current_thread().performance_monitor = monitor 
\ No newline at end of file
+    _current_monitor.set(monitor)
+ 
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""
+Keyword pre-filter compiled into combined regex automata.
+
+Each keyword table from ``PREFILTER_CONFIG`` is compiled once into a single
+alternation pattern, so an article's title and content head are lower-cased
+once and searched by one C-level scan per active keyword set instead of one
+substring search per keyword.
+"""
+import json
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from .constants import PREFILTER_CONFIG
+
+
+def load_prefilter_config(path: Optional[str] = None) -> Dict:
+    """Load pre-filter keyword tables, applying the optional JSON override file"""
+    config = dict(PREFILTER_CONFIG)
+    path = path or config.get('KEYWORDS_FILE')
+    if path:
+        try:
+            with open(path, 'r') as f:
+                config.update(json.load(f))
+            print(f"[PreFilter] Loaded keyword tables from {path}")
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[PreFilter] Could not load keyword file {path}: {e}")
+    return config
+
+
+def compile_keywords(keywords: Iterable[str]) -> Optional[re.Pattern]:
+    """Compile keywords into one alternation pattern (longest first)"""
+    ordered = sorted({keyword.lower() for keyword in keywords}, key=len, reverse=True)
+    if not ordered:
+        return None
+    return re.compile('|'.join(re.escape(keyword) for keyword in ordered))
+
+
+class FilterPlan:
+    """Compiled keyword sets activated by one business interest"""
+
+    def __init__(self, geographic: Optional[re.Pattern], topics: Optional[re.Pattern], allow_excluded: bool):
+        self.geographic = geographic
+        self.topics = topics
+        self.allow_excluded = allow_excluded
+
+
+class KeywordPreFilter:
+    """Pre-filter for article batches backed by compiled keyword patterns"""
+
+    def __init__(self, config: Optional[Dict] = None):
+        config = config if config is not None else load_prefilter_config()
+        self.exclusion_window = config['EXCLUSION_WINDOW']
+        self.match_window = config['MATCH_WINDOW']
+        self.min_topic_keywords = config['MIN_TOPIC_KEYWORDS']
+        self.exclusion_overrides = [word.lower() for word in config['EXCLUSION_OVERRIDES']]
+        self.geographic_groups = self._normalize_groups(config['GEOGRAPHIC_KEYWORDS'])
+        self.topic_groups = self._normalize_groups(config['TOPIC_KEYWORDS'])
+
+        excluded = []
+        for keywords in config['EXCLUDED_CATEGORIES'].values():
+            excluded.extend(keywords)
+        self._excluded = compile_keywords(excluded)
+        self._compile = lru_cache(maxsize=256)(self._compile_set)
+
+    @staticmethod
+    def _normalize_groups(groups: Dict) -> Dict:
+        return {
+            name: {
+                'triggers': [trigger.lower() for trigger in group['triggers']],
+                'keywords': [keyword.lower() for keyword in group['keywords']],
+            }
+            for name, group in groups.items()
+        }
+
+    @staticmethod
+    def _compile_set(keywords: FrozenSet[str]) -> Optional[re.Pattern]:
+        return compile_keywords(keywords)
+
+    def plan(self, business_interest: str) -> FilterPlan:
+        """Work out which keyword groups a business interest activates"""
+        interest = business_interest.lower()
+
+        geographic = set()
+        for group in self.geographic_groups.values():
+            if any(trigger in interest for trigger in group['triggers']):
+                geographic.update(group['keywords'])
+
+        topics = set()
+        topic_count = 0
+        for group in self.topic_groups.values():
+            if any(trigger in interest for trigger in group['triggers']):
+                topics.update(group['keywords'])
+                topic_count += len(group['keywords'])
+
+        # Only require a topic match if the business interest is very specific
+        if topic_count <= self.min_topic_keywords:
+            topics = set()
+
+        allow_excluded = any(word in interest for word in self.exclusion_overrides)
+        return FilterPlan(
+            self._compile(frozenset(geographic)),
+            self._compile(frozenset(topics)),
+            allow_excluded,
+        )
+
+    def matches(self, article: Dict, plan: FilterPlan) -> bool:
+        """Return True if an article passes the pre-filter for a plan"""
+        title = (article.get('title') or '').lower()
+        head = (article.get('content') or '')[:self.match_window].lower()
+
+        # Skip obvious sports/entertainment content unless specifically requested
+        if not plan.allow_excluded and self._excluded is not None:
+            if self._excluded.search(title) or self._excluded.search(head, 0, self.exclusion_window):
+                return False
+
+        # If geographic keywords are specified, article must mention them
+        if plan.geographic is not None:
+            if not (plan.geographic.search(title) or plan.geographic.search(head)):
+                return False
+
+        if plan.topics is not None:
+            if not (plan.topics.search(title) or plan.topics.search(head)):
+                return False
+
+        return True
+
+    def filter(self, articles: List[Dict], business_interest: str) -> List[Dict]:
+        """Filter a batch of articles for one business interest"""
+        plan = self.plan(business_interest)
+        return [article for article in articles if self.matches(article, plan)]
+
+
+@lru_cache(maxsize=1)
+def get_prefilter() -> KeywordPreFilter:
+    """Return the shared pre-filter, compiled on first use"""
+    return KeywordPreFilter()
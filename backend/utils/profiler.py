@@ -0,0 +1,227 @@
+"""
+Low-overhead sampling profiler for live API workers.
+
+A background thread wakes every ``interval`` seconds, reads every thread's
+Python stack with ``sys._current_frames()`` and counts each stack in
+collapsed ("folded") form, ready for flamegraph.pl, speedscope or inferno.
+Threads parked in a wait (lock, queue, selector) are left out, so the
+profile shows where work happens rather than where threads sleep.
+
+Suspended asyncio tasks have no thread stack. For the event loop being
+profiled, each sample also walks the ``cr_await`` chain of every pending
+task and records it under ``asyncio;task:<coroutine>`` ending in
+``[await <Future>]``, so awaited LLM and HTTP calls show up as waits.
+
+Profiles are saved through ``PerformanceMonitor.save_report`` as
+``tmp/profile_<id>.json`` (summary plus the monitor's step timings) next to
+``tmp/profile_<id>.folded``.
+"""
+import asyncio
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .performance_monitor import REPORT_DIR, get_performance_monitor
+
+DEFAULT_INTERVAL = 0.01  # 100 Hz
+MAX_SECONDS = 120
+
+# (file name, function) pairs of leaf frames that mean the thread is idle
+IDLE_FRAMES = {
+    ('threading.py', 'wait'),
+    ('threading.py', '_wait_for_tstate_lock'),
+    ('selectors.py', 'select'),
+    ('queue.py', 'get'),
+    ('thread.py', '_worker'),  # concurrent.futures idle worker
+    ('_thread.py', 'run'),  # anyio worker thread waiting for work
+    ('runners.py', 'run'),  # event loop with nothing to run (uvloop's select is in C)
+}
+
+# Root coroutines of tasks that wait for the whole life of the worker
+IDLE_TASKS = {'LifespanOn.main', 'Server.serve'}
+
+PROFILE_ID = re.compile(r'^[0-9]{8}_[0-9]{6}_[0-9a-f]{6}$')
+
+# Only one profile runs per worker at a time
+_active_lock = threading.Lock()
+
+
+class ProfilerBusy(RuntimeError):
+    pass
+
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def thread_stack(frame) -> List[str]:
+    """Labels of a thread's frames, outermost first"""
+    stack = []
+    while frame is not None:
+        stack.append(frame_label(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def is_idle(frame) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES
+
+
+def task_stack(task) -> Optional[List[str]]:
+    """Frames of a suspended task's coroutine chain plus what it awaits"""
+    coro = task.get_coro()
+    root = getattr(coro, '__qualname__', type(coro).__name__)
+    stack = [f"task:{root}"]
+    while coro is not None:
+        frame = getattr(coro, 'cr_frame', None) or getattr(coro, 'gi_frame', None)
+        if frame is None:
+            break
+        stack.append(frame_label(frame))
+        awaited = getattr(coro, 'cr_await', None)
+        if awaited is None:
+            awaited = getattr(coro, 'gi_yieldfrom', None)
+        coro = awaited
+        if awaited is not None and not hasattr(awaited, 'cr_frame') and not hasattr(awaited, 'gi_frame'):
+            stack.append(f"[await {type(awaited).__name__}]")
+            break
+    return stack if len(stack) > 1 else None
+
+
+class SamplingProfiler:
+    """Counts collapsed stacks of all threads (and pending asyncio tasks) at a fixed interval"""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, loop: Optional[asyncio.AbstractEventLoop] = None,
+                 include_idle: bool = False, exclude_task: Optional[asyncio.Task] = None):
+        self.interval = interval
+        self.loop = loop
+        self.include_idle = include_idle
+        self.exclude_task = exclude_task
+        self.stacks = Counter()
+        self.samples = 0
+        self.started_at = None
+        self.duration = 0.0
+        self.sampling_time = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if not _active_lock.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already running in this worker")
+        try:
+            self.started_at = datetime.now()
+            self._start = time.perf_counter()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+        except BaseException:
+            self._thread = None
+            _active_lock.release()
+            raise
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self.duration = time.perf_counter() - self._start
+            _active_lock.release()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            start = time.perf_counter()
+            self.sample(own_id, names)
+            self.sampling_time += time.perf_counter() - start
+
+    def sample(self, own_id: Optional[int] = None, names: Optional[Dict[int, str]] = None):
+        names = {} if names is None else names
+        self.samples += 1
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id or (not self.include_idle and is_idle(frame)):
+                continue
+            name = names.get(thread_id)
+            if name is None:
+                thread = threading._active.get(thread_id)
+                name = names[thread_id] = f"thread:{thread.name if thread else thread_id}"
+            self.stacks[";".join([name] + thread_stack(frame))] += 1
+
+        if self.loop is not None and not self.loop.is_closed():
+            running = getattr(asyncio.tasks, '_current_tasks', {}).get(self.loop)
+            try:
+                tasks = asyncio.all_tasks(self.loop)
+            except RuntimeError:
+                return
+            for task in tasks:
+                if task is running or task is self.exclude_task or task.done():
+                    continue  # the running task is already on the loop thread's stack
+                stack = task_stack(task)
+                if stack and (self.include_idle or stack[0][5:] not in IDLE_TASKS):
+                    self.stacks[";".join(["asyncio"] + stack)] += 1
+
+    def collapsed(self) -> str:
+        """Folded stacks, one "frame;frame;... count" line each"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self, top: int = 25) -> Dict:
+        leaf_counts = Counter()
+        for stack, count in self.stacks.items():
+            leaf_counts[stack.rsplit(";", 1)[-1]] += count
+        awaiting = sum(count for stack, count in self.stacks.items() if stack.startswith("asyncio;"))
+        return {
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'duration': round(self.duration, 3),
+            'interval': self.interval,
+            'samples': self.samples,
+            'stack_samples': sum(self.stacks.values()),
+            'task_wait_samples': awaiting,
+            'distinct_stacks': len(self.stacks),
+            'overhead_pct': round(self.sampling_time / self.duration * 100, 2) if self.duration else None,
+            'top_frames': [{'frame': frame, 'samples': count} for frame, count in leaf_counts.most_common(top)],
+        }
+
+
+def new_profile_id() -> str:
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.urandom(3).hex()}"
+
+
+def save_profile(profiler: SamplingProfiler, profile_id: str, tag: Optional[str] = None) -> Dict:
+    """Write the folded stacks and the JSON report; returns the profile summary"""
+    folded_path = os.path.join(REPORT_DIR, f"profile_{profile_id}.folded")
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    with open(folded_path, 'w') as f:
+        f.write(profiler.collapsed())
+    summary = dict(profiler.summary(), id=profile_id, tag=tag, pid=os.getpid(), folded_file=folded_path)
+    summary['report_file'] = get_performance_monitor().save_report(
+        f"profile_{profile_id}.json", extra={'profile': summary}
+    )
+    return summary
+
+
+def profile_path(profile_id: str, extension: str) -> Optional[str]:
+    """Path of a saved profile file, or None for malformed ids or missing files"""
+    if not PROFILE_ID.match(profile_id):
+        return None
+    path = os.path.join(REPORT_DIR, f"profile_{profile_id}.{extension}")
+    return path if os.path.exists(path) else None
+
+
+async def profile_for(seconds: float, interval: float = DEFAULT_INTERVAL) -> Dict:
+    """Profile this worker for ``seconds`` while it keeps serving requests"""
+    profiler = SamplingProfiler(interval, loop=asyncio.get_running_loop(), exclude_task=asyncio.current_task())
+    with profiler:
+        await asyncio.sleep(min(seconds, MAX_SECONDS))
+    return save_profile(profiler, new_profile_id())
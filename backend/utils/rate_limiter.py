@@ -0,0 +1,232 @@
+"""
+Adaptive per-domain rate limiting for the spider, driven by ``RATE_LIMITING``.
+
+AutoThrottle adapts each domain's download delay to its latency (speeding up
+on fast, healthy hosts). On top of that, ``RateLimitMiddleware`` reacts to
+throttling responses (429/403): it honours ``Retry-After``, backs the
+domain's delay off exponentially until the penalty expires, retries the
+request a bounded number of times and records per-domain throughput stats.
+"""
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from scrapy import signals
+from scrapy.exceptions import IgnoreRequest
+
+try:
+    from .scraping_config import RATE_LIMITING, SPIDER_CONFIG
+except ImportError:
+    # ``scrapy runspider`` loads the spider and its helpers as top-level modules
+    from scraping_config import RATE_LIMITING, SPIDER_CONFIG
+
+
+def spider_settings(config: Dict = None, spider_config: Dict = None) -> Dict:
+    """Scrapy settings for concurrency, delays, retries and AutoThrottle"""
+    config = config or RATE_LIMITING
+    spider_config = spider_config or SPIDER_CONFIG
+    min_delay = 60.0 / config['requests_per_minute']
+    retry_codes = [code for code in spider_config['retry_http_codes'] if code not in config['throttle_http_codes']]
+    return {
+        'CONCURRENT_REQUESTS': spider_config['concurrent_requests'],
+        'CONCURRENT_REQUESTS_PER_DOMAIN': spider_config['concurrent_requests_per_domain'],
+        'DOWNLOAD_DELAY': min_delay,
+        'RANDOMIZE_DOWNLOAD_DELAY': spider_config['randomize_download_delay'],
+        'DOWNLOAD_TIMEOUT': spider_config['download_timeout'],
+        'RETRY_TIMES': spider_config['retry_times'],
+        # 429/403 are handled by RateLimitMiddleware with backoff instead of immediate retries
+        'RETRY_HTTP_CODES': retry_codes,
+        'COOKIES_ENABLED': spider_config['cookies_enabled'],
+        'AUTOTHROTTLE_ENABLED': config['enabled'],
+        'AUTOTHROTTLE_START_DELAY': config['delay_between_requests'],
+        'AUTOTHROTTLE_MAX_DELAY': config['max_delay'],
+        'AUTOTHROTTLE_TARGET_CONCURRENCY': config['target_concurrency'],
+    }
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    if isinstance(value, bytes):
+        value = value.decode('latin-1')
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class DomainState:
+    """Throttling state and throughput counters for one domain"""
+
+    __slots__ = ('started', 'requests', 'responses', 'throttled', 'retried', 'dropped', 'bytes',
+                 'latency_total', 'penalty_delay', 'penalty_until', 'recent')
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.responses = 0
+        self.throttled = 0
+        self.retried = 0
+        self.dropped = 0
+        self.bytes = 0
+        self.latency_total = 0.0
+        self.penalty_delay = 0.0
+        self.penalty_until = 0.0
+        self.recent = deque()  # request times within the last hour
+
+
+class AdaptiveRateLimiter:
+    """Per-domain backoff decisions and stats, independent of Scrapy"""
+
+    def __init__(self, config: Dict = None):
+        self.config = config or RATE_LIMITING
+        self.enabled = self.config['enabled']
+        self.min_delay = 60.0 / self.config['requests_per_minute']
+        self.max_delay = self.config['max_delay']
+        self.domains = {}
+
+    def state(self, domain: str) -> DomainState:
+        state = self.domains.get(domain)
+        if state is None:
+            state = self.domains[domain] = DomainState()
+        return state
+
+    def admit(self, domain: str, now: float = None) -> bool:
+        """Count a request; False once the domain's hourly quota is used up"""
+        now = time.monotonic() if now is None else now
+        state = self.state(domain)
+        while state.recent and now - state.recent[0] > 3600:
+            state.recent.popleft()
+        if len(state.recent) >= self.config['requests_per_hour']:
+            state.dropped += 1
+            return False
+        state.recent.append(now)
+        state.requests += 1
+        return True
+
+    def is_throttled(self, status: int) -> bool:
+        return status in self.config['throttle_http_codes']
+
+    def record(self, domain: str, status: int, latency: float, size: int,
+               retry_after: Optional[float] = None, now: float = None) -> None:
+        """Update stats and back off on throttling responses"""
+        now = time.monotonic() if now is None else now
+        state = self.state(domain)
+        state.responses += 1
+        state.bytes += size
+        state.latency_total += latency
+        if self.is_throttled(status):
+            state.throttled += 1
+            if retry_after is not None:
+                delay = min(self.max_delay, max(retry_after, self.min_delay))
+            elif now < state.penalty_until:
+                return  # sent before the current backoff started, don't compound it
+            else:
+                delay = min(self.max_delay, max(state.penalty_delay, self.min_delay) * self.config['backoff_factor'])
+            if now < state.penalty_until:
+                delay = max(delay, state.penalty_delay)
+            state.penalty_delay = delay
+            state.penalty_until = max(state.penalty_until, now + delay)
+        elif state.penalty_delay and now >= state.penalty_until:
+            # Healthy again: drop the floor and let AutoThrottle speed back up
+            state.penalty_delay = 0.0
+
+    def delay_for(self, domain: str, current: float) -> float:
+        """Download delay for the domain's slot given its current value"""
+        state = self.domains.get(domain)
+        if state is None or not state.penalty_delay:
+            return max(current, self.min_delay)
+        return max(current, state.penalty_delay)
+
+    def retry_wait(self, domain: str, now: float = None) -> float:
+        now = time.monotonic() if now is None else now
+        state = self.domains.get(domain)
+        return max(0.0, state.penalty_until - now) if state else 0.0
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-domain throughput: requests, responses/min, throttling and latency"""
+        now = time.monotonic()
+        result = {}
+        for domain, state in self.domains.items():
+            elapsed = max(now - state.started, 1e-6)
+            result[domain] = {
+                'requests': state.requests,
+                'responses': state.responses,
+                'responses_per_minute': round(state.responses * 60 / elapsed, 2),
+                'kb_per_second': round(state.bytes / 1024 / elapsed, 2),
+                'avg_latency_ms': round(state.latency_total * 1000 / state.responses, 1) if state.responses else None,
+                'throttled': state.throttled,
+                'retried': state.retried,
+                'dropped': state.dropped,
+                'penalty_delay': round(state.penalty_delay, 2),
+            }
+        return result
+
+
+class RateLimitMiddleware:
+    """Downloader middleware applying AdaptiveRateLimiter to Scrapy's download slots"""
+
+    def __init__(self, crawler, limiter: AdaptiveRateLimiter = None):
+        self.crawler = crawler
+        self.limiter = limiter or AdaptiveRateLimiter()
+        self.max_retries = self.limiter.config['max_throttle_retries']
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        middleware = cls(crawler)
+        crawler.signals.connect(middleware.spider_opened, signal=signals.spider_opened)
+        return middleware
+
+    def spider_opened(self, spider):
+        # Lets the spider put the per-domain stats in its crawl report
+        spider.rate_limiter = self.limiter
+
+    def _slot(self, request, spider):
+        downloader = self.crawler.engine.downloader
+        if hasattr(downloader, 'get_slot_key'):
+            key = downloader.get_slot_key(request)
+        else:
+            key = downloader._get_slot_key(request, spider)
+        return downloader.slots.get(key)
+
+    def process_request(self, request, spider):
+        if not self.limiter.enabled:
+            return None
+        domain = urlparse(request.url).netloc
+        if not self.limiter.admit(domain):
+            raise IgnoreRequest(f"Hourly request quota reached for {domain}")
+        return None
+
+    def process_response(self, request, response, spider):
+        if not self.limiter.enabled:
+            return response
+        domain = urlparse(request.url).netloc
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        self.limiter.record(
+            domain, response.status, request.meta.get('download_latency', 0.0),
+            len(response.body), retry_after,
+        )
+        slot = self._slot(request, spider)
+        if slot is not None:
+            slot.delay = self.limiter.delay_for(domain, slot.delay)
+
+        if self.limiter.is_throttled(response.status):
+            retries = request.meta.get('throttle_retries', 0)
+            wait = self.limiter.retry_wait(domain)
+            # Requests that opt out of retries (half-open circuit probes) get none here either
+            max_retries = 0 if request.meta.get('max_retry_times') == 0 else self.max_retries
+            if retries < max_retries and wait <= self.limiter.max_delay:
+                self.limiter.state(domain).retried += 1
+                spider.logger.info(f"{response.status} from {domain}, retrying in >= {wait:.1f}s: {request.url}")
+                retry = request.replace(dont_filter=True)
+                retry.meta['throttle_retries'] = retries + 1
+                # Let the slot delay, not a tight retry loop, space the retry out
+                retry.priority = request.priority - 1
+                return retry
+        return response
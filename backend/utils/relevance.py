@@ -0,0 +1,110 @@
+"""
+Local BM25 relevance ranking of articles against a business interest.
+
+Runs on CPU with no model downloads: articles are scored against the business
+interest with Okapi BM25 (IDF computed over the candidate batch) so only the
+most promising candidates are sent to the LLM filter.
+"""
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+from .constants import PERFORMANCE_CONFIG
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = {
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+    'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did',
+    'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these',
+    'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them',
+    'news', 'about', 'from', 'as', 'its', 'their', 'our', 'my', 'any', 'all', 'latest',
+}
+
+# BM25 parameters
+K1 = 1.5
+B = 0.75
+
+
+def stem(token: str) -> str:
+    """Very light suffix stripping so 'markets' matches 'market'"""
+    if len(token) > 4:
+        if token.endswith('ies'):
+            return token[:-3] + 'y'
+        for suffix in ('ing', 'ed', 's'):
+            if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+                return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case, split on non-alphanumerics, drop stop words and stem"""
+    return [stem(token) for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def article_tokens(article: Dict, content_chars: int) -> List[str]:
+    """Tokens of an article; the title is counted twice as it is the strongest signal"""
+    title = article.get('title') or ''
+    content = (article.get('content') or '')[:content_chars]
+    return tokenize(f"{title} {title} {content}")
+
+
+def bm25_scores(query: List[str], documents: List[List[str]]) -> List[float]:
+    """Okapi BM25 score of every document for the query terms"""
+    if not documents:
+        return []
+
+    doc_count = len(documents)
+    avg_length = sum(len(doc) for doc in documents) / doc_count or 1.0
+    query_terms = set(query)
+
+    document_frequency = Counter()
+    term_counts = []
+    for doc in documents:
+        counts = Counter(token for token in doc if token in query_terms)
+        term_counts.append(counts)
+        document_frequency.update(counts.keys())
+
+    idf = {
+        term: math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+        for term, df in document_frequency.items()
+    }
+
+    scores = []
+    for doc, counts in zip(documents, term_counts):
+        norm = K1 * (1 - B + B * len(doc) / avg_length)
+        score = 0.0
+        for term, tf in counts.items():
+            score += idf[term] * tf * (K1 + 1) / (tf + norm)
+        scores.append(score)
+    return scores
+
+
+def rank_articles(articles: List[Dict], business_interest: str, top_k: Optional[int] = None) -> List[Dict]:
+    """Rank articles by BM25 similarity to the business interest and keep the top K
+
+    Each returned article gets a ``relevance_score`` normalised to 0..1 (1.0 for
+    the best match in the batch).
+    """
+    if not articles:
+        return []
+
+    top_k = top_k if top_k is not None else PERFORMANCE_CONFIG['RELEVANCE_TOP_K']
+    content_chars = PERFORMANCE_CONFIG['RELEVANCE_CONTENT_CHARS']
+    min_score = PERFORMANCE_CONFIG['RELEVANCE_MIN_SCORE']
+
+    query = tokenize(business_interest)
+    scores = bm25_scores(query, [article_tokens(article, content_chars) for article in articles])
+    best = max(scores) if scores else 0.0
+
+    ranked = []
+    for article, score in zip(articles, scores):
+        normalized = round(score / best, 4) if best > 0 else 0.0
+        if normalized < min_score:
+            continue
+        ranked.append({**article, 'relevance_score': normalized})
+
+    # sorted() is stable, so ties keep crawl order
+    ranked = sorted(ranked, key=lambda article: article['relevance_score'], reverse=True)
+    return ranked[:top_k] if top_k else ranked
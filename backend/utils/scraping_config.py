@@ -1,8 +1,15 @@
 """
 Configuration settings for web scraping
 """
+import os
 from typing import Dict, List
 
+try:
+    from .env import env_int
+except ImportError:
+    # ``scrapy runspider`` loads the spider and its helpers as top-level modules
+    from env import env_int
+
 # Spider Configuration
 SPIDER_CONFIG = {
     'max_articles_per_source': 20,
@@ -15,6 +22,10 @@ SPIDER_CONFIG = {
     'retry_http_codes': [500, 502, 503, 504, 408, 429, 403],
     'cookies_enabled': True,
     'randomize_download_delay': True,
+    # Article extraction process pool (0 = extract on the reactor thread, unset = cores - 1)
+    'extraction_workers': env_int('EXTRACTION_WORKERS'),
+    'extraction_max_in_flight': env_int('EXTRACTION_MAX_IN_FLIGHT') or None,  # default 2 x workers
+    'extraction_start_method': 'spawn',  # the reactor process is multi-threaded, avoid fork
 }
 
 # Content Quality Settings
@@ -70,7 +81,66 @@ ARTICLE_PATTERNS = {
         r'/newsletter', r'/rss', r'/feed', r'/api/', r'/ajax/',
         r'#', r'\?utm_', r'\?fbclid', r'\?ref=', r'\?source=',
         r'/live/', r'/stream/', r'/podcast/', r'/webinar/',
-    ]
+    ],
+    # Listing pages that link to many articles
+    'category_patterns': [
+        r'/business/', r'/finance/', r'/markets/', r'/economy/', r'/technology/',
+        r'/news/', r'/world/', r'/politics/', r'/opinion/', r'/analysis/',
+        r'/earnings/', r'/stocks/', r'/commodities/', r'/currencies/',
+        r'/cryptocurrency/', r'/crypto/', r'/blockchain/', r'/ai/', r'/artificial-intelligence/',
+        r'/startups/', r'/venture-capital/', r'/ipo/', r'/mergers/', r'/acquisitions/',
+        r'/regulation/', r'/policy/', r'/trade/', r'/tariffs/', r'/inflation/',
+        r'/interest-rates/', r'/federal-reserve/', r'/central-bank/', r'/monetary-policy/',
+    ],
+    'pagination_patterns': [
+        r'/page/\d+', r'/p/\d+', r'/page\d+', r'/p\d+',
+        r'\?page=\d+', r'\&page=\d+', r'\?p=\d+', r'\&p=\d+',
+        r'page=\d+', r'p=\d+', r'offset=\d+', r'start=\d+',
+    ],
+}
+
+# Link hints recorded during single-pass link extraction; these mirror the
+# article selectors the spider used to run one CSS query each
+LINK_HINTS = {
+    # a[href*="..."]
+    'href_contains': [
+        '/article/', '/story/', '/news/', '/business/', '/finance/',
+        '/markets/', '/economy/', '/technology/', '/earnings/', '/analysis/',
+    ],
+    # .article-link a, .story-link a, .news-link a
+    'ancestor_class_tokens': ['article-link', 'story-link', 'news-link'],
+    # [class*="article"] a, [class*="story"] a, [class*="news"] a
+    'ancestor_class_contains': ['article', 'story', 'news'],
+    # [data-testid*="article"] a
+    'ancestor_attribute_contains': {'data-testid': ['article']},
+}
+
+# Feed and sitemap discovery, tried before crawling a source's HTML pages
+FEED_DISCOVERY = {
+    'enabled': True,
+    'max_feeds_per_source': 3,  # autodiscovered <link rel="alternate"> feeds to fetch
+    'feed_paths': ['/feed', '/rss'],  # probed when the homepage advertises no feed
+    'sitemap_paths': ['/sitemap.xml'],
+    'max_child_sitemaps': 2,  # sitemap index entries to follow, news sitemaps first
+    'feed_types': [
+        'application/rss+xml',
+        'application/atom+xml',
+        'application/feed+json',
+        'application/xml',
+        'text/xml',
+    ],
+}
+
+# Crawl frontier scoring (Scrapy request priorities) and per-domain budgets
+CRAWL_FRONTIER = {
+    'type_scores': {'discovery': 200, 'article': 100, 'category': 40, 'pagination': 25, 'internal': 10},
+    'recency_weight': 40,  # added in full for today's dates, scaled down to 0 at max_age_days
+    'undated_freshness': 0.5,  # recency fraction assumed when no date could be inferred
+    'hint_weight': 5,  # per matched LINK_HINTS entry
+    'max_hint_bonus': 15,
+    'depth_penalty': 15,  # per level below the homepage
+    'max_requests_per_domain': 80,
+    'time_budget_seconds': 180,
 }
 
 # Content Extraction Selectors
@@ -135,23 +205,23 @@ SITE_CONFIGS = {
     },
     'cnbc.com': {
         'article_selectors': ['a[href*="/2024/"]', 'a[href*="/2025/"]'],
-        'content_selectors': ['.ArticleBody-articleBody', '.content'],
-        'title_selectors': ['.ArticleHeader-headline', '.title'],
+        'content_selectors': ['.ArticleBody-articleBody', '[data-module="ArticleBody"]'],
+        'title_selectors': ['.ArticleHeader-headline'],
         'date_selectors': ['.ArticleHeader-timestamp'],
         'max_articles': 30,
     },
     'reuters.com': {
         'article_selectors': ['a[href*="/article/"]', 'a[href*="/business/"]'],
-        'content_selectors': ['.article-body__content', '.content'],
-        'title_selectors': ['.article-header__title', '.title'],
+        'content_selectors': ['.article-body__content', '[data-testid="ArticleBody"]'],
+        'title_selectors': ['.article-header__title', '[data-testid="Heading"]'],
         'date_selectors': ['.article-header__timestamp'],
         'max_articles': 25,
     },
     'bloomberg.com': {
         'article_selectors': ['a[href*="/news/"]', 'a[href*="/politics/"]'],
-        'content_selectors': ['.body-copy', '.content'],
-        'title_selectors': ['.headline__text', '.title'],
-        'date_selectors': ['.timestamp', '.date'],
+        'content_selectors': ['.body-copy', '.body-content'],
+        'title_selectors': ['.headline__text'],
+        'date_selectors': ['.timestamp', 'time[datetime]'],
         'max_articles': 20,
     }
 }
@@ -199,10 +269,24 @@ PROXY_CONFIG = {
 # Rate Limiting
 RATE_LIMITING = {
     'enabled': True,
-    'requests_per_minute': 60,
-    'requests_per_hour': 1000,
-    'delay_between_requests': 1.0,
+    'requests_per_minute': 120,  # per domain; sets the minimum download delay (0.5s)
+    'requests_per_hour': 1000,  # per domain, further requests are dropped
+    'delay_between_requests': 1.0,  # AutoThrottle start delay
     'random_delay_range': (0.5, 2.0),
+    'max_delay': 60.0,  # cap for AutoThrottle and backoff delays
+    'target_concurrency': 2.0,  # AutoThrottle parallel requests per domain
+    'throttle_http_codes': [429, 403],  # back off instead of retrying immediately
+    'backoff_factor': 2.0,
+    'max_throttle_retries': 2,
+}
+
+# Per-domain circuit breaker for sources that are down or blocking us
+CIRCUIT_BREAKER = {
+    'enabled': True,
+    'failure_threshold': 2,  # consecutive failed runs before a domain is skipped
+    'cooldown_seconds': 1800,  # doubled after each failed half-open probe
+    'max_cooldown_seconds': 6 * 3600,
+    'health_file': os.getenv('DOMAIN_HEALTH_FILE'),  # default backend/tmp/domain_health.json
 }
 
 # Output Configuration
@@ -1,13 +1,14 @@
 """
 Enhanced scraping utilities for better article extraction
 """
-import requests
 import time
 import random
 from typing import List, Dict, Optional
 import re
 from urllib.parse import urlparse
 import json
+from .http_client import fetch_status, run_sync
+from .scraping_config import PROXY_CONFIG
 
 class ScrapingEnhancer:
     """Enhanced scraping utilities"""
@@ -203,13 +204,9 @@ class ProxyManager:
     def test_proxy(self, proxy: str) -> bool:
         """Test if proxy is working"""
         try:
-            response = requests.get(
-                'https://httpbin.org/ip',
-                proxies={'http': proxy, 'https': proxy},
-                timeout=10
-            )
-            return response.status_code == 200
-        except:
+            status = run_sync(fetch_status(PROXY_CONFIG['test_url'], proxy=proxy))
+            return status == 200
+        except Exception:
             return False
 
 def enhance_article_data(article: Dict) -> Dict:
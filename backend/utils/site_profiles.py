@@ -0,0 +1,94 @@
+"""
+Per-outlet extraction profiles, seeded from ``SITE_CONFIGS``.
+
+A profile names the CSS selectors that locate an outlet's article links,
+body, headline and date. When a page's domain has a profile, the spider uses
+those selectors directly and only falls back to the generic trafilatura/CSS
+cascade if they come up empty. New outlets are added with a ``SITE_CONFIGS``
+entry, or in-process with ``register_profile`` (optionally with a custom
+``extract`` callable for sites that need code rather than selectors).
+"""
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional
+from urllib.parse import urlparse
+
+try:
+    from .scraping_config import SITE_CONFIGS
+except ImportError:
+    # ``scrapy runspider`` loads the spider and its helpers as top-level modules
+    from scraping_config import SITE_CONFIGS
+
+
+class SiteProfile(NamedTuple):
+    domain: str
+    article_selectors: List[str] = []
+    content_selectors: List[str] = []
+    title_selectors: List[str] = []
+    date_selectors: List[str] = []
+    max_articles: Optional[int] = None
+    # Optional extract(tree, url) -> {'content', 'title', 'publish_date'} or None
+    extract: Optional[Callable] = None
+
+
+class ProfileRegistry:
+    """Maps domains (and their subdomains) to site profiles"""
+
+    def __init__(self, cache_size: int = 4096):
+        self.profiles: Dict[str, SiteProfile] = {}
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+
+    def register(self, profile: SiteProfile) -> SiteProfile:
+        self.profiles[profile.domain.lower()] = profile
+        self.lookup.cache_clear()
+        return profile
+
+    def unregister(self, domain: str):
+        self.profiles.pop(domain.lower(), None)
+        self.lookup.cache_clear()
+
+    def _lookup(self, netloc: str) -> Optional[SiteProfile]:
+        """Profile for a host, matching www.cnbc.com to cnbc.com but not the reverse"""
+        host = netloc.lower().split(':')[0]
+        while host:
+            profile = self.profiles.get(host)
+            if profile is not None:
+                return profile
+            _, _, host = host.partition('.')
+        return None
+
+    def for_url(self, url: Optional[str]) -> Optional[SiteProfile]:
+        if not url:
+            return None
+        return self.lookup(urlparse(url).netloc)
+
+    def __len__(self):
+        return len(self.profiles)
+
+    def __contains__(self, domain):
+        return domain.lower() in self.profiles
+
+
+def load_profiles(configs: Dict = None) -> ProfileRegistry:
+    registry = ProfileRegistry()
+    for domain, config in (configs or SITE_CONFIGS).items():
+        registry.register(SiteProfile(domain=domain, **config))
+    return registry
+
+
+PROFILES = load_profiles()
+
+
+def register_profile(domain: str, **fields) -> SiteProfile:
+    """Add or replace an outlet profile, e.g. register_profile('ft.com', content_selectors=[...])
+
+    Only affects the calling process. Extraction workers are spawned and
+    import ``extraction_pool`` and its dependencies, so they see the
+    ``SITE_CONFIGS`` profiles but not registrations made at runtime; for the
+    spider, add a ``SITE_CONFIGS`` entry (or extract in-process with
+    ``EXTRACTION_WORKERS=0``).
+    """
+    return PROFILES.register(SiteProfile(domain=domain, **fields))
+
+
+def get_profile(url: Optional[str]) -> Optional[SiteProfile]:
+    return PROFILES.for_url(url)
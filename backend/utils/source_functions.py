@@ -1,8 +1,7 @@
 import sqlite3
 import traceback
 from .constants import DB_PATH
-import requests
-from urllib.parse import urlparse
+from .http_client import check_url as url_is_reachable, run_sync
 
 def db_connect():
     conn = sqlite3.connect(DB_PATH)
@@ -11,47 +10,11 @@ def db_connect():
 
 
 def check_url(url):
-    # Clean up the URL first
-    url = url.strip()
-    
-    # Handle URLs without protocol
-    if not url.startswith(('http://', 'https://')):
-        url = "https://" + url
-    
-    parsed = urlparse(url)
-    
-    # Basic URL format validation first
-    if not parsed.netloc:
-        print(f"Invalid URL format: {url}")
-        return False
-    
+    """Validate URL accessibility through the shared HTTP client"""
     print(f"Checking URL: {url}")
-    print(f"Parsed netloc: {parsed.netloc}")
-    
-    # Try to validate with a request
-    try:
-        # Try HEAD request first (faster)
-        print(f"Trying HEAD request for: {url}")
-        response = requests.head(url, timeout=10, allow_redirects=True)
-        print(f"HEAD response status: {response.status_code}")
-        # Accept 2xx, 3xx, 403, and 401 (many sites block HEAD requests but are valid)
-        if response.status_code < 400 or response.status_code in [401, 403]:
-            return True
-    except requests.RequestException as e:
-        print(f"HEAD request failed: {e}")
-    
-    try:
-        # If HEAD fails or returns 403, try GET request
-        print(f"Trying GET request for: {url}")
-        response = requests.get(url, timeout=10, allow_redirects=True)
-        print(f"GET response status: {response.status_code}")
-        # Accept 2xx, 3xx, 403, and 401 (many sites block automated requests but are valid)
-        if response.status_code < 400 or response.status_code in [401, 403]:
-            return True
-    except requests.RequestException as e:
-        print(f"GET request failed: {e}")
-    
-    return False
+    is_reachable = run_sync(url_is_reachable(url))
+    print(f"URL reachable: {is_reachable}")
+    return is_reachable
 
 def add_source(client_id ,source_url):
     conn ,cur = db_connect()
@@ -0,0 +1,323 @@
+"""
+Per-request tracing with contextvars, exported as OTLP/JSON.
+
+``start_trace`` opens a root span for a request and makes it current for
+everything that runs in the request's context, including tasks it spawns and
+executor threads LangGraph runs sync nodes in. ``span`` opens a child of the
+current span (and does nothing outside a trace), so code like the pipeline
+stages can be instrumented without passing a tracer around.
+
+Finished traces are exported as OTLP ``ExportTraceServiceRequest`` JSON:
+POSTed to an OTLP/HTTP collector with ``TRACE_EXPORTER=otlp``, or appended one
+per line to ``TRACING_CONFIG['FILE']`` with ``TRACE_EXPORTER=file``, by a
+writer thread that rotates the file past ``FILE_MAX_BYTES``. Exporting is off
+by default.
+"""
+import asyncio
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, List, Optional, Tuple
+
+from .constants import TRACING_CONFIG
+
+# OTLP SpanKind / StatusCode values
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    __slots__ = ('trace', 'span_id', 'parent_span_id', 'name', 'kind', 'start_ns', 'end_ns',
+                 'attributes', 'status', 'status_message')
+
+    def __init__(self, trace: 'Trace', name: str, parent_span_id: Optional[str] = None,
+                 kind: int = SPAN_KIND_INTERNAL, attributes: Optional[Dict] = None):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes or {})
+        self.status = STATUS_OK
+        self.status_message = ''
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    def set_attributes(self, **attributes):
+        self.attributes.update(attributes)
+
+    def set_error(self, error: BaseException):
+        self.status = STATUS_ERROR
+        self.status_message = f"{type(error).__name__}: {error}"[:500]
+
+    def end(self):
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+
+    @property
+    def duration(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def to_otlp(self) -> Dict:
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns or time.time_ns()),
+            'attributes': otlp_attributes(self.attributes),
+            'status': {'code': self.status, 'message': self.status_message} if self.status == STATUS_ERROR
+            else {'code': self.status},
+        }
+        if self.parent_span_id:
+            span['parentSpanId'] = self.parent_span_id
+        return span
+
+
+class Trace:
+    """The spans of one request; shared by every context copied from it"""
+
+    def __init__(self, trace_id: Optional[str] = None, max_spans: Optional[int] = None):
+        self.trace_id = trace_id or os.urandom(16).hex()
+        self.max_spans = max_spans or TRACING_CONFIG['MAX_SPANS']
+        self.spans: List[Span] = []
+        self.dropped = 0
+
+    def add(self, span: Span):
+        if len(self.spans) < self.max_spans:
+            self.spans.append(span)
+        else:
+            self.dropped += 1
+
+    def to_otlp(self) -> Dict:
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': otlp_attributes({'service.name': TRACING_CONFIG['SERVICE_NAME']})},
+                'scopeSpans': [{
+                    'scope': {'name': __name__},
+                    'spans': [span.to_otlp() for span in self.spans],
+                }],
+            }],
+        }
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+
+def otlp_value(value) -> Dict:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    if isinstance(value, (list, tuple)):
+        return {'arrayValue': {'values': [otlp_value(item) for item in value]}}
+    return {'stringValue': str(value)}
+
+
+def otlp_attributes(attributes: Dict) -> List[Dict]:
+    return [{'key': key, 'value': otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+def parse_traceparent(header: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """(trace id, parent span id) of a W3C ``traceparent`` header, or (None, None)"""
+    parts = (header or '').strip().lower().split('-')
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None, None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None, None
+    if parts[1] == '0' * 32:
+        return None, None
+    return parts[1], parts[2]
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.trace_id if span else None
+
+
+def set_attributes(**attributes):
+    """Add attributes to the current span, if any"""
+    span = _current_span.get()
+    if span is not None:
+        span.set_attributes(**attributes)
+
+
+def record_error(error: BaseException):
+    """Mark the current span failed for an error that was handled rather than raised"""
+    span = _current_span.get()
+    if span is not None:
+        span.set_error(error)
+
+
+@contextmanager
+def _activate(span: Span):
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.set_error(e)
+        raise
+    finally:
+        span.end()
+        _current_span.reset(token)
+
+
+@contextmanager
+def start_trace(name: str, trace_id: Optional[str] = None, parent_span_id: Optional[str] = None,
+                kind: int = SPAN_KIND_SERVER, **attributes):
+    """Open a new trace (or continue a caller's) with a root span; it is exported when the block exits"""
+    trace = Trace(trace_id)
+    root = Span(trace, name, parent_span_id=parent_span_id, kind=kind, attributes=attributes)
+    trace.add(root)
+    try:
+        with _activate(root):
+            yield root
+    finally:
+        if trace.dropped:
+            root.set_attributes(**{'trace.dropped_spans': trace.dropped})
+        export(trace)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Child span of the current span; a no-op (yielding None) outside a trace"""
+    parent = _current_span.get()
+    if parent is None or not TRACING_CONFIG['ENABLED']:
+        yield None
+        return
+    child = Span(parent.trace, name, parent_span_id=parent.span_id, attributes=attributes)
+    parent.trace.add(child)
+    with _activate(child):
+        yield child
+
+
+def traced(name: Optional[str] = None):
+    """Decorator running a sync or async function inside a span"""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TraceFileWriter:
+    """Appends trace lines to a size-capped, rotated file from a background thread"""
+
+    def __init__(self, path: str, max_bytes: int, backups: int, queue_size: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, line: str):
+        """Queue a line without blocking; it is dropped if the writer has fallen behind"""
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5):
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            line = self._queue.get()
+            if line is None:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._rotate_if_full(len(line) + 1)
+                with open(self.path, 'a') as f:
+                    f.write(line + '\n')
+            except Exception as e:
+                print(f"[Tracing] Failed to write trace file {self.path}: {e}")
+
+    def _rotate_if_full(self, incoming: int):
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return
+        if size + incoming <= self.max_bytes:
+            return
+        if self.backups < 1:
+            os.remove(self.path)
+            return
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+_file_writer: Optional[TraceFileWriter] = None
+_file_writer_lock = threading.Lock()
+
+
+def get_file_writer() -> TraceFileWriter:
+    global _file_writer
+    if _file_writer is None:
+        with _file_writer_lock:
+            if _file_writer is None:
+                _file_writer = TraceFileWriter(
+                    TRACING_CONFIG['FILE'], TRACING_CONFIG['FILE_MAX_BYTES'],
+                    TRACING_CONFIG['FILE_BACKUPS'], TRACING_CONFIG['FILE_QUEUE_SIZE'],
+                )
+    return _file_writer
+
+
+@atexit.register
+def _flush_file_writer():
+    if _file_writer is not None:
+        _file_writer.close()
+
+
+def export(trace: Trace):
+    """Hand a finished trace to the configured exporter; export errors are only logged"""
+    exporter = TRACING_CONFIG['EXPORTER']
+    if not TRACING_CONFIG['ENABLED'] or exporter == 'none':
+        return
+    payload = trace.to_otlp()
+    try:
+        if exporter == 'otlp':
+            from .http_client import post_json, submit
+
+            submit(post_json(TRACING_CONFIG['OTLP_ENDPOINT'], payload))
+        else:
+            get_file_writer().write(json.dumps(payload, separators=(',', ':')))
+    except Exception as e:
+        print(f"[Tracing] Failed to export trace {trace.trace_id}: {e}")
@@ -1,44 +1,78 @@
 import scrapy
+from scrapy.utils.defer import maybe_deferred_to_future
 import json
 import os
-import trafilatura
 from datetime import datetime, timedelta
 from urllib.parse import urlparse, urljoin
-import hashlib
-import re
 import logging
 from dotenv import load_dotenv
 
+try:
+    from .url_classifier import UrlClassifier, ARTICLE, CATEGORY, PAGINATION, INTERNAL, is_same_site
+    from .link_extractor import LinkExtractor
+    from .extraction_pool import ExtractionPool
+    from .feed_discovery import (
+        FEED_REQUEST_HEADERS, find_feed_links, candidate_urls, is_sitemap,
+        parse_feed, parse_sitemap, pick_child_sitemaps, select_articles,
+    )
+    from .scraping_config import FEED_DISCOVERY
+    from .date_inference import listing_dates, infer_date, days_old
+    from .crawl_frontier import CrawlFrontier, FrontierBudgetMiddleware
+    from .rate_limiter import RateLimitMiddleware, spider_settings
+    from .domain_health import DomainHealth, HALF_OPEN, source_domain
+    from .scraping_config import CIRCUIT_BREAKER
+    from .site_profiles import PROFILES
+    from .link_extractor import absolutize
+except ImportError:
+    # ``scrapy runspider`` loads this file as a top-level module
+    from url_classifier import UrlClassifier, ARTICLE, CATEGORY, PAGINATION, INTERNAL, is_same_site
+    from link_extractor import LinkExtractor
+    from extraction_pool import ExtractionPool
+    from feed_discovery import (
+        FEED_REQUEST_HEADERS, find_feed_links, candidate_urls, is_sitemap,
+        parse_feed, parse_sitemap, pick_child_sitemaps, select_articles,
+    )
+    from scraping_config import FEED_DISCOVERY
+    from date_inference import listing_dates, infer_date, days_old
+    from crawl_frontier import CrawlFrontier, FrontierBudgetMiddleware
+    from rate_limiter import RateLimitMiddleware, spider_settings
+    from domain_health import DomainHealth, HALF_OPEN, source_domain
+    from scraping_config import CIRCUIT_BREAKER
+    from site_profiles import PROFILES
+    from link_extractor import absolutize
+
 # Load environment variables
 load_dotenv()
 openai_key = os.getenv("OPENAI_KEY")
-os.environ["OPENAI_API_KEY"] = openai_key
+if openai_key:
+    os.environ["OPENAI_API_KEY"] = openai_key
+
+PROFILE_HINT = frozenset({'profile'})
 
 class TrafilaturaSpider(scrapy.Spider):
 
     name = "trafilatura_spider"
     custom_settings = {
-        'CONCURRENT_REQUESTS': 8,
-        'CONCURRENT_REQUESTS_PER_DOMAIN': 4,
-        'DOWNLOAD_DELAY': 0.5,
-        'RANDOMIZE_DOWNLOAD_DELAY': True,
-        'DOWNLOAD_TIMEOUT': 15,
-        'RETRY_TIMES': 3,
-        'RETRY_HTTP_CODES': [500, 502, 503, 504, 408, 429, 403],
-        'COOKIES_ENABLED': True,
+        # Concurrency, delays, retries and AutoThrottle from SPIDER_CONFIG / RATE_LIMITING
+        **spider_settings(),
         'DOWNLOADER_MIDDLEWARES': {
             'scrapy.downloadermiddlewares.useragent.UserAgentMiddleware': None,
             'scrapy.downloadermiddlewares.retry.RetryMiddleware': 90,
             'scrapy.downloadermiddlewares.httpproxy.HttpProxyMiddleware': 110,
+            f'{FrontierBudgetMiddleware.__module__}.FrontierBudgetMiddleware': 50,
+            # Closer to the downloader than RetryMiddleware, so it handles 429/403 first
+            f'{RateLimitMiddleware.__module__}.RateLimitMiddleware': 95,
         },
         'USER_AGENT': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'ROBOTSTXT_OBEY': False,
     }
 
-    def __init__(self, sources=None, sources_path='tmp/sources.json', output_path='tmp/output.json', *args, **kwargs):
+    def __init__(self, sources=None, sources_path='tmp/sources.json', output_path='tmp/output.json',
+                 report_path='tmp/crawl_report.json', *args, **kwargs):
         super(TrafilaturaSpider, self).__init__(*args, **kwargs)
         self.sources_path = sources_path
         self.output_path = output_path
+        self.report_path = report_path
         self.articles = []
         self.max_articles_per_source = 50
         self.max_age_days = 7
@@ -49,23 +83,6 @@ class TrafilaturaSpider(scrapy.Spider):
         self.log_handler = logging.getLogger(self.name)
         self.log_handler.setLevel(logging.INFO)
         
-        # Add custom headers for better compatibility
-        self.custom_settings = {
-            'USER_AGENT': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'ROBOTSTXT_OBEY': False,
-            'DOWNLOAD_DELAY': 0.5,
-            'RANDOMIZE_DOWNLOAD_DELAY': True,
-            'DOWNLOAD_TIMEOUT': 15,
-            'RETRY_TIMES': 3,
-            'RETRY_HTTP_CODES': [500, 502, 503, 504, 408, 429, 403],
-            'COOKIES_ENABLED': True,
-            'DOWNLOADER_MIDDLEWARES': {
-                'scrapy.downloadermiddlewares.useragent.UserAgentMiddleware': None,
-                'scrapy.downloadermiddlewares.retry.RetryMiddleware': 90,
-                'scrapy.downloadermiddlewares.httpproxy.HttpProxyMiddleware': 110,
-            }
-        }
-        
         # Always parse self.sources as JSON if it exists and is a string
         if hasattr(self, 'sources') and self.sources:
             try:
@@ -86,6 +103,21 @@ class TrafilaturaSpider(scrapy.Spider):
         self.site_page_count = {}  # domain -> page count
         self.processed_urls = set()  # Track processed URLs to avoid duplicates
         self.crawl_depth = {}  # Track crawl depth for each domain
+        self.url_classifier = UrlClassifier()
+        self.link_extractor = LinkExtractor()
+        self.extraction_pool = ExtractionPool()
+        self.discovery = {}  # domain -> feed/sitemap discovery state
+        self.frontier = CrawlFrontier(max_age_days=self.max_age_days)
+        self.health = DomainHealth()
+        self.skipped_sources = []  # sources short-circuited by an open domain circuit
+        # Per-run counters for the crawl report
+        self.run_stats = {
+            'candidates': 0,
+            'undated_candidates': 0,
+            'skipped_stale': {'metadata': 0, 'listing': 0, 'url': 0},
+            'fetched': 0,
+            'stale_after_fetch': 0,
+        }
 
     def get_domain(self, url):
         """Extract domain from URL"""
@@ -134,6 +166,21 @@ class TrafilaturaSpider(scrapy.Spider):
                 self.debug_info(f"Skipping invalid URL: {url}")
                 continue
                 
+            domain = source_domain(url)
+            # The source's domain keys its frontier budget for the whole crawl, also after redirects
+            meta = {'dont_cache': False, 'dont_redirect': False, 'depth': 0, 'source_domain': domain, 'domain': domain}
+            if CIRCUIT_BREAKER['enabled']:
+                if not self.health.allow(domain):
+                    skipped = self.health.skipped_entry(url, domain)
+                    self.skipped_sources.append(skipped)
+                    self.debug_info(f"Skipping {url}: circuit open until {skipped['retry_after']} ({skipped['last_error']})")
+                    continue
+                if self.health.state(domain) == HALF_OPEN:
+                    # One cheap probe: no retries while the domain is suspect
+                    meta['max_retry_times'] = 0
+                    self.debug_info(f"Probing {domain} after cooldown")
+            if not self.frontier.admit(domain):
+                continue
             self.debug_info(f"Requesting URL: {url}")
             try:
                 # Add to processed URLs to avoid duplicates
@@ -142,7 +189,7 @@ class TrafilaturaSpider(scrapy.Spider):
                 yield scrapy.Request(
                     url=url, 
                     callback=self.parse,
-                    meta={'dont_cache': False, 'dont_redirect': False, 'depth': 0},
+                    meta=meta,
                     headers={
                         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
                         'Accept-Language': 'en-US,en;q=0.5',
@@ -158,11 +205,17 @@ class TrafilaturaSpider(scrapy.Spider):
     def handle_error(self, failure):
         """Enhanced error handling"""
         self.debug_info(f"Request failed: {failure.value}")
+        error = f"{type(failure.value).__name__}: {failure.value}"
         if hasattr(failure.value, 'response'):
             self.debug_info(f"Response status: {failure.value.response.status}")
+            error = f"HTTP {failure.value.response.status}"
+        # A failed homepage (after retries) counts against the source's domain
+        domain = failure.request.meta.get('source_domain')
+        if domain:
+            self.health.record_failure(domain, error)
 
     def parse(self, response):
-        domain = self.get_domain(response.url)
+        domain = response.meta.get('domain') or self.get_domain(response.url)
         self.site_article_count.setdefault(domain, 0)
         self.site_page_count.setdefault(domain, 0)
         
@@ -171,6 +224,8 @@ class TrafilaturaSpider(scrapy.Spider):
         self.crawl_depth[domain] = current_depth
         
         self.debug_info(f"Parsing {response.url} for domain {domain} at depth {current_depth}")
+        if response.meta.get('source_domain'):
+            self.health.record_success(response.meta['source_domain'])
         self.debug_info(f"Page count for {domain}: {self.site_page_count[domain]}")
 
         # Increment page count
@@ -182,25 +237,96 @@ class TrafilaturaSpider(scrapy.Spider):
             return
 
         links = self.extract_links(response, domain)
-        self.debug_info(f"Found {len(links)} links on {response.url}")
+        try:
+            dates = listing_dates(response.selector.root, response.url)
+        except Exception as e:
+            # Dates only order and pre-filter candidates; the links are still worth crawling
+            self.debug_info(f"Listing date lookup failed on {response.url}: {e}")
+            dates = {}
+        self.debug_info(f"Found {len(links)} links ({len(dates)} dated) on {response.url}")
+
+        # Try feeds and sitemaps first; the HTML crawl only runs if they list no articles
+        if current_depth == 0 and FEED_DISCOVERY['enabled'] and domain not in self.discovery:
+            feeds = find_feed_links(response.selector.root, response.url)
+            self.debug_info(f"Autodiscovered {len(feeds)} feeds on {response.url}")
+            self.discovery[domain] = {
+                'pending': 0, 'requests': 0, 'found': 0, 'seen': set(),
+                'links': links, 'dates': dates, 'depth': current_depth,
+            }
+            requests = [self.discovery_request(url, domain) for url in candidate_urls(response.url, feeds)]
+            requests = [request for request in requests if request is not None]
+            if requests:
+                yield from requests
+                return
+            del self.discovery[domain]
 
-        article_count = 0
-        internal_links = []
-        category_links = []
-        pagination_links = []
+        yield from self.crawl_links(links, dates, domain, current_depth)
+
+    def crawl_links(self, links, dates, domain, current_depth):
+        """Request article links and follow category, pagination and internal pages
+
+        Candidates are scored by the crawl frontier; the best ones fill the
+        per-page limits and are scheduled with their score as priority.
+        """
+        articles = []
+        followed = {CATEGORY: [], PAGINATION: [], INTERNAL: []}
+        
+        for link, hints in links.items():
+            link_type = self.url_classifier.classify(link, domain)
+            if link_type == ARTICLE or 'profile' in hints:
+                publish_date, date_source = infer_date(link, listing_date=dates.get(link))
+                if self.is_stale_candidate(link, publish_date, date_source):
+                    continue
+                score = self.frontier.score(ARTICLE, hints, publish_date, current_depth)
+                articles.append((score, link, publish_date, date_source))
+            elif link_type in followed and link not in self.processed_urls:
+                followed[link_type].append((self.frontier.score(link_type, hints, None, current_depth + 1), link))
+        
+        articles.sort(key=lambda candidate: candidate[0], reverse=True)
+        limit = self.article_limit(domain)
+        for score, link, publish_date, date_source in articles[:limit]:
+            if not self.frontier.admit(domain):
+                self.debug_info(f"Request budget exhausted for {domain}, stopping")
+                return
+            self.debug_info(f"Crawling article (score {score:.0f}) for {domain}: {link}")
+            yield scrapy.Request(
+                url=link,
+                callback=self.parse_article,
+                priority=self.frontier.priority(score),
+                meta={
+                    'domain': domain, 'depth': current_depth, 'link_hints': sorted(links[link]),
+                    'inferred_date': publish_date, 'date_source': date_source,
+                },
+                headers={
+                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                    'Accept-Language': 'en-US,en;q=0.5',
+                    'Accept-Encoding': 'gzip, deflate',
+                    'Connection': 'keep-alive',
+                    'Upgrade-Insecure-Requests': '1',
+                }
+            )
+        if len(articles) > limit:
+            self.debug_info(f"Reached limit for {domain}, kept the {limit} best of {len(articles)} articles")
         
-        for link in links:
-            if article_count >= self.max_articles_per_source:
-                self.debug_info(f"Reached limit for {domain}, stopping")
-                break
-                
-            if self.is_likely_article_url(link, domain):
-                self.debug_info(f"Crawling article {article_count + 1} for {domain}: {link}")
-                article_count += 1
+        if current_depth >= self.max_depth:
+            return
+        
+        # Follow the best category (3), pagination (2) and internal (2) pages
+        for link_type, limit in ((CATEGORY, 3), (PAGINATION, 2), (INTERNAL, 2)):
+            candidates = sorted(followed[link_type], reverse=True)[:limit]
+            for score, link in candidates:
+                if link in self.processed_urls:
+                    continue
+                if not self.frontier.admit(domain):
+                    self.debug_info(f"Request budget exhausted for {domain}, stopping")
+                    return
+                self.processed_urls.add(link)
+                self.debug_info(f"Crawling {link_type} page at depth {current_depth + 1} (score {score:.0f}): {link}")
                 yield scrapy.Request(
                     url=link,
-                    callback=self.parse_article,
-                    meta={'domain': domain, 'depth': current_depth},
+                    callback=self.parse,
+                    priority=self.frontier.priority(score),
+                    meta={'domain': domain, 'depth': current_depth + 1},
                     headers={
                         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
                         'Accept-Language': 'en-US,en;q=0.5',
@@ -209,345 +335,191 @@ class TrafilaturaSpider(scrapy.Spider):
                         'Upgrade-Insecure-Requests': '1',
                     }
                 )
-            elif self.is_category_page(link, domain):
-                category_links.append(link)
-            elif self.is_pagination_link(link, domain):
-                pagination_links.append(link)
-            elif self.is_internal_link(link, domain):
-                internal_links.append(link)
-        
-        # Follow category pages (priority 1)
-        if category_links and current_depth < self.max_depth:
-            for category_link in category_links[:3]:  # Limit to 3 category pages
-                if category_link not in self.processed_urls:
-                    self.processed_urls.add(category_link)
-                    self.debug_info(f"Crawling category page at depth {current_depth + 1}: {category_link}")
-                    yield scrapy.Request(
-                        url=category_link,
-                        callback=self.parse,
-                        meta={'domain': domain, 'depth': current_depth + 1},
-                        headers={
-                            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                            'Accept-Language': 'en-US,en;q=0.5',
-                            'Accept-Encoding': 'gzip, deflate',
-                            'Connection': 'keep-alive',
-                            'Upgrade-Insecure-Requests': '1',
-                        }
-                    )
-        
-        # Follow pagination links (priority 2)
-        if pagination_links and current_depth < self.max_depth:
-            for pagination_link in pagination_links[:2]:  # Limit to 2 pagination pages
-                if pagination_link not in self.processed_urls:
-                    self.processed_urls.add(pagination_link)
-                    self.debug_info(f"Crawling pagination page at depth {current_depth + 1}: {pagination_link}")
-                    yield scrapy.Request(
-                        url=pagination_link,
-                        callback=self.parse,
-                        meta={'domain': domain, 'depth': current_depth + 1},
-                        headers={
-                            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                            'Accept-Language': 'en-US,en;q=0.5',
-                            'Accept-Encoding': 'gzip, deflate',
-                            'Connection': 'keep-alive',
-                            'Upgrade-Insecure-Requests': '1',
-                        }
-                    )
-        
-        # Follow internal links (priority 3)
-        if internal_links and current_depth < self.max_depth:
-            for internal_link in internal_links[:2]:  # Limit to 2 internal pages
-                if internal_link not in self.processed_urls:
-                    self.processed_urls.add(internal_link)
-                    self.debug_info(f"Crawling internal page at depth {current_depth + 1}: {internal_link}")
-                    yield scrapy.Request(
-                        url=internal_link,
-                        callback=self.parse,
-                        meta={'domain': domain, 'depth': current_depth + 1},
-                        headers={
-                            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                            'Accept-Language': 'en-US,en;q=0.5',
-                            'Accept-Encoding': 'gzip, deflate',
-                            'Connection': 'keep-alive',
-                            'Upgrade-Insecure-Requests': '1',
-                        }
-                    )
+
+    def discovery_request(self, url, domain):
+        """Feed or sitemap request, or None if the domain's budget is exhausted"""
+        if not self.frontier.admit(domain):
+            return None
+        state = self.discovery[domain]
+        state['pending'] += 1
+        state['requests'] += 1
+        return scrapy.Request(
+            url=url,
+            callback=self.parse_discovery,
+            priority=self.frontier.priority(self.frontier.score('discovery')),
+            errback=self.discovery_failed,
+            meta={'domain': domain},
+            headers=FEED_REQUEST_HEADERS,
+            # Every discovery request must reach a callback to settle the source
+            dont_filter=True,
+        )
+
+    def parse_discovery(self, response):
+        """Queue article URLs listed by an RSS/Atom feed or a sitemap"""
+        domain = response.meta['domain']
+        state = self.discovery[domain]
+        if is_sitemap(response.body):
+            via = 'sitemap'
+            articles, children = parse_sitemap(response.body)
+            for child in pick_child_sitemaps(children, FEED_DISCOVERY['max_child_sitemaps']):
+                if child not in self.processed_urls:
+                    self.processed_urls.add(child)
+                    request = self.discovery_request(child, domain)
+                    if request is not None:
+                        yield request
+        else:
+            via = 'feed'
+            articles = parse_feed(response.body, response.url)
+
+        fresh = []
+        for article in articles:
+            if article.url in state['seen']:
+                continue
+            publish_date, date_source = infer_date(article.url, metadata_date=article.publish_date)
+            if not self.is_stale_candidate(article.url, publish_date, date_source):
+                fresh.append(article._replace(publish_date=publish_date))
+
+        remaining = self.article_limit(domain) - state['found']
+        selected = select_articles(fresh, domain, max(remaining, 0))
+        self.debug_info(f"{via.capitalize()} {response.url} listed {len(articles)} entries, queueing {len(selected)}")
+        for article in selected:
+            if not self.frontier.admit(domain):
+                self.debug_info(f"Request budget exhausted for {domain}, stopping")
+                break
+            state['seen'].add(article.url)
+            state['found'] += 1
+            score = self.frontier.score(ARTICLE, (), article.publish_date, 1)
+            yield scrapy.Request(
+                url=article.url,
+                callback=self.parse_article,
+                priority=self.frontier.priority(score),
+                meta={
+                    'domain': domain, 'depth': 1, 'discovered_via': via,
+                    'inferred_date': article.publish_date,
+                },
+                headers={
+                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                    'Accept-Language': 'en-US,en;q=0.5',
+                    'Accept-Encoding': 'gzip, deflate',
+                    'Connection': 'keep-alive',
+                    'Upgrade-Insecure-Requests': '1',
+                }
+            )
+        yield from self.finish_discovery(domain)
+
+    def discovery_failed(self, failure):
+        """Missing feeds and sitemaps are expected, just settle the request"""
+        domain = failure.request.meta['domain']
+        self.debug_info(f"Discovery request failed: {failure.request.url} ({failure.value})")
+        yield from self.finish_discovery(domain)
+
+    def finish_discovery(self, domain):
+        """Fall back to the HTML crawl once every discovery request found nothing"""
+        state = self.discovery[domain]
+        state['pending'] -= 1
+        if state['pending'] > 0:
+            return
+        links, state['links'] = state['links'], None
+        dates, state['dates'] = state['dates'], None
+        if state['found']:
+            self.debug_info(f"Discovery for {domain}: {state['found']} articles from {state['requests']} feed/sitemap requests")
+        else:
+            self.debug_info(f"No feed or sitemap articles for {domain}, falling back to HTML crawl")
+            yield from self.crawl_links(links, dates, domain, state['depth'])
+
+    def is_stale_candidate(self, url, publish_date, date_source):
+        """Drop candidates whose inferred date is already past max_age_days"""
+        self.run_stats['candidates'] += 1
+        if publish_date is None:
+            self.run_stats['undated_candidates'] += 1
+            return False
+        if days_old(publish_date) > self.max_age_days:
+            self.run_stats['skipped_stale'][date_source] += 1
+            self.debug_info(f"Skipping stale candidate ({date_source} date {publish_date.date()}): {url}")
+            return True
+        return False
 
     def extract_links(self, response, domain):
-        """Enhanced link extraction with multiple methods"""
-        links = set()
-        
-        # Method 1: Standard link extraction
-        links.update(response.css('a::attr(href)').getall())
-        
-        # Method 2: Look for article-specific selectors
-        article_selectors = [
-            'a[href*="/article/"]',
-            'a[href*="/story/"]',
-            'a[href*="/news/"]',
-            'a[href*="/business/"]',
-            'a[href*="/finance/"]',
-            'a[href*="/markets/"]',
-            'a[href*="/economy/"]',
-            'a[href*="/technology/"]',
-            'a[href*="/earnings/"]',
-            'a[href*="/analysis/"]',
-            '.article-link a',
-            '.story-link a',
-            '.news-link a',
-            '[data-testid*="article"] a',
-            '[class*="article"] a',
-            '[class*="story"] a',
-            '[class*="news"] a'
-        ]
-        
-        for selector in article_selectors:
-            links.update(response.css(selector + '::attr(href)').getall())
-        
-        # Convert to absolute URLs and filter
-        absolute_links = []
-        for link in links:
-            if link:
-                absolute_link = urljoin(response.url, link)
-                if self.is_valid_url(absolute_link, domain):
-                    absolute_links.append(absolute_link)
-        
-        return list(set(absolute_links))  # Remove duplicates
+        """Extract same-site links in one pass over the parsed page
+
+        Returns {absolute URL: frozenset of matched selector hints}. Links
+        matched by the site profile's article selectors get a 'profile' hint.
+        """
+        try:
+            links = self.link_extractor.extract(response.selector.root, response.url, domain)
+        except Exception as e:
+            self.debug_info(f"Link extraction failed for {response.url}: {e}")
+            return {}
+        profile = PROFILES.lookup(domain)
+        if profile is not None:
+            for css in profile.article_selectors:
+                for href in response.css(css + '::attr(href)').getall():
+                    url = absolutize(response.url, href.strip())
+                    if url in links:
+                        links[url] = links[url] | PROFILE_HINT
+        return links
+
+    def article_limit(self, domain):
+        """max_articles of the domain's site profile, else max_articles_per_source"""
+        profile = PROFILES.lookup(domain)
+        if profile is not None and profile.max_articles:
+            return profile.max_articles
+        return self.max_articles_per_source
 
     def is_valid_url(self, url, domain):
         """Enhanced URL validation"""
         try:
-            parsed = urlparse(url)
-            return (
-                parsed.netloc == domain or 
-                parsed.netloc.endswith('.' + domain) or
-                domain.endswith('.' + parsed.netloc)
-            )
+            return is_same_site(urlparse(url).netloc, domain)
         except:
             return False
 
     def is_category_page(self, url, domain):
         """Identify category pages that contain multiple articles"""
-        category_patterns = [
-            r'/business/', r'/finance/', r'/markets/', r'/economy/', r'/technology/',
-            r'/news/', r'/world/', r'/politics/', r'/opinion/', r'/analysis/',
-            r'/earnings/', r'/stocks/', r'/commodities/', r'/currencies/',
-            r'/cryptocurrency/', r'/crypto/', r'/blockchain/', r'/ai/', r'/artificial-intelligence/',
-            r'/startups/', r'/venture-capital/', r'/ipo/', r'/mergers/', r'/acquisitions/',
-            r'/regulation/', r'/policy/', r'/trade/', r'/tariffs/', r'/inflation/',
-            r'/interest-rates/', r'/federal-reserve/', r'/central-bank/', r'/monetary-policy/'
-        ]
-        
-        for pattern in category_patterns:
-            if re.search(pattern, url, re.IGNORECASE):
-                return True
-        
-        return False
+        return self.url_classifier.is_category(url)
 
     def is_likely_article_url(self, url, domain):
         """Enhanced article URL detection"""
-        # Skip obvious non-article URLs
-        skip_patterns = [
-            r'/login', r'/signup', r'/subscribe', r'/advertise', r'/contact',
-            r'/about', r'/privacy', r'/terms', r'/cookie', r'/sitemap',
-            r'/search', r'/tag/', r'/category/', r'/author/', r'/user/',
-            r'\.pdf$', r'\.jpg$', r'\.png$', r'\.gif$', r'\.mp4$', r'\.mp3$',
-            r'/video/', r'/gallery/', r'/slideshow/', r'/interactive/',
-            r'/newsletter', r'/rss', r'/feed', r'/api/', r'/ajax/',
-            r'#', r'\?utm_', r'\?fbclid', r'\?ref=', r'\?source='
-        ]
-        
-        for pattern in skip_patterns:
-            if re.search(pattern, url, re.IGNORECASE):
-                return False
-        
-        # Look for article indicators
-        article_patterns = [
-            r'/article/', r'/story/', r'/news/', r'/business/', r'/finance/',
-            r'/markets/', r'/economy/', r'/technology/', r'/earnings/',
-            r'/analysis/', r'/commentary/', r'/opinion/', r'/report/',
-            r'\d{4}/\d{2}/\d{2}', r'\d{4}-\d{2}-\d{2}',  # Date patterns
-            r'[a-z-]+-\d+',  # Slug with ID
-        ]
-        
-        for pattern in article_patterns:
-            if re.search(pattern, url, re.IGNORECASE):
-                return True
-        
-        # Check URL length (articles tend to be longer)
-        return len(url) > 50
+        return self.url_classifier.is_article(url)
 
-    def parse_article(self, response):
+    async def parse_article(self, response):
         """Enhanced article parsing with multiple extraction methods"""
         self.debug_info(f"Parsing article: {response.url}")
+        self.run_stats['fetched'] += 1
         
-        # Method 1: Trafilatura (primary method)
-        content = self.extract_with_trafilatura(response)
-        
-        # Method 2: Fallback to CSS selectors if trafilatura fails
-        if not content or len(content.strip()) < 100:
-            content = self.extract_with_css(response)
-        
-        # Method 3: Basic text extraction as last resort
-        if not content or len(content.strip()) < 100:
-            content = self.extract_basic_text(response)
+        # CPU-bound extraction runs in the process pool, the raw body is sent as bytes
+        try:
+            extracted = await maybe_deferred_to_future(
+                self.extraction_pool.extract(response.body, response.url)
+            )
+        except Exception as e:
+            self.debug_info(f"Extraction failed for {response.url}: {e}")
+            extracted = None
         
-        if content and len(content.strip()) > 100:
-            # Extract metadata
-            title = self.extract_title(response)
-            publish_date = self.extract_publish_date(response)
+        if extracted:
+            title = extracted['title']
+            publish_date = extracted['publish_date'] or response.meta.get('inferred_date') or datetime.now()
             
             # Check if article is recent enough
             if self.is_recent_article(publish_date):
-                # Convert publish_date to string format safely
-                if publish_date:
-                    if hasattr(publish_date, 'isoformat'):
-                        # It's a datetime object
-                        publish_date_str = publish_date.isoformat()
-                    else:
-                        # It's already a string or other type
-                        publish_date_str = str(publish_date)
-                else:
-                    publish_date_str = None
-                
                 article_data = {
                     'url': response.url,
                     'title': title,
-                    'content': content,
-                    'publish_date': publish_date_str,
+                    'content': extracted['content'],
+                    'publish_date': publish_date.isoformat(),
                     'domain': response.meta.get('domain', ''),
-                    'extraction_method': 'trafilatura'
+                    'extraction_method': extracted['extraction_method'],
+                    'discovered_via': response.meta.get('discovered_via', 'crawl')
                 }
                 
                 self.articles.append(article_data)
                 self.debug_info(f"Added article: {response.url} (total: {len(self.articles)})")
                 self.log_handler.info(f"Extracted content from {response.url}")
             else:
+                self.run_stats['stale_after_fetch'] += 1
                 self.debug_info(f"Skipping old article: {response.url} ({self.get_days_old(publish_date)} days old)")
         else:
             self.debug_info(f"No content extracted from: {response.url}")
 
-    def extract_with_trafilatura(self, response):
-        """Extract content using trafilatura with enhanced settings"""
-        try:
-            # Enhanced trafilatura settings
-            extracted = trafilatura.extract(
-                response.text,
-                include_comments=False,
-                include_tables=True,
-                no_fallback=False,
-                output_format='text',
-                with_metadata=True,
-                date_extraction_params={
-                    'extensive_search': True,
-                    'original_date': True
-                }
-            )
-            return extracted
-        except Exception as e:
-            self.debug_info(f"Trafilatura extraction failed: {e}")
-            return None
-
-    def extract_with_css(self, response):
-        """Fallback CSS extraction for common article selectors"""
-        selectors = [
-            'article',
-            '.article-content',
-            '.story-content',
-            '.post-content',
-            '.entry-content',
-            '.content-body',
-            '.article-body',
-            '.story-body',
-            '[data-testid="article-content"]',
-            '.article__content',
-            '.story__content',
-            '.post__content'
-        ]
-        
-        for selector in selectors:
-            content = response.css(selector).get()
-            if content and len(content.strip()) > 100:
-                return content
-        
-        return None
-
-    def extract_basic_text(self, response):
-        """Basic text extraction as last resort"""
-        # Remove script and style elements
-        text = response.css('body').get()
-        if text:
-            # Basic cleaning
-            text = re.sub(r'<script.*?</script>', '', text, flags=re.DOTALL)
-            text = re.sub(r'<style.*?</style>', '', text, flags=re.DOTALL)
-            text = re.sub(r'<[^>]+>', ' ', text)
-            text = re.sub(r'\s+', ' ', text).strip()
-            return text if len(text) > 100 else None
-        return None
-
-    def extract_title(self, response):
-        """Enhanced title extraction"""
-        # Try multiple title selectors
-        title_selectors = [
-            'h1',
-            '.article-title',
-            '.story-title',
-            '.post-title',
-            '.entry-title',
-            '[data-testid="article-title"]',
-            'title'
-        ]
-        
-        for selector in title_selectors:
-            title = response.css(selector + '::text').get()
-            if title and len(title.strip()) > 5:
-                return title.strip()
-        
-        return None
-
-    def extract_publish_date(self, response):
-        """Enhanced date extraction"""
-        try:
-            # Try trafilatura date extraction first
-            metadata = trafilatura.extract_metadata(response.text)
-            if metadata and metadata.date:
-                # Handle case where trafilatura returns a string
-                if isinstance(metadata.date, str):
-                    try:
-                        return datetime.fromisoformat(metadata.date.replace('Z', '+00:00'))
-                    except:
-                        pass
-                elif hasattr(metadata.date, 'isoformat'):
-                    # It's already a datetime object
-                    return metadata.date
-            
-            # Fallback to CSS selectors
-            date_selectors = [
-                'time::attr(datetime)',
-                '.publish-date::text',
-                '.article-date::text',
-                '.story-date::text',
-                '.post-date::text',
-                '[data-testid="publish-date"]::text',
-                'meta[property="article:published_time"]::attr(content)',
-                'meta[name="publish_date"]::attr(content)'
-            ]
-            
-            for selector in date_selectors:
-                date_str = response.css(selector).get()
-                if date_str:
-                    try:
-                        return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    except:
-                        continue
-            
-            # Default to current date if no date found
-            return datetime.now()
-            
-        except Exception as e:
-            self.debug_info(f"Date extraction failed: {e}")
-            return datetime.now()
-
     def is_recent_article(self, publish_date):
         """Check if article is within the age limit"""
         if not publish_date:
@@ -571,52 +543,42 @@ class TrafilaturaSpider(scrapy.Spider):
 
     def is_pagination_link(self, url, domain):
         """Identify pagination links"""
-        pagination_patterns = [
-            r'/page/\d+', r'/p/\d+', r'/page\d+', r'/p\d+',
-            r'\?page=\d+', r'\&page=\d+', r'\?p=\d+', r'\&p=\d+',
-            r'/news/page/\d+', r'/business/page/\d+', r'/technology/page/\d+',
-            r'/finance/page/\d+', r'/markets/page/\d+', r'/economy/page/\d+',
-            r'page=\d+', r'p=\d+', r'offset=\d+', r'start=\d+'
-        ]
-        
-        for pattern in pagination_patterns:
-            if re.search(pattern, url, re.IGNORECASE):
-                return True
-        
-        return False
+        return self.url_classifier.is_pagination(url)
 
     def is_internal_link(self, url, domain):
         """Identify internal navigation links"""
-        # Skip obvious non-internal links
-        skip_patterns = [
-            r'/login', r'/signup', r'/subscribe', r'/advertise', r'/contact',
-            r'/about', r'/privacy', r'/terms', r'/cookie', r'/sitemap',
-            r'/search', r'/tag/', r'/category/', r'/author/', r'/user/',
-            r'\.pdf$', r'\.jpg$', r'\.png$', r'\.gif$', r'\.mp4$', r'\.mp3$',
-            r'/video/', r'/gallery/', r'/slideshow/', r'/interactive/',
-            r'/newsletter', r'/rss', r'/feed', r'/api/', r'/ajax/',
-            r'#', r'\?utm_', r'\?fbclid', r'\?ref=', r'\?source='
-        ]
-        
-        for pattern in skip_patterns:
-            if re.search(pattern, url, re.IGNORECASE):
-                return False
-        
-        # Check if it's a valid internal link
+        return self.url_classifier.is_internal(url, domain)
+
+    def save_report(self):
+        """Write the per-run crawl report (fetches avoided by early date filtering)"""
+        report = dict(self.run_stats)
+        report['fetches_avoided'] = sum(self.run_stats['skipped_stale'].values())
+        report['articles_saved'] = len(self.articles)
+        report['max_age_days'] = self.max_age_days
+        report['domains'] = self.frontier.stats()
+        report['skipped_sources'] = self.skipped_sources
+        if getattr(self, 'rate_limiter', None) is not None:
+            report['rate_limits'] = self.rate_limiter.stats()
+        self.debug_info(
+            f"Date filter: {report['fetches_avoided']} of {report['candidates']} candidates dropped before fetching, "
+            f"{report['stale_after_fetch']} stale after fetching"
+        )
         try:
-            parsed = urlparse(url)
-            return (
-                parsed.netloc == domain or 
-                parsed.netloc.endswith('.' + domain) or
-                domain.endswith('.' + parsed.netloc)
-            )
-        except:
-            return False
+            with open(self.report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        except Exception as e:
+            self.log_handler.error(f"Error saving crawl report: {e}")
 
     def closed(self, reason):
         """Enhanced spider closing"""
         self.debug_info(f"Spider closing. Reason: {reason}")
         self.debug_info(f"Total articles collected: {len(self.articles)}")
+        self.extraction_pool.close()
+        try:
+            self.health.save()
+        except Exception as e:
+            self.log_handler.error(f"Error saving domain health: {e}")
+        self.save_report()
         
         # Save results
         try: